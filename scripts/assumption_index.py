@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Inverted index from assumption IDs to the entries that use them.
+
+Built in one pass over the entries, it separates entry-level use (the
+entry's `assumptions` array) from step-level use (`derivation[].assumptions`).
+Step-level references may also name entries from `depends_on`; callers that
+only care about global assumptions filter on their IDs.
+"""
+
+from collections import defaultdict
+
+
+def build_assumption_index(entries):
+    """
+    Build the inverted assumption index from an iterable of entry dicts.
+
+    Returns a dict with:
+    - 'entry_level': {assumption_id: [result_id, ...]} in entry order
+    - 'step_level': {assumption_id: [(result_id, step), ...]} in entry and step order
+    """
+    entry_level = defaultdict(list)
+    step_level = defaultdict(list)
+
+    for entry in entries:
+        result_id = entry.get('result_id')
+        for assumption_id in entry.get('assumptions') or []:
+            users = entry_level[assumption_id]
+            if not users or users[-1] != result_id:
+                users.append(result_id)
+        for step in entry.get('derivation') or []:
+            for assumption_id in step.get('assumptions') or []:
+                if assumption_id:
+                    step_level[assumption_id].append((result_id, step.get('step')))
+
+    return {'entry_level': dict(entry_level), 'step_level': dict(step_level)}
+
+
+def usage_counts(index, assumption_id):
+    """Return {'entries': n, 'steps': m} for an assumption ID."""
+    return {
+        'entries': len(index['entry_level'].get(assumption_id, [])),
+        'steps': len(index['step_level'].get(assumption_id, [])),
+    }
@@ -9,25 +9,49 @@ This script creates a unified dataset for machine learning by:
 
 Usage:
     python scripts/build_ml_dataset.py [--include-drafts] [--output dataset.json]
+    python scripts/build_ml_dataset.py --format packed [--output dataset.pack] [--packed-encoding msgpack]
+    python scripts/build_ml_dataset.py --format sqlite [--output dataset.sqlite]
+    python scripts/build_ml_dataset.py --compress gzip|zstd [--output dataset.json.gz]
+    python scripts/build_ml_dataset.py --encode-ids   # plus dataset.json.vocab.json
+
+Every build also writes two files named after the output: the equation
+fingerprint index (dataset.json.equations.json) and the symbol meaning index
+(dataset.json.symbols.json).
 """
 
-import json
 import glob
 import argparse
 import os
 import re
+import sys
 from pathlib import Path
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from assumption_index import build_assumption_index, usage_counts
+from export_sqlite import write_sqlite
+from theoria import jsonio
+from theoria.equation_index import EquationIndex
+from theoria.symbol_index import SymbolIndex
+from theoria.interning import StringTable, encode_entry, intern_entry, vocabulary_info
+from theoria.compression import COMPRESSIONS, open_compressed, with_suffix
+from theoria.packed import write_packed
+
+DEFAULT_OUTPUTS = {
+    'json': 'dataset.json',
+    'packed': 'dataset.pack',
+    'sqlite': 'dataset.sqlite',
+}
+
 def load_global_assumptions(globals_path="globals/assumptions.json"):
     """Load the global assumptions database."""
     try:
-        with open(globals_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Create lookup by ID
-            assumptions_lookup = {}
-            for assumption in data['assumptions']:
-                assumptions_lookup[assumption['id']] = assumption
-            return assumptions_lookup
+        data = jsonio.load(globals_path)
+        # Create lookup by ID
+        assumptions_lookup = {}
+        for assumption in data['assumptions']:
+            assumptions_lookup[assumption['id']] = assumption
+        return assumptions_lookup
     except FileNotFoundError:
         print(f"Warning: Could not find {globals_path}. Assumption resolution will be skipped.")
         return {}
@@ -85,16 +109,15 @@ def load_entries(entries_pattern="entries/*.json", include_drafts=False):
 
     for entry_file in sorted(entry_files):
         try:
-            with open(entry_file, 'r', encoding='utf-8') as f:
-                entry_data = json.load(f)
+            entry_data = jsonio.load(entry_file)
 
-                # Check review status
-                review_status = entry_data.get('review_status', 'draft')
+            # Check review status
+            review_status = entry_data.get('review_status', 'draft')
 
-                if not include_drafts and review_status == 'draft':
-                    continue  # Skip draft entries
+            if not include_drafts and review_status == 'draft':
+                continue  # Skip draft entries
 
-                entries.append(entry_data)
+            entries.append(intern_entry(entry_data))
 
         except Exception as e:
             print(f"Error loading {entry_file}: {e}")
@@ -105,15 +128,49 @@ def load_entries(entries_pattern="entries/*.json", include_drafts=False):
 def load_version():
     """Load version from manifest.json."""
     try:
-        with open('manifest.json', 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
-            return manifest.get('dataset_version', '0.5.0')
+        manifest = jsonio.load('manifest.json')
+        return manifest.get('dataset_version', '0.5.0')
     except Exception as e:
         print(f"Warning: Could not load version from manifest.json: {e}")
         return '0.5.0'
 
-def build_dataset(include_drafts=False, output_file="dataset.json"):
-    """Build the complete ML dataset."""
+def sidecar_path(output_file, suffix):
+    """
+    Path of a file written alongside output_file: dataset.pack -> dataset.pack<suffix>.
+    Named after the whole output name, so builds in other formats never share one.
+    """
+    output_file = Path(output_file)
+    return output_file.with_name(output_file.name + suffix)
+
+def vocabulary_path(output_file):
+    """dataset.json -> dataset.json.vocab.json alongside."""
+    return sidecar_path(output_file, '.vocab.json')
+
+def equation_index_path(output_file):
+    """dataset.json -> dataset.json.equations.json alongside."""
+    return sidecar_path(output_file, '.equations.json')
+
+def symbol_index_path(output_file):
+    """dataset.json -> dataset.json.symbols.json alongside."""
+    return sidecar_path(output_file, '.symbols.json')
+
+def build_dataset(include_drafts=False, output_file="dataset.json", output_format="json", compression=None,
+                  encode_ids=False, packed_encoding='json'):
+    """
+    Build the complete ML dataset.
+    output_format 'json' writes one JSON document; 'packed' writes the
+    mmap-friendly packed format with an offset index keyed by result_id,
+    its records encoded as packed_encoding ('json' or 'msgpack');
+    'sqlite' writes a normalized, indexed database with full-text search.
+    compression ('gzip' or 'zstd') streams the JSON output through a
+    compressor; Dataset.open detects it automatically.
+    encode_ids replaces repeated strings (assumption IDs, domains, statuses,
+    depends_on IDs, equation IDs, symbols) in the entries with integer IDs
+    into a vocabulary file written next to the output.
+    An equation fingerprint index (theoria.equation_index) and a symbol
+    meaning index (theoria.symbol_index) are always written next to the
+    output as well.
+    """
     print("Building TheorIA ML Dataset...")
 
     # Load version from manifest
@@ -140,6 +197,13 @@ def build_dataset(include_drafts=False, output_file="dataset.json"):
         processed_entry = process_entry(entry, global_assumptions)
         processed_entries.append(processed_entry)
 
+    # Count entry-level and step-level uses of each global assumption
+    usage_index = build_assumption_index(entries)
+    assumptions_with_usage = [
+        dict(assumption, usage=usage_counts(usage_index, assumption_id))
+        for assumption_id, assumption in global_assumptions.items()
+    ]
+
     # Build final dataset structure
     dataset = {
         'dataset_info': {
@@ -150,14 +214,45 @@ def build_dataset(include_drafts=False, output_file="dataset.json"):
             'includes_drafts': include_drafts,
             'global_assumptions_count': len(global_assumptions)
         },
-        'global_assumptions': list(global_assumptions.values()),
+        'global_assumptions': assumptions_with_usage,
         'entries': processed_entries
     }
 
+    index_path = equation_index_path(output_file)
+    EquationIndex.build(entries).save(index_path)
+    dataset['dataset_info']['equation_index'] = index_path.name
+    print(f"Indexed equations into {index_path}")
+
+    symbols_path = symbol_index_path(output_file)
+    symbol_index = SymbolIndex.build(entries, global_assumptions)
+    symbol_index.save(symbols_path)
+    dataset['dataset_info']['symbol_index'] = symbols_path.name
+    print(f"Indexed {len(symbol_index)} symbols into {symbols_path}")
+
+    if encode_ids:
+        table = StringTable()
+        dataset['entries'] = [encode_entry(entry, table) for entry in processed_entries]
+        vocab_path = vocabulary_path(output_file)
+        jsonio.dump({'strings': table.strings}, vocab_path)
+        dataset['dataset_info']['vocabulary'] = vocabulary_info(vocab_path.name, table.strings)
+        print(f"Encoded {len(table)} distinct strings into {vocab_path}")
+
     # Write output
     print(f"Writing dataset to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(dataset, f, indent=2, ensure_ascii=False)
+    if output_format == 'packed':
+        write_packed(output_file, dataset['entries'],
+                     dataset_info=dataset['dataset_info'],
+                     global_assumptions=dataset['global_assumptions'],
+                     encoding=packed_encoding)
+    elif output_format == 'sqlite':
+        # Relational tables keep assumption IDs, so use the unresolved entries
+        has_fts = write_sqlite(output_file, entries, dataset['global_assumptions'],
+                               dataset_info=dataset['dataset_info'])
+        if not has_fts:
+            print("Warning: SQLite was built without FTS5; skipping the full-text table")
+    else:
+        with open_compressed(output_file, 'wt', compression=compression) as f:
+            f.write(jsonio.dumps(dataset, indent=2))
 
     print(f"Successfully created {output_file}")
     print(f"   Dataset contains {len(processed_entries)} entries")
@@ -169,16 +264,38 @@ def main():
     parser = argparse.ArgumentParser(description='Build TheorIA ML Dataset')
     parser.add_argument('--include-drafts', action='store_true',
                         help='Include draft entries (default: only reviewed entries)')
-    parser.add_argument('--output', default='dataset.json',
-                        help='Output file path (default: dataset.json)')
+    parser.add_argument('--format', choices=sorted(DEFAULT_OUTPUTS), default='json',
+                        help='Output format: json (single document), packed (mmap-friendly, indexed by result_id) '
+                             'or sqlite (normalized tables with full-text search)')
+    parser.add_argument('--compress', choices=COMPRESSIONS, default=None,
+                        help='Compress JSON output with gzip or zstd (zstd requires the zstandard package)')
+    parser.add_argument('--packed-encoding', choices=['json', 'msgpack'], default='json',
+                        help='Record encoding for --format packed (msgpack requires the msgpack package)')
+    parser.add_argument('--encode-ids', action='store_true',
+                        help='Store repeated strings as integer IDs plus a <output>.vocab.json vocabulary file')
+    parser.add_argument('--output', default=None,
+                        help='Output file path (default: dataset.json, dataset.pack or dataset.sqlite by format); '
+                             '<output>.equations.json and <output>.symbols.json are written next to it')
 
     args = parser.parse_args()
+    if args.compress and args.format != 'json':
+        parser.error(f"--compress only applies to --format json ({args.format} output is read in place)")
+    if args.packed_encoding != 'json' and args.format != 'packed':
+        parser.error("--packed-encoding only applies to --format packed")
+    if args.encode_ids and args.format == 'sqlite':
+        parser.error("--encode-ids does not apply to --format sqlite (tables already normalize these strings)")
 
     # Change to repository root if script is run from scripts/ directory
     if os.path.basename(os.getcwd()) == 'scripts':
         os.chdir('..')
 
-    build_dataset(include_drafts=args.include_drafts, output_file=args.output)
+    output_file = args.output or with_suffix(DEFAULT_OUTPUTS[args.format], args.compress)
+    build_dataset(include_drafts=args.include_drafts,
+                  output_file=output_file,
+                  output_format=args.format,
+                  compression=args.compress,
+                  encode_ids=args.encode_ids,
+                  packed_encoding=args.packed_encoding)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Check that each derivation step follows from the steps before it.
+
+For every derivation[i].equation the checker looks for a route from the
+earlier steps of the same derivation, the mathematical_expressions of the
+global assumptions the step references and the result equations of the
+entries it references:
+
+- the step is an identity on its own
+- it is one of the earlier equations, up to sign or a constant factor
+- it becomes one (or an identity) after substituting an earlier equation
+  solved for one of its symbols
+
+Each candidate is tried cheapest first: exact comparison, then numeric
+evaluation at random points (which rejects almost every wrong candidate),
+then expand/cancel and, for small expressions, simplify. Steps are reported
+as 'proved', 'numeric' (consistent at every sample point but not proved),
+'unconfirmed' or 'skipped' (no SymPy form, no earlier equations).
+
+Work is spread over worker processes, and each step's result is cached under
+build/cache/derivations/ keyed by the step, its sources and the SymPy version,
+so unchanged derivations cost nothing on the next run.
+
+Usage:
+    python scripts/check_derivations.py [--jobs N] [--verbose] [--strict] [ENTRY_ID ...]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'scripts'))
+from theoria import Dataset, asciimath
+from verification_cache import installed_version, load_result, store_result
+
+CHECKER_VERSION = 1
+CACHE_DIR = ROOT / 'build' / 'cache' / 'derivations'
+SAMPLES = 3
+TOLERANCE = 1e-9
+SIMPLIFY_LIMIT = 60     # count_ops above which simplify() is not attempted
+MAX_SUBSTITUTIONS = 40
+
+
+def relation_pairs(text):
+    """
+    (lhs, rhs) SymPy pairs of the equalities in an equation string. Lists
+    and '=>' chains are split, chains a = b = c give (a, b) and (b, c), and
+    operands without a SymPy form are dropped. Applied undefined functions
+    such as psi(t) become plain symbols.
+    """
+    import sympy
+    from sympy.core.function import AppliedUndef
+
+    def operands(node):
+        if node[0] == 'list':
+            for item in node[1]:
+                yield from operands(item)
+        elif node[0] == 'rel' and all(op in asciimath.ARROWS for op in node[1]):
+            for operand in node[2]:
+                yield from operands(operand)
+        elif node[0] == 'rel':
+            converted = []
+            for operand in node[2]:
+                try:
+                    converted.append(asciimath.to_sympy(operand))
+                except (asciimath.ConversionError, TypeError, ValueError):
+                    converted.append(None)
+            for op, left, right in zip(node[1], converted, converted[1:]):
+                if op in ('=', ':=') and left is not None and right is not None:
+                    yield left, right
+
+    pairs = []
+    for left, right in operands(asciimath.parse(text)):
+        opaque = {f: sympy.Symbol(str(f)) for f in (left - right).atoms(AppliedUndef)}
+        pairs.append((left.xreplace(opaque), right.xreplace(opaque)))
+    return pairs
+
+
+def _values(exprs, point):
+    """Evaluate expressions at a {symbol: value} point; None if any is not a finite number."""
+    values = []
+    for expr in exprs:
+        try:
+            value = complex(expr.xreplace(point).evalf())
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+            return None
+        if value != value or abs(value) == float('inf'):
+            return None
+        values.append(value)
+    return values
+
+
+def _close(a, b):
+    return abs(a - b) <= TOLERANCE * max(1.0, abs(a), abs(b))
+
+
+def numeric_check(exprs, test, rng):
+    """
+    Evaluate exprs at SAMPLES random points and apply test to the values.
+    Returns True if it held at every point, False if it failed at one and
+    None if no point could be evaluated.
+    """
+    import sympy
+    symbols = sorted(set().union(*(expr.free_symbols for expr in exprs)), key=str)
+    evaluated = False
+    for _ in range(SAMPLES):
+        point = {symbol: sympy.Float(rng.uniform(0.5, 2.0)) for symbol in symbols}
+        values = _values(exprs, point)
+        if values is None:
+            continue
+        if not test(*values):
+            return False
+        evaluated = True
+    return True if evaluated else None
+
+
+def prove_zero(expr):
+    """Bounded symbolic proof that expr is zero."""
+    import sympy
+    transforms = [sympy.expand, sympy.cancel]
+    if sympy.count_ops(expr) <= SIMPLIFY_LIMIT:
+        transforms.append(sympy.simplify)
+    for transform in transforms:
+        try:
+            if transform(expr) == 0:
+                return True
+        except (TypeError, ValueError, ZeroDivisionError, RecursionError):
+            pass
+    return False
+
+
+def same_value(a, b, rng):
+    """'proved', 'numeric' or None: whether a == b holds identically."""
+    if a == b:
+        return 'proved'
+    numeric = numeric_check([a, b], _close, rng)
+    if numeric is False:
+        return None
+    if prove_zero(a - b):
+        return 'proved'
+    return 'numeric' if numeric else None
+
+
+def proportional(d, source, rng):
+    """'proved', 'numeric' or None: whether d is a nonzero constant multiple of source."""
+    import sympy
+    if d == source or d == -source:
+        return 'proved'
+    ratios = []
+
+    def test(a, b):
+        if abs(b) <= TOLERANCE or abs(a) <= TOLERANCE:
+            return False
+        ratios.append(a / b)
+        return _close(ratios[0], ratios[-1])
+
+    if not numeric_check([d, source], test, rng):
+        return None
+    ratio = sympy.cancel(d / source)
+    return 'proved' if not ratio.free_symbols and ratio != 0 else 'numeric'
+
+
+def substitutions(pairs, symbols):
+    """
+    {symbol: expression} substitutions from equations that are linear in one
+    of the given symbols, e.g. v_p = (r_a v_a)/r_p gives v_p -> (r_a v_a)/r_p.
+    """
+    found = []
+    for left, right in pairs:
+        difference = left - right
+        for symbol in sorted(difference.free_symbols & symbols, key=str):
+            coefficient = difference.diff(symbol)
+            if coefficient == 0 or symbol in coefficient.free_symbols:
+                continue
+            found.append((symbol, symbol - difference / coefficient))
+            if len(found) >= MAX_SUBSTITUTIONS:
+                return found
+    return found
+
+
+def check_relation(left, right, sources, rng):
+    """Return (status, route) for one equality of a step, given the source pairs."""
+    status = same_value(left, right, rng)
+    if status:
+        return status, 'identity'
+
+    difference = left - right
+    differences = [l - r for l, r in sources if l - r != 0]
+    for source in differences:
+        status = proportional(difference, source, rng)
+        if status:
+            return status, 'equivalent'
+
+    for symbol, value in substitutions(sources, difference.free_symbols):
+        substituted = difference.xreplace({symbol: value})
+        status = same_value(substituted, 0 * substituted, rng)
+        if status:
+            return status, 'substitution'
+        for source in differences:
+            status = proportional(substituted, source.xreplace({symbol: value}), rng)
+            if status:
+                return status, 'substitution'
+    return None, None
+
+
+def check_step(task):
+    """Check one step. task holds the step 'equation' and its 'sources' (equation strings)."""
+    current = relation_pairs(task['equation'])
+    if not current:
+        return {'status': 'skipped', 'route': 'no symbolic equality'}
+    sources = [pair for text in task['sources'] for pair in relation_pairs(text)]
+    rng = random.Random(task_key(task))
+
+    statuses, routes = [], []
+    for left, right in current:
+        status, route = check_relation(left, right, sources, rng)
+        if status is None:
+            return {'status': 'unconfirmed', 'route': None}
+        statuses.append(status)
+        routes.append(route)
+    status = 'proved' if all(s == 'proved' for s in statuses) else 'numeric'
+    return {'status': status, 'route': ', '.join(sorted(set(routes)))}
+
+
+def task_key(task):
+    """Cache key for a step: its equation, sources, the checker and the SymPy version."""
+    payload = json.dumps({
+        'task': task,
+        'checker': CHECKER_VERSION,
+        'parser': asciimath.PARSER_VERSION,
+        'sympy': installed_version('sympy'),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def step_tasks(entry, global_assumptions, result_equations):
+    """
+    Yield (step_number, task) for an entry's derivation. Sources are the
+    earlier steps, the referenced global assumptions' mathematical_expressions
+    and the result equations of referenced entries.
+    """
+    earlier = []
+    for step in entry.get('derivation') or []:
+        sources = list(earlier)
+        for assumption_id in step.get('assumptions') or []:
+            if assumption_id in global_assumptions:
+                sources.extend(global_assumptions[assumption_id].get('mathematical_expressions') or [])
+            else:
+                sources.extend(result_equations.get(assumption_id, []))
+        if step.get('equation'):
+            yield step.get('step'), {'equation': step['equation'], 'sources': sources}
+            earlier.append(step['equation'])
+
+
+def check_entries(ds, result_ids=None, jobs=1, cache_dir=None):
+    """Return {result_id: [{'step', 'status', 'route'}]} for the given entries (default: all)."""
+    cache_dir = cache_dir or CACHE_DIR
+    global_assumptions = ds.global_assumptions
+    result_equations = {entry['result_id']: [eq['equation'] for eq in entry.get('result_equations') or []]
+                        for entry in ds}
+
+    results, pending = {}, []
+    for result_id in result_ids or ds.ids():
+        results[result_id] = []
+        for step, task in step_tasks(ds[result_id], global_assumptions, result_equations):
+            key = task_key(task)
+            outcome = {'step': step, 'status': None, 'route': None}
+            cached = load_result(key, cache_dir)
+            if cached is not None:
+                outcome.update(cached)
+            else:
+                if not task['sources']:
+                    outcome.update(status='skipped', route='no earlier equations')
+                pending.append((key, task, outcome))
+            results[result_id].append(outcome)
+    asciimath.save_cache()
+
+    todo = [(key, task, outcome) for key, task, outcome in pending if outcome['status'] is None]
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            checked = list(executor.map(check_step, [task for _, task, _ in todo], chunksize=4))
+    else:
+        checked = [check_step(task) for _, task, _ in todo]
+    for (_, _, outcome), result in zip(todo, checked):
+        outcome.update(result)
+    for key, _, outcome in pending:
+        store_result(key, {'status': outcome['status'], 'route': outcome['route']}, cache_dir)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that derivation steps follow from earlier steps')
+    parser.add_argument('entries', nargs='*', metavar='ENTRY_ID', help='Entries to check (default: all)')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes (default: 1)')
+    parser.add_argument('--verbose', action='store_true', help='Print the outcome of every step')
+    parser.add_argument('--strict', action='store_true', help='Exit with status 1 if any step is unconfirmed')
+    args = parser.parse_args()
+
+    if installed_version('sympy') is None:
+        print("[ERROR] check_derivations.py requires SymPy (pip install sympy)")
+        return 1
+
+    ds = Dataset.open(ROOT)
+    unknown = [result_id for result_id in args.entries if result_id not in ds]
+    if unknown:
+        print(f"[ERROR] Unknown entries: {', '.join(unknown)}")
+        return 1
+
+    results = check_entries(ds, args.entries or None, jobs=args.jobs)
+    totals = {'proved': 0, 'numeric': 0, 'unconfirmed': 0, 'skipped': 0}
+    for result_id, steps in results.items():
+        for outcome in steps:
+            totals[outcome['status']] += 1
+        unconfirmed = [str(outcome['step']) for outcome in steps if outcome['status'] == 'unconfirmed']
+        if args.verbose:
+            for outcome in steps:
+                route = f" ({outcome['route']})" if outcome['route'] else ''
+                print(f"{result_id} step {outcome['step']}: {outcome['status']}{route}")
+        elif unconfirmed:
+            print(f"[WARNING] {result_id}: unconfirmed steps {', '.join(unconfirmed)}")
+
+    print(f"{sum(totals.values())} steps: {totals['proved']} proved, {totals['numeric']} numerically consistent, "
+          f"{totals['unconfirmed']} unconfirmed, {totals['skipped']} skipped")
+    return 1 if args.strict and totals['unconfirmed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
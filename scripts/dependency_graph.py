@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Build the entry dependency graph artifact (build/graph.json).
+
+The artifact stores, for the `depends_on` relation between entries:
+- adjacency (entry -> entries it depends on) and reverse adjacency
+- topological levels (level 0 entries have no dependencies)
+- the transitive closure, upstream and downstream, as bitsets
+
+Bit i of a closure bitset refers to nodes[i]; bitsets are stored as hex
+strings. When an artifact already exists and the set of entries is
+unchanged, the closure is updated incrementally for the entries whose
+edges changed and their dependents.
+
+Usage:
+    python scripts/dependency_graph.py [--output build/graph.json] [--full]
+    python scripts/dependency_graph.py --upstream vis_viva
+    python scripts/dependency_graph.py --downstream angular_momentum
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+from pathlib import Path
+
+# Get project root
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from theoria import jsonio
+GRAPH_PATH = ROOT / 'build' / 'graph.json'
+GRAPH_VERSION = 1
+
+
+def load_edges(entries_dir=None):
+    """Return {result_id: depends_on list} for every entry that can be loaded."""
+    entries_dir = Path(entries_dir) if entries_dir else ROOT / 'entries'
+    edges = {}
+
+    for json_file in sorted(entries_dir.glob('*.json')):
+        try:
+            data = jsonio.load(json_file)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            print(f"[WARNING] Could not load {json_file.name}: {e}")
+            continue
+        result_id = data.get('result_id')
+        if result_id:
+            edges[result_id] = list(data.get('depends_on') or [])
+
+    return edges
+
+
+def iter_bits(bits):
+    """Yield the indices of the set bits of an int."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _adjacency(edges):
+    """Split edges into adjacency over existing nodes and dangling references."""
+    adjacency = {}
+    missing = {}
+    for node in sorted(edges):
+        deps = []
+        for dep in edges[node]:
+            if dep in edges:
+                if dep not in deps:
+                    deps.append(dep)
+            else:
+                missing.setdefault(node, []).append(dep)
+        adjacency[node] = deps
+    return adjacency, missing
+
+
+def _reverse(adjacency):
+    reverse = {node: [] for node in adjacency}
+    for node, deps in adjacency.items():
+        for dep in deps:
+            reverse[dep].append(node)
+    return reverse
+
+
+def _levels(adjacency, reverse):
+    """
+    Kahn's algorithm in rounds. Returns (levels, order, cyclic) where order is a
+    topological order of all acyclic nodes and cyclic lists nodes on or behind a cycle.
+    """
+    remaining = {node: len(deps) for node, deps in adjacency.items()}
+    frontier = sorted(node for node, count in remaining.items() if count == 0)
+    levels = []
+    order = []
+
+    while frontier:
+        levels.append(frontier)
+        order.extend(frontier)
+        next_frontier = []
+        for node in frontier:
+            for dependent in reverse[node]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    next_frontier.append(dependent)
+        frontier = sorted(next_frontier)
+
+    placed = set(order)
+    cyclic = sorted(node for node in adjacency if node not in placed)
+    return levels, order, cyclic
+
+
+def _upstream_bits(node, adjacency, index, upstream):
+    """Upstream bitset of a node from its dependencies' already known bitsets."""
+    bits = 0
+    for dep in adjacency[node]:
+        bits |= (1 << index[dep]) | upstream[dep]
+    return bits
+
+
+def _reachable_bits(node, adjacency, index):
+    """Upstream bitset by BFS; used for nodes on cycles, where ordering is impossible."""
+    bits = 0
+    queue = deque(adjacency[node])
+    while queue:
+        dep = queue.popleft()
+        bit = 1 << index[dep]
+        if bits & bit:
+            continue
+        bits |= bit
+        queue.extend(adjacency[dep])
+    return bits
+
+
+def _assemble(adjacency, missing, reverse, levels, cyclic, upstream, downstream, nodes):
+    return {
+        'version': GRAPH_VERSION,
+        'nodes': nodes,
+        'adjacency': adjacency,
+        'reverse_adjacency': reverse,
+        'missing': missing,
+        'levels': levels,
+        'cyclic': cyclic,
+        'closure': {
+            'upstream': {node: format(upstream[node], 'x') for node in nodes},
+            'downstream': {node: format(downstream[node], 'x') for node in nodes},
+        },
+    }
+
+
+def build_graph(edges):
+    """Build the full graph artifact from {result_id: depends_on}."""
+    adjacency, missing = _adjacency(edges)
+    reverse = _reverse(adjacency)
+    levels, order, cyclic = _levels(adjacency, reverse)
+    nodes = sorted(adjacency)
+    index = {node: i for i, node in enumerate(nodes)}
+
+    upstream = {}
+    for node in order:
+        upstream[node] = _upstream_bits(node, adjacency, index, upstream)
+    for node in cyclic:
+        upstream[node] = _reachable_bits(node, adjacency, index)
+
+    downstream = {node: 0 for node in nodes}
+    for node in nodes:
+        bit = 1 << index[node]
+        for i in iter_bits(upstream[node]):
+            downstream[nodes[i]] |= bit
+
+    return _assemble(adjacency, missing, reverse, levels, cyclic, upstream, downstream, nodes)
+
+
+def update_graph(previous, edges):
+    """
+    Update a previously built graph for new edges.
+
+    Only entries whose edges changed, and their dependents, get a new upstream
+    closure; downstream bitsets are patched for those entries only. Falls back
+    to a full build if the set of entries or the artifact version changed.
+    Returns previous itself only when nothing changed, missing dependencies
+    included, so callers can skip rewriting the artifact.
+    """
+    if (not previous or previous.get('version') != GRAPH_VERSION
+            or previous['nodes'] != sorted(edges)):
+        return build_graph(edges)
+
+    adjacency, missing = _adjacency(edges)
+    changed = [node for node in adjacency if adjacency[node] != previous['adjacency'].get(node)]
+    if not changed:
+        # Only dangling depends_on IDs may have changed
+        return previous if missing == previous['missing'] else dict(previous, missing=missing)
+
+    reverse = _reverse(adjacency)
+    levels, order, cyclic = _levels(adjacency, reverse)
+    nodes = previous['nodes']
+    index = {node: i for i, node in enumerate(nodes)}
+
+    # Entries whose upstream closure can change: the changed ones and everything downstream of them
+    affected = set()
+    queue = deque(changed)
+    while queue:
+        node = queue.popleft()
+        if node in affected:
+            continue
+        affected.add(node)
+        queue.extend(reverse[node])
+
+    upstream = {node: int(bits, 16) for node, bits in previous['closure']['upstream'].items()}
+    for node in order:
+        if node in affected:
+            upstream[node] = _upstream_bits(node, adjacency, index, upstream)
+    for node in cyclic:
+        if node in affected:
+            upstream[node] = _reachable_bits(node, adjacency, index)
+
+    affected_mask = 0
+    for node in affected:
+        affected_mask |= 1 << index[node]
+    downstream = {node: int(bits, 16) & ~affected_mask
+                  for node, bits in previous['closure']['downstream'].items()}
+    for node in affected:
+        bit = 1 << index[node]
+        for i in iter_bits(upstream[node]):
+            downstream[nodes[i]] |= bit
+
+    return _assemble(adjacency, missing, reverse, levels, cyclic, upstream, downstream, nodes)
+
+
+def load_graph(path=None):
+    """Load a graph artifact, or return None if it does not exist or is unreadable."""
+    try:
+        return jsonio.load(path or GRAPH_PATH)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_graph(graph, path=None):
+    """Write a graph artifact, creating its directory if needed."""
+    path = Path(path or GRAPH_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(jsonio.dumps(graph, indent=2))
+
+
+def _decode(graph, bits_hex):
+    nodes = graph['nodes']
+    return [nodes[i] for i in iter_bits(int(bits_hex, 16))]
+
+
+def upstream(graph, node):
+    """All entries a node transitively depends on, in node order."""
+    return _decode(graph, graph['closure']['upstream'][node])
+
+
+def downstream(graph, node):
+    """All entries that transitively depend on a node, in node order."""
+    return _decode(graph, graph['closure']['downstream'][node])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the TheorIA dependency graph artifact')
+    parser.add_argument('--output', default=str(GRAPH_PATH),
+                        help='Output file path (default: build/graph.json)')
+    parser.add_argument('--full', action='store_true',
+                        help='Rebuild from scratch instead of updating the existing artifact')
+    parser.add_argument('--upstream', metavar='ENTRY_ID',
+                        help='Print the entries ENTRY_ID transitively depends on')
+    parser.add_argument('--downstream', metavar='ENTRY_ID',
+                        help='Print the entries that transitively depend on ENTRY_ID')
+
+    args = parser.parse_args()
+
+    edges = load_edges()
+    previous = None if args.full else load_graph(args.output)
+    graph = update_graph(previous, edges)
+    if graph is not previous:
+        write_graph(graph, args.output)
+
+    for query, lookup in ((args.upstream, upstream), (args.downstream, downstream)):
+        if query:
+            if query not in graph['closure']['upstream']:
+                print(f"[ERROR] Unknown entry '{query}'")
+                return 1
+            for node in lookup(graph, query):
+                print(node)
+            return 0
+
+    print(f"Dependency graph: {len(graph['nodes'])} entries, "
+          f"{sum(len(deps) for deps in graph['adjacency'].values())} edges, "
+          f"{len(graph['levels'])} levels")
+    if graph['cyclic']:
+        print(f"  [WARNING] {len(graph['cyclic'])} entries are on or behind a dependency cycle: "
+              f"{', '.join(graph['cyclic'])}")
+    print(f"Output written to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
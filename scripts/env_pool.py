@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Virtualenvs for running verification snippets under their own pins.
+
+Each distinct (python X.Y, library==version) pin from the
+programmatic_verification 'language' and 'library' fields gets one
+virtualenv under build/envs/, created with the matching interpreter and
+filled from a local wheelhouse (pip --no-index), so no network access is
+needed. EnvPool keeps one warm verification_worker.py per pin and sends it
+every snippet with that pin.
+
+Interpreters are matched on major.minor: 'python 3.11.12' runs under any
+3.11 found on PATH (pythonX.Y) or in a pyenv installation.
+
+Usage:
+    # Build the environments for every pin in entries/ ahead of time
+    python scripts/env_pool.py [--wheelhouse DIR]
+    # Fill the wheelhouse on a machine with network access
+    pip download --dest build/wheelhouse sympy==1.13.1
+"""
+
+import argparse
+import glob
+import importlib.metadata
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from theoria import jsonio
+
+ENVS_DIR = ROOT / 'build' / 'envs'
+WHEELHOUSE = ROOT / 'build' / 'wheelhouse'
+WORKER = Path(__file__).resolve().with_name('verification_worker.py')
+MARKER = 'theoria-env.json'
+# pip gained --python (install into another interpreter's environment) in 22.3
+PIP_MIN_VERSION = (22, 3)
+
+
+class EnvError(RuntimeError):
+    """A pinned environment could not be built or started."""
+
+
+def parse_pin(pv):
+    """
+    (python 'X.Y', library name, library version) from a
+    programmatic_verification section; the library is ('none', '') when no
+    library is used. Raises ValueError on malformed fields.
+    """
+    language = (pv.get('language') or '').split()
+    library = (pv.get('library') or '').split()
+    if len(language) != 2 or not language[1].replace('.', '').isdigit():
+        raise ValueError(f"Invalid language field: {pv.get('language')!r}")
+    python = '.'.join(language[1].split('.')[:2])
+    if library and library[0].lower() == 'none':
+        return python, 'none', ''
+    if len(library) != 2:
+        raise ValueError(f"Invalid library field: {pv.get('library')!r}")
+    return python, library[0], library[1]
+
+
+def env_name(pin):
+    python, lib_name, lib_ver = pin
+    return f"py{python}-{lib_name}-{lib_ver}" if lib_name != 'none' else f"py{python}"
+
+
+def _interpreter_version(executable):
+    try:
+        out = subprocess.run([executable, '-c', 'import sys; print("%d.%d" % sys.version_info[:2])'],
+                             capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def find_python(version):
+    """Path of an interpreter for major.minor version, or None."""
+    candidates = [sys.executable, shutil.which(f"python{version}")]
+    pyenv_root = os.environ.get('PYENV_ROOT', str(Path.home() / '.pyenv'))
+    candidates += sorted(glob.glob(os.path.join(pyenv_root, 'versions', f"{version}.*", 'bin', 'python')),
+                         reverse=True)
+    for candidate in candidates:
+        if candidate and _interpreter_version(candidate) == version:
+            return candidate
+    return None
+
+
+def pip_version():
+    """(major, minor) of the pip installed alongside this interpreter, or None."""
+    try:
+        version = importlib.metadata.version('pip')
+    except importlib.metadata.PackageNotFoundError:
+        return None
+    return tuple(int(part) for part in version.split('.')[:2] if part.isdigit())
+
+
+def env_python(env_dir):
+    return env_dir / ('Scripts' if os.name == 'nt' else 'bin') / 'python'
+
+
+def ensure_env(pin, envs_dir=None, wheelhouse=None):
+    """Return the interpreter of the environment for pin, building it if needed."""
+    env_dir = Path(envs_dir or ENVS_DIR) / env_name(pin)
+    marker = env_dir / MARKER
+    if marker.exists():
+        return env_python(env_dir)
+
+    python, lib_name, lib_ver = pin
+    interpreter = find_python(python)
+    if interpreter is None:
+        raise EnvError(f"No Python {python} interpreter found (install it or put python{python} on PATH)")
+    if lib_name != 'none':
+        found = pip_version()
+        if found is None or found < PIP_MIN_VERSION:
+            needed, found = '.'.join(map(str, PIP_MIN_VERSION)), '.'.join(map(str, found or ())) or 'none'
+            raise EnvError(f"Building environment {env_name(pin)} needs pip >= {needed} in {sys.executable} "
+                           f"(found {found}); "
+                           f"upgrade it with 'python -m pip install --upgrade pip'")
+
+    shutil.rmtree(env_dir, ignore_errors=True)
+    # The environments never need pip themselves; this pip installs into them with --python
+    commands = [[interpreter, '-m', 'venv', '--without-pip', str(env_dir)]]
+    if lib_name != 'none':
+        commands.append([sys.executable, '-m', 'pip', '--python', str(env_python(env_dir)), 'install', '--quiet',
+                         '--no-index', '--find-links', str(wheelhouse or WHEELHOUSE), f"{lib_name}=={lib_ver}"])
+    for command in commands:
+        out = subprocess.run(command, capture_output=True, text=True)
+        if out.returncode != 0:
+            shutil.rmtree(env_dir, ignore_errors=True)
+            detail = (out.stderr or out.stdout).strip().splitlines()[-1:] or ['unknown error']
+            raise EnvError(f"Could not build environment {env_name(pin)}: {detail[0]}")
+    jsonio.dump({'python': python, 'library': lib_name, 'version': lib_ver}, marker)
+    return env_python(env_dir)
+
+
+class Worker:
+    """A verification_worker.py process running in one environment."""
+
+    def __init__(self, python, library):
+        self.process = subprocess.Popen([str(python), str(WORKER), library], cwd=str(ROOT),
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        self.info = self._read()
+
+    def _read(self):
+        line = self.process.stdout.readline()
+        if not line:
+            raise EnvError(f"Verification worker exited with status {self.process.wait()}")
+        return json.loads(line)
+
+    def run(self, code_lines, filename):
+        self.process.stdin.write(json.dumps({'code': list(code_lines), 'filename': filename}) + '\n')
+        self.process.stdin.flush()
+        return self._read()
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+class EnvPool:
+    """
+    Warm workers keyed by pin. run() is safe to call from several threads;
+    snippets with the same pin run one after another in the same worker.
+    """
+
+    def __init__(self, envs_dir=None, wheelhouse=None):
+        self.envs_dir = envs_dir
+        self.wheelhouse = wheelhouse
+        self.workers = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def run(self, pin, code_lines, filename='<verification>'):
+        """Execute a snippet under pin; returns an execute_snippet result dict."""
+        with self.lock:
+            pin_lock = self.locks.setdefault(pin, threading.Lock())
+        with pin_lock:
+            worker = self.workers.get(pin)
+            if worker is None or worker.process.poll() is not None:
+                worker = Worker(ensure_env(pin, self.envs_dir, self.wheelhouse), pin[1])
+                self.workers[pin] = worker
+            try:
+                return worker.run(code_lines, filename)
+            except (OSError, EnvError, ValueError):
+                # The worker died mid-snippet (e.g. os._exit); start a fresh one next time
+                worker.close()
+                raise
+
+    def close(self):
+        for worker in self.workers.values():
+            worker.close()
+        self.workers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the pinned verification environments for all entries')
+    parser.add_argument('--wheelhouse', default=str(WHEELHOUSE),
+                        help='Directory of wheels to install from (default: build/wheelhouse)')
+    args = parser.parse_args()
+
+    pins = {}
+    for path in sorted((ROOT / 'entries').glob('*.json')):
+        pv = jsonio.load(path).get('programmatic_verification')
+        if pv:
+            try:
+                pins.setdefault(parse_pin(pv), []).append(path.stem)
+            except ValueError as e:
+                print(f"[WARNING] {path.name}: {e}")
+
+    failed = 0
+    for pin, entries in sorted(pins.items()):
+        try:
+            ensure_env(pin, wheelhouse=args.wheelhouse)
+            print(f"[OK] {env_name(pin)} ({len(entries)} entries)")
+        except EnvError as e:
+            failed += 1
+            print(f"[ERROR] {e}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+SQLite export of the TheorIA dataset.
+
+Writes a normalized database with one table per nested structure of an
+entry, indexes for the usual lookups, and an FTS5 table over entry names,
+explanations and symbol definitions. Used by
+`python scripts/build_ml_dataset.py --format sqlite`.
+
+Example: reviewed hep-th entries using an assumption at step level
+
+    SELECT DISTINCT e.result_id
+    FROM entries e JOIN step_assumptions s USING (result_id)
+    WHERE e.domain = 'hep-th' AND e.review_status = 'reviewed'
+      AND s.assumption_id = 'point_mass_approximation';
+"""
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from theoria import jsonio
+
+SCHEMA = """
+CREATE TABLE dataset_info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE entries (
+    result_id TEXT PRIMARY KEY,
+    result_name TEXT NOT NULL,
+    explanation TEXT,
+    domain TEXT,
+    theory_status TEXT,
+    review_status TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE result_equations (
+    result_id TEXT NOT NULL REFERENCES entries(result_id),
+    position INTEGER NOT NULL,
+    equation_id TEXT,
+    equation TEXT,
+    equation_title TEXT,
+    PRIMARY KEY (result_id, position)
+);
+CREATE TABLE definitions (
+    result_id TEXT NOT NULL REFERENCES entries(result_id),
+    position INTEGER NOT NULL,
+    symbol TEXT,
+    definition TEXT,
+    PRIMARY KEY (result_id, position)
+);
+CREATE TABLE derivation_steps (
+    result_id TEXT NOT NULL REFERENCES entries(result_id),
+    position INTEGER NOT NULL,
+    step INTEGER,
+    description TEXT,
+    equation TEXT,
+    equation_proven TEXT,
+    PRIMARY KEY (result_id, position)
+);
+CREATE TABLE step_assumptions (
+    result_id TEXT NOT NULL REFERENCES entries(result_id),
+    step INTEGER,
+    assumption_id TEXT NOT NULL
+);
+CREATE TABLE entry_assumptions (
+    result_id TEXT NOT NULL REFERENCES entries(result_id),
+    position INTEGER NOT NULL,
+    assumption TEXT NOT NULL,
+    is_global INTEGER NOT NULL,
+    PRIMARY KEY (result_id, position)
+);
+CREATE TABLE depends_on (
+    result_id TEXT NOT NULL REFERENCES entries(result_id),
+    dependency_id TEXT NOT NULL,
+    PRIMARY KEY (result_id, dependency_id)
+);
+CREATE TABLE global_assumptions (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    text TEXT,
+    type TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX idx_entries_domain_status ON entries(domain, review_status);
+CREATE INDEX idx_entries_review_status ON entries(review_status);
+CREATE INDEX idx_definitions_symbol ON definitions(symbol);
+CREATE INDEX idx_step_assumptions_assumption ON step_assumptions(assumption_id, result_id);
+CREATE INDEX idx_step_assumptions_entry ON step_assumptions(result_id, step);
+CREATE INDEX idx_entry_assumptions_assumption ON entry_assumptions(assumption, result_id);
+CREATE INDEX idx_depends_on_dependency ON depends_on(dependency_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE entries_fts USING fts5(
+    result_id UNINDEXED,
+    result_name,
+    explanation,
+    definitions
+);
+"""
+
+
+def fts5_available(conn):
+    """Return True if this SQLite build supports FTS5."""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def write_sqlite(path, entries, global_assumptions, dataset_info=None):
+    """
+    Write entries (raw entry dicts, assumptions as IDs or text) and global
+    assumptions to a new SQLite database at path, replacing any existing file.
+    Returns True if the FTS5 table was created.
+    """
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        has_fts = fts5_available(conn)
+        if has_fts:
+            conn.executescript(FTS_SCHEMA)
+
+        global_ids = {assumption['id'] for assumption in global_assumptions}
+
+        conn.executemany(
+            "INSERT INTO dataset_info VALUES (?, ?)",
+            [(key, jsonio.dumps(value)) for key, value in (dataset_info or {}).items()]
+        )
+        conn.executemany(
+            "INSERT INTO global_assumptions VALUES (?, ?, ?, ?, ?)",
+            [(a['id'], a.get('title'), a.get('text'), a.get('type'), jsonio.dumps(a))
+             for a in global_assumptions]
+        )
+
+        for entry in entries:
+            result_id = entry['result_id']
+            conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (result_id, entry.get('result_name', ''), entry.get('explanation'), entry.get('domain'),
+                 entry.get('theory_status'), entry.get('review_status', 'draft'),
+                 jsonio.dumps(entry))
+            )
+            conn.executemany(
+                "INSERT INTO result_equations VALUES (?, ?, ?, ?, ?)",
+                [(result_id, i, eq.get('id'), eq.get('equation'), eq.get('equation_title'))
+                 for i, eq in enumerate(entry.get('result_equations') or [])]
+            )
+            definitions = entry.get('definitions') or []
+            conn.executemany(
+                "INSERT INTO definitions VALUES (?, ?, ?, ?)",
+                [(result_id, i, d.get('symbol'), d.get('definition')) for i, d in enumerate(definitions)]
+            )
+            derivation = entry.get('derivation') or []
+            conn.executemany(
+                "INSERT INTO derivation_steps VALUES (?, ?, ?, ?, ?, ?)",
+                [(result_id, i, step.get('step'), step.get('description'), step.get('equation'),
+                  step.get('equation_proven'))
+                 for i, step in enumerate(derivation)]
+            )
+            conn.executemany(
+                "INSERT INTO step_assumptions VALUES (?, ?, ?)",
+                [(result_id, step.get('step'), assumption_id)
+                 for step in derivation
+                 for assumption_id in step.get('assumptions') or []]
+            )
+            conn.executemany(
+                "INSERT INTO entry_assumptions VALUES (?, ?, ?, ?)",
+                [(result_id, i, assumption, int(assumption in global_ids))
+                 for i, assumption in enumerate(entry.get('assumptions') or [])]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO depends_on VALUES (?, ?)",
+                [(result_id, dep) for dep in entry.get('depends_on') or []]
+            )
+            if has_fts:
+                conn.execute(
+                    "INSERT INTO entries_fts VALUES (?, ?, ?, ?)",
+                    (result_id, entry.get('result_name', ''), entry.get('explanation', ''),
+                     '\n'.join(f"{d.get('symbol', '')}: {d.get('definition', '')}" for d in definitions))
+                )
+
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    return has_fts
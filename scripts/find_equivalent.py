@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Look up equations equivalent to a given one, or list equations shared by
+several entries, using the fingerprint index of theoria.equation_index.
+
+Equivalence is up to a cheap canonical form (term order, sides of '=',
+parentheses, a/b versus a*b^-1); with --rename, also up to symbol names.
+
+Usage:
+    python scripts/find_equivalent.py "m*c^2 = E" [--rename] [--dataset dataset.json]
+    python scripts/find_equivalent.py --duplicates [--rename]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from theoria import Dataset
+
+
+def format_location(location):
+    result_id, kind, equation_id = location
+    return f"{result_id}: {'result equation' if kind == 'result' else 'derivation step'} {equation_id}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find equivalent equations across TheorIA entries')
+    parser.add_argument('equation', nargs='?', help='AsciiMath equation to look up')
+    parser.add_argument('--duplicates', action='store_true',
+                        help='List equations that occur in more than one entry')
+    parser.add_argument('--rename', action='store_true', help='Ignore symbol names when comparing')
+    parser.add_argument('--dataset', default=str(ROOT),
+                        help='Repository root, entries directory or built dataset (default: this repository)')
+    args = parser.parse_args()
+    if not args.equation and not args.duplicates:
+        parser.error('give an equation or --duplicates')
+
+    ds = Dataset.open(args.dataset)
+    if args.duplicates:
+        groups = ds.equation_index().duplicates(up_to_renaming=args.rename)
+        for group in groups:
+            print('\n'.join(format_location(location) for location in group))
+            print()
+        print(f"{len(groups)} equations occur in more than one entry")
+        return 0
+
+    locations = ds.find_equivalent(args.equation, up_to_renaming=args.rename)
+    for location in locations:
+        print(format_location(location))
+    if not locations:
+        print('[OK] No equivalent equation found')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
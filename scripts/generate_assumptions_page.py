@@ -6,7 +6,6 @@ Follows the same structure as generate_index.py
 Requires: Python 3.11.12 (or compatible)
 """
 
-import json
 import os
 import re
 import sys
@@ -17,6 +16,11 @@ if sys.version_info < (3, 8):
     print("Error: Python 3.8 or higher is required")
     sys.exit(1)
 
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from assumption_index import build_assumption_index, usage_counts
+from theoria import jsonio
+
 
 # Type display names and ordering
 TYPE_CATEGORIES = {
@@ -33,8 +37,12 @@ def format_math_expression(expr):
     return f'`{expr}`'
 
 
-def generate_assumption_card(assumption):
-    """Generate assumption card HTML reusing entry card structure"""
+def generate_assumption_card(assumption, usage_index=None):
+    """
+    Generate assumption card HTML reusing entry card structure.
+    With a usage index, the "Used in" list and counts come from the entries
+    themselves rather than the assumption's used_in field.
+    """
     assumption_id = assumption.get('id', '')
     title = assumption.get('title', '')
     text = assumption.get('text', '').replace('hbar', 'ℏ')  # Replace hbar with Unicode ℏ
@@ -42,6 +50,13 @@ def generate_assumption_card(assumption):
     math_expressions = assumption.get('mathematical_expressions', [])
     symbol_definitions = assumption.get('symbol_definitions', [])
     used_in = assumption.get('used_in', [])
+    usage_label = 'Used in:'
+    if usage_index is not None:
+        used_in = usage_index['entry_level'].get(assumption_id, [])
+        counts = usage_counts(usage_index, assumption_id)
+        entries_label = 'entry' if counts['entries'] == 1 else 'entries'
+        steps_label = 'derivation step' if counts['steps'] == 1 else 'derivation steps'
+        usage_label = f"Used in {counts['entries']} {entries_label} ({counts['steps']} {steps_label}):"
 
     # Type badge styling (reusing entry status badges)
     type_display = assumption_type.upper()
@@ -82,7 +97,7 @@ def generate_assumption_card(assumption):
         )
         used_in_section = f'''
         <div class="assumption-usage">
-          <strong>Used in:</strong> {entry_links}
+          <strong>{usage_label}</strong> {entry_links}
         </div>'''
 
     return f'''
@@ -115,13 +130,13 @@ def generate_navigation(type_groups):
   '''
 
 
-def generate_type_section(assumption_type, group):
+def generate_type_section(assumption_type, group, usage_index=None):
     """Generate type section HTML"""
     anchor = assumption_type
     sorted_assumptions = sorted(group['assumptions'], key=lambda x: x.get('title', ''))
 
     cards_html = '\n      '.join(
-        generate_assumption_card(assumption)
+        generate_assumption_card(assumption, usage_index)
         for assumption in sorted_assumptions
     )
 
@@ -179,14 +194,22 @@ def generate_assumptions_page():
 
     # Read assumptions file
     try:
-        with open(assumptions_file, 'r', encoding='utf-8') as f:
-            assumptions_data = json.load(f)
+        assumptions_data = jsonio.load(assumptions_file)
     except Exception as error:
         print(f"Error reading assumptions.json: {error}")
         sys.exit(1)
 
     assumptions = assumptions_data.get('assumptions', [])
 
+    # Index which entries and derivation steps use each assumption
+    entries = []
+    for entry_file in sorted((project_root / 'entries').glob('*.json')):
+        try:
+            entries.append(jsonio.load(entry_file))
+        except Exception as error:
+            print(f"Warning: Could not read {entry_file.name}: {error}")
+    usage_index = build_assumption_index(entries)
+
     # Group assumptions by type and sort by type order
     type_groups = {}
     for assumption in assumptions:
@@ -209,7 +232,7 @@ def generate_assumptions_page():
     navigation = generate_navigation(type_groups)
 
     type_sections = '\n\n    '.join(
-        generate_type_section(assumption_type, group)
+        generate_type_section(assumption_type, group, usage_index)
         for assumption_type, group in sorted(type_groups.items(), key=lambda x: x[1]['order'])
     )
 
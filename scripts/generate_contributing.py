@@ -9,8 +9,12 @@ and instructions.
 
 import json
 import os
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from theoria import jsonio
+
 
 def format_example(example):
     """Format example data for markdown display"""
@@ -72,8 +76,7 @@ def generate_contributing_md(requirements_file, output_file):
     """Generate CONTRIBUTING.md from requirements JSON"""
 
     # Load requirements
-    with open(requirements_file, 'r', encoding='utf-8') as f:
-        requirements = json.load(f)
+    requirements = jsonio.load(requirements_file)
 
     lines = []
 
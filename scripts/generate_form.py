@@ -9,9 +9,13 @@ the hardcoded guidelines in the form.
 
 import json
 import os
+import sys
 import re
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from theoria import jsonio
+
 
 def format_guidelines_html(guidelines):
     """Format guidelines as HTML list items"""
@@ -155,8 +159,7 @@ def generate_form_html(schema_file, form_template_file, output_file):
     """Generate static form HTML from schema"""
     
     # Load schema
-    with open(schema_file, 'r', encoding='utf-8') as f:
-        schema_data = json.load(f)
+    schema_data = jsonio.load(schema_file)
     
     # Load form template
     with open(form_template_file, 'r', encoding='utf-8') as f:
@@ -9,14 +9,17 @@ to dynamically load field guidelines, examples, and validation rules.
 
 import json
 import os
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from theoria import jsonio
+
 def generate_js_requirements(requirements_file, output_file):
     """Generate JavaScript requirements file from requirements JSON"""
     
     # Load requirements
-    with open(requirements_file, 'r', encoding='utf-8') as f:
-        requirements = json.load(f)
+    requirements = jsonio.load(requirements_file)
     
     # Generate JavaScript content
     js_content = f"""// Auto-generated from {requirements_file}
@@ -6,12 +6,14 @@ Converts from Node.js to Python implementation
 Requires: Python 3.11.12 (or compatible)
 """
 
-import json
 import os
 import re
 import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from theoria import jsonio
+
 # Check Python version compatibility
 if sys.version_info < (3, 8):
     print("Error: Python 3.8 or higher is required")
@@ -134,15 +136,14 @@ def sync_manifest_version(project_root, version):
     manifest_path = project_root / 'manifest.json'
 
     try:
-        with open(manifest_path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
+        manifest = jsonio.load(manifest_path)
 
         old_version = manifest.get('dataset_version', 'Unknown')
 
         if old_version != version:
             manifest['dataset_version'] = version
             with open(manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(manifest, f, indent=2, ensure_ascii=False)
+                f.write(jsonio.dumps(manifest, indent=2))
                 f.write('\n')  # Add trailing newline
             print(f"Updated manifest.json version: {old_version} → {version}")
         else:
@@ -179,8 +180,7 @@ def generate_index_page():
 
     for entry_file in entry_files:
         try:
-            with open(entry_file, 'r', encoding='utf-8') as f:
-                entry_data = json.load(f)
+            entry_data = jsonio.load(entry_file)
 
             domain = entry_data.get('domain', 'physics')
             display_name = DOMAIN_CATEGORIES.get(domain, domain)
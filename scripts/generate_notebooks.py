@@ -4,13 +4,45 @@ Generate Jupyter notebooks from THEORIA dataset entries.
 Creates notebooks with programmatic verification code that can be opened directly in Google Colab.
 """
 
-import json
+import argparse
+import hashlib
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def create_notebook(entry_data):
-    """Create a Jupyter notebook from an entry's data."""
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'scripts'))
+from theoria import jsonio
+from verification_cache import installed_version, run_cached
+
+NOTEBOOK_SUFFIX = "_verification.ipynb"
+
+def result_to_outputs(result):
+    """Convert a verification result into nbformat v4 cell outputs."""
+    outputs = []
+    for stream in ('stdout', 'stderr'):
+        if result.get(stream):
+            outputs.append({
+                "name": stream,
+                "output_type": "stream",
+                "text": result[stream].splitlines(keepends=True)
+            })
+    if result.get('error'):
+        outputs.append({
+            "output_type": "error",
+            "ename": result['error']['ename'],
+            "evalue": result['error']['evalue'],
+            "traceback": result['error']['traceback']
+        })
+    return outputs
+
+def create_notebook(entry_data, outputs=None):
+    """
+    Create a Jupyter notebook from an entry's data.
+    If outputs is given, the verification cell is marked as executed with those outputs.
+    """
     entry_name = entry_data['result_name']
     entry_id = entry_data['result_id']
     library = entry_data['programmatic_verification']['library']
@@ -75,8 +107,8 @@ def create_notebook(entry_data):
                 "cell_type": "code",
                 "metadata": {},
                 "source": [line + "\n" for line in code],  # Add newlines to each line
-                "execution_count": None,
-                "outputs": []
+                "execution_count": None if outputs is None else 1,
+                "outputs": outputs or []
             },
             {
                 "cell_type": "markdown",
@@ -97,107 +129,191 @@ def create_notebook(entry_data):
     
     return notebook
 
-def generate_notebooks():
-    """Generate notebooks for all entries."""
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
-    entries_dir = repo_root / "entries"
-    notebooks_dir = repo_root / "notebooks"
-    
+def render_notebook(entry_data, outputs=None):
+    """Render an entry's notebook to the exact text written on disk."""
+    return jsonio.dumps(create_notebook(entry_data, outputs), indent=2)
+
+def content_hash(data):
+    """Return the SHA-256 hex digest of notebook text or bytes."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def write_if_changed(path, text):
+    """
+    Write text to path only if its content hash differs from the file on disk.
+    Returns 'created', 'updated' or 'unchanged'.
+    """
+    path = Path(path)
+    if path.exists():
+        if content_hash(path.read_bytes()) == content_hash(text):
+            return 'unchanged'
+        status = 'updated'
+    else:
+        status = 'created'
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return status
+
+def load_entry(entry_file):
+    """Load an entry's JSON data."""
+    return jsonio.load(entry_file)
+
+def execute_entry(entry_data, cache_dir=None):
+    """
+    Run an entry's verification code in-process and return notebook outputs.
+
+    Results are reused from the verification cache when the code and
+    environment are unchanged. Returns None if the required library is not
+    installed, leaving the cell unexecuted.
+    """
+    pv = entry_data['programmatic_verification']
+    library = pv['library']
+    lib_name = library.split()[0]
+    if lib_name.lower() != 'none' and installed_version(lib_name) is None:
+        print(f"[WARNING] {entry_data['result_id']}: {lib_name} is not installed - leaving notebook unexecuted")
+        return None
+
+    result, cache_hit = run_cached(pv['code'], library,
+                                   filename=f"<entry:{entry_data['result_id']}>",
+                                   cache_dir=cache_dir)
+    if not cache_hit:
+        print(f"[OK] Executed {entry_data['result_id']} ({result['status']}, {result['duration']:.2f}s)")
+    return result_to_outputs(result)
+
+def generate_notebooks(entries_dir=None, notebooks_dir=None, jobs=None, prune=True,
+                       execute=False, cache_dir=None):
+    """
+    Generate notebooks for all entries.
+
+    Notebooks are rendered in memory on a thread pool and only written when
+    their content changed, so unchanged files keep their mtime. Notebooks
+    whose entry no longer exists are removed when prune is set. With
+    execute, verification cells are run in-process (one at a time, since
+    output capture swaps sys.stdout) and their outputs stored in the notebook.
+    """
+    entries_dir = Path(entries_dir) if entries_dir else ROOT / "entries"
+    notebooks_dir = Path(notebooks_dir) if notebooks_dir else ROOT / "notebooks"
+
     # Ensure notebooks directory exists
     notebooks_dir.mkdir(exist_ok=True)
-    
-    # Process each entry
-    entries_processed = 0
+
+    entry_files = sorted(entries_dir.glob("*.json"))
+    counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
     errors = []
-    
-    for entry_file in entries_dir.glob("*.json"):
-        try:
-            print(f"Processing {entry_file.name}...")
-            
-            # Load entry data
-            with open(entry_file, 'r', encoding='utf-8') as f:
-                entry_data = json.load(f)
-            
-            # Generate notebook
-            notebook = create_notebook(entry_data)
-            
-            # Save notebook
-            notebook_filename = f"{entry_data['result_id']}_verification.ipynb"
-            notebook_path = notebooks_dir / notebook_filename
-            
-            with open(notebook_path, 'w', encoding='utf-8') as f:
-                json.dump(notebook, f, indent=2, ensure_ascii=False)
-            
-            entries_processed += 1
-            print(f"[OK] Created {notebook_filename}")
-            
-        except Exception as e:
-            error_msg = f"Error processing {entry_file.name}: {str(e)}"
-            errors.append(error_msg)
-            print(f"[ERROR] {error_msg}")
-    
+    # Entry stems are kept even if the entry fails to load, so a broken
+    # entry never causes its existing notebook to be pruned.
+    expected = {f"{entry_file.stem}{NOTEBOOK_SUFFIX}" for entry_file in entry_files}
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        load_futures = [(entry_file, executor.submit(load_entry, entry_file)) for entry_file in entry_files]
+
+        loaded = []
+        for entry_file, future in load_futures:
+            try:
+                entry_data = future.result()
+                outputs = execute_entry(entry_data, cache_dir) if execute else None
+                loaded.append((entry_file, entry_data, outputs))
+            except Exception as e:
+                error_msg = f"Error processing {entry_file.name}: {str(e)}"
+                errors.append(error_msg)
+                print(f"[ERROR] {error_msg}")
+
+        render_futures = [
+            (entry_file, entry_data, executor.submit(render_notebook, entry_data, outputs))
+            for entry_file, entry_data, outputs in loaded
+        ]
+
+        for entry_file, entry_data, future in render_futures:
+            try:
+                text = future.result()
+                notebook_filename = f"{entry_data['result_id']}{NOTEBOOK_SUFFIX}"
+                expected.add(notebook_filename)
+
+                status = write_if_changed(notebooks_dir / notebook_filename, text)
+                counts[status] += 1
+                if status != 'unchanged':
+                    print(f"[OK] {status.capitalize()} {notebook_filename}")
+
+            except Exception as e:
+                error_msg = f"Error processing {entry_file.name}: {str(e)}"
+                errors.append(error_msg)
+                print(f"[ERROR] {error_msg}")
+
+    if prune:
+        for notebook_path in sorted(notebooks_dir.glob(f"*{NOTEBOOK_SUFFIX}")):
+            if notebook_path.name not in expected:
+                notebook_path.unlink()
+                counts['removed'] += 1
+                print(f"[OK] Removed {notebook_path.name} (entry no longer exists)")
+
     # Summary
     print(f"\n--- Summary ---")
-    print(f"Entries processed: {entries_processed}")
+    print(f"Entries processed: {len(entry_files)}")
+    print(f"Created: {counts['created']}, updated: {counts['updated']}, "
+          f"unchanged: {counts['unchanged']}, removed: {counts['removed']}")
     print(f"Errors: {len(errors)}")
-    
+
     if errors:
         print("\nErrors encountered:")
         for error in errors:
             print(f"  - {error}")
         return 1
-    
+
     print("All notebooks generated successfully!")
     return 0
 
-def generate_single_notebook(entry_id):
+def generate_single_notebook(entry_id, entries_dir=None, notebooks_dir=None,
+                             execute=False, cache_dir=None):
     """Generate notebook for a single entry."""
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
-    entries_dir = repo_root / "entries"
-    notebooks_dir = repo_root / "notebooks"
-    
+    entries_dir = Path(entries_dir) if entries_dir else ROOT / "entries"
+    notebooks_dir = Path(notebooks_dir) if notebooks_dir else ROOT / "notebooks"
+
     # Ensure notebooks directory exists
     notebooks_dir.mkdir(exist_ok=True)
-    
+
     entry_file = entries_dir / f"{entry_id}.json"
-    
+
     if not entry_file.exists():
         print(f"Error: Entry file {entry_file} not found")
         return 1
-    
+
     try:
         print(f"Processing {entry_file.name}...")
-        
-        # Load entry data
-        with open(entry_file, 'r', encoding='utf-8') as f:
-            entry_data = json.load(f)
-        
-        # Generate notebook
-        notebook = create_notebook(entry_data)
-        
-        # Save notebook
-        notebook_filename = f"{entry_data['result_id']}_verification.ipynb"
-        notebook_path = notebooks_dir / notebook_filename
-        
-        with open(notebook_path, 'w', encoding='utf-8') as f:
-            json.dump(notebook, f, indent=2, ensure_ascii=False)
-        
-        print(f"[OK] Created {notebook_filename}")
+
+        entry_data = load_entry(entry_file)
+        outputs = execute_entry(entry_data, cache_dir) if execute else None
+        text = render_notebook(entry_data, outputs)
+        notebook_filename = f"{entry_data['result_id']}{NOTEBOOK_SUFFIX}"
+        status = write_if_changed(notebooks_dir / notebook_filename, text)
+
+        print(f"[OK] {status.capitalize()} {notebook_filename}")
         return 0
-        
+
     except Exception as e:
         print(f"[ERROR] Error processing {entry_file.name}: {str(e)}")
         return 1
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
+def main():
+    parser = argparse.ArgumentParser(description='Generate verification notebooks from TheorIA entries')
+    parser.add_argument('entry_id', nargs='?',
+                        help='Only generate the notebook for this entry (default: all entries)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Number of worker threads used to render notebooks (default: automatic)')
+    parser.add_argument('--no-prune', action='store_true',
+                        help='Keep notebooks whose entry no longer exists')
+    parser.add_argument('--execute', action='store_true',
+                        help='Run each verification cell and store its outputs (cached by code hash)')
+
+    args = parser.parse_args()
+
+    if args.entry_id:
         # Generate single notebook
-        entry_id = sys.argv[1]
-        exit_code = generate_single_notebook(entry_id)
-    else:
-        # Generate all notebooks
-        exit_code = generate_notebooks()
-    
-    sys.exit(exit_code)
\ No newline at end of file
+        return generate_single_notebook(args.entry_id, execute=args.execute)
+
+    # Generate all notebooks
+    return generate_notebooks(jobs=args.jobs, prune=not args.no_prune, execute=args.execute)
+
+if __name__ == "__main__":
+    sys.exit(main())
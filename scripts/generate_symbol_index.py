@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Generate docs/symbols.json, the symbol meaning index served with the site.
+
+Files every entry definition and global assumption symbol_definition under
+its normalized symbol and groups them into meanings (see
+theoria/symbol_index.py), so readers can see what 'L' or 'H' stands for
+across the corpus. With --report, also lists the symbols defined with more
+than one meaning, for reviewers checking notation.
+
+Usage:
+    python scripts/generate_symbol_index.py [--output docs/symbols.json] [--report]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from theoria import Dataset, jsonio
+from theoria.symbol_index import SymbolIndex
+
+OUTPUT = ROOT / 'docs' / 'symbols.json'
+
+
+def format_meaning(meaning):
+    sources = ', '.join(occurrence['id'] for occurrence in meaning['occurrences'])
+    return f"{meaning['label']} ({sources})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the symbol meaning index for the site')
+    parser.add_argument('--output', default=str(OUTPUT), help='Output file (default: docs/symbols.json)')
+    parser.add_argument('--report', action='store_true', help='List symbols defined with several meanings')
+    args = parser.parse_args()
+
+    ds = Dataset.open(ROOT)
+    index = SymbolIndex.build(ds, ds.global_assumptions)
+    divergent = index.divergent()
+    Path(args.output).write_text(jsonio.dumps(index.to_dict(), indent=2) + '\n', encoding='utf-8')
+    print(f"[OK] Indexed {len(index)} symbols into {args.output}")
+
+    if args.report:
+        for symbol, meanings in divergent.items():
+            print(f"\n{symbol}")
+            for meaning in meanings:
+                print(f"   - {format_meaning(meaning)}")
+    print(f"\n{len(divergent)} symbols have more than one meaning")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
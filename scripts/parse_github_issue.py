@@ -9,18 +9,35 @@ This script is part of the automated contribution workflow:
 3. This script parses the issue content into proper JSON format
 4. After validation, a pull request is automatically created
 5. The original issue is closed and linked to the PR
+
+Batch mode converts many issues at once, e.g. for backfills. Input is a
+JSONL file of issue objects (with 'body' and 'number' or 'id') or a
+directory of .md/.txt issue bodies. Issues are parsed and validated in
+parallel; passing entries are written to --output-dir as <result_id>.json
+next to a per-issue report.json:
+
+    python scripts/parse_github_issue.py --batch issues.jsonl --output-dir parsed/ [--jobs N]
 """
 
+import argparse
+import os
 import sys
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from typing import Dict, List, Any
 
-def parse_issue_body(body: str) -> Dict[str, Any]:
-    """Parse GitHub issue body into structured data."""
-    
-    # Extract form fields using regex patterns
-    patterns = {
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'scripts'))
+from theoria import jsonio
+from validate_schema import validate_entry_data
+
+# Form fields of the issue template, compiled once per process
+ISSUE_PATTERNS = {
+    key: re.compile(pattern, re.DOTALL | re.MULTILINE)
+    for key, pattern in {
         'entry_name': r'### Entry Name\s*\n\s*([^\n]+)',
         'result_id': r'### Entry ID\s*\n\s*([^\n]+)',
         'main_equations': r'### Main Equation\(s\)\s*\n\s*(.*?)(?=###|\Z)',
@@ -32,11 +49,18 @@ def parse_issue_body(body: str) -> Dict[str, Any]:
         'references': r'### References\s*\n\s*(.*?)(?=###|\Z)',
         'contributor_name': r'### Your Full Name\s*\n\s*([^\n]+)',
         'contributor_identifier': r'### Your Identifier\s*\n\s*([^\n]+)',
-    }
-    
+    }.items()
+}
+
+REQUIRED_FIELDS = ['result_id', 'result_name', 'result_equations', 'explanation', 'definitions']
+# The result_id pattern of schemas/entry.schema.json; result_id names the output file
+RESULT_ID_PATTERN = re.compile(r'[a-z0-9_]+')
+
+def parse_issue_body(body: str) -> Dict[str, Any]:
+    """Parse GitHub issue body into structured data."""
     extracted = {}
-    for key, pattern in patterns.items():
-        match = re.search(pattern, body, re.DOTALL | re.MULTILINE)
+    for key, pattern in ISSUE_PATTERNS.items():
+        match = pattern.search(body)
         if match:
             extracted[key] = match.group(1).strip()
     
@@ -165,6 +189,7 @@ def build_json_entry(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         'explanation': parsed_data.get('explanation', ''),
         'definitions': definitions,
         'assumptions': [],  # Will be filled manually if needed
+        'depends_on': [],
         'derivation': derivation,
         'programmatic_verification': {
             'language': 'python 3.11.12',
@@ -183,10 +208,147 @@ def build_json_entry(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
     
     return entry
 
+def missing_required_fields(entry: Dict[str, Any]) -> List[str]:
+    """Required fields that are absent or empty in a parsed entry."""
+    return [field for field in REQUIRED_FIELDS if not entry.get(field)]
+
+def invalid_result_id(entry: Dict[str, Any]) -> List[str]:
+    """Errors for a result_id that does not match the schema pattern (and could escape a directory)."""
+    if RESULT_ID_PATTERN.fullmatch(entry['result_id']):
+        return []
+    return [f"Invalid Entry ID '{entry['result_id']}': use lowercase letters, numbers and underscores only"]
+
+def convert_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse and validate one issue ({'id': ..., 'body': ...}).
+    Returns a report dict with status 'passed', 'missing_fields', 'invalid'
+    or 'error', the errors found and, unless parsing failed, the entry.
+    """
+    report = {'issue': issue['id'], 'result_id': None, 'status': 'passed', 'errors': []}
+    try:
+        entry = build_json_entry(parse_issue_body(issue['body'] or ''))
+    except Exception as e:
+        report.update(status='error', errors=[f"Error parsing issue: {e}"])
+        return report
+
+    report['result_id'] = entry['result_id']
+    report['entry'] = entry
+    missing_fields = missing_required_fields(entry)
+    if missing_fields:
+        report.update(status='missing_fields', errors=[f"Missing required fields: {missing_fields}"])
+        return report
+
+    # Checked before anything builds a path from the untrusted ID
+    id_errors = invalid_result_id(entry)
+    if id_errors:
+        report.update(status='invalid', errors=id_errors)
+        return report
+
+    is_valid, errors = validate_entry_data(entry)
+    if not is_valid:
+        report.update(status='invalid', errors=errors)
+    return report
+
+def load_issues(path) -> List[Dict[str, Any]]:
+    """
+    Read issues from a JSONL file (objects with 'body' and 'number' or 'id')
+    or from a directory of .md/.txt files holding one issue body each.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return [{'id': file.stem, 'body': file.read_text(encoding='utf-8')}
+                for file in sorted(path.iterdir()) if file.suffix in ('.md', '.txt')]
+
+    issues = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                issue = jsonio.loads(line)
+                issues.append({'id': issue.get('number', issue.get('id', line_number)),
+                               'body': issue.get('body', '')})
+    return issues
+
+def convert_issues(issues: List[Dict[str, Any]], jobs: int = None) -> List[Dict[str, Any]]:
+    """Convert issues in parallel worker processes; reports keep input order."""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(issues) < 2:
+        return [convert_issue(issue) for issue in issues]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(convert_issue, issues, chunksize=max(1, len(issues) // (jobs * 4))))
+
+def write_batch(reports: List[Dict[str, Any]], output_dir, entries_dir=None) -> Dict[str, int]:
+    """
+    Write passing entries to output_dir/<result_id>.json and the per-issue
+    report to output_dir/report.json. An entry whose result_id already exists
+    in entries_dir, or was produced by an earlier issue in the batch, is not
+    written and is reported as 'duplicate'; one whose path would resolve
+    outside output_dir is reported as 'invalid'. Returns counts per status.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_root = output_dir.resolve()
+    entries_dir = Path(entries_dir) if entries_dir else ROOT / 'entries'
+    seen = set()
+    counts = {}
+
+    for report in reports:
+        entry = report.pop('entry', None)
+        if report['status'] == 'passed':
+            result_id = report['result_id']
+            if (output_dir / f"{result_id}.json").resolve().parent != output_root:
+                report.update(status='invalid', errors=[f"Entry '{result_id}' would be written outside {output_dir}"])
+            elif result_id in seen or (entries_dir / f"{result_id}.json").exists():
+                report.update(status='duplicate', errors=[f"Entry '{result_id}' already exists"])
+            else:
+                seen.add(result_id)
+                report['output'] = f"{result_id}.json"
+                with open(output_dir / report['output'], 'w', encoding='utf-8') as f:
+                    f.write(jsonio.dumps(entry, indent=2) + '\n')
+        counts[report['status']] = counts.get(report['status'], 0) + 1
+
+    with open(output_dir / 'report.json', 'w', encoding='utf-8') as f:
+        f.write(jsonio.dumps({'summary': counts, 'issues': reports}, indent=2) + '\n')
+    return counts
+
+def run_batch(args) -> int:
+    """Batch mode entry point; returns the exit code."""
+    try:
+        issues = load_issues(args.batch)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error reading issues from {args.batch}: {e}", file=sys.stderr)
+        return 1
+
+    reports = convert_issues(issues, jobs=args.jobs)
+    counts = write_batch(reports, args.output_dir)
+
+    print(f"Processed {len(issues)} issues: " +
+          ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    for report in reports:
+        if report['status'] != 'passed':
+            print(f"  #{report['issue']} ({report['result_id'] or 'unparsed'}): {report['status']}")
+    print(f"Report written to {Path(args.output_dir) / 'report.json'}")
+    return 0 if counts.get('passed', 0) == len(reports) else 1
+
+def parse_batch_args(argv):
+    parser = argparse.ArgumentParser(description='Convert many GitHub issue submissions to entry JSON')
+    parser.add_argument('--batch', metavar='PATH', required=True,
+                        help='JSONL file of issues or directory of issue bodies')
+    parser.add_argument('--output-dir', default='parsed_entries',
+                        help='Directory for passing entries and report.json (default: parsed_entries)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Number of worker processes (default: CPU count)')
+    return parser.parse_args(argv)
+
 def main():
     """Main function to process GitHub issue body."""
+    # The single-issue form takes the raw body as its only argument
+    if '--batch' in sys.argv[1:]:
+        sys.exit(run_batch(parse_batch_args(sys.argv[1:])))
+
     if len(sys.argv) != 2:
         print("Usage: python parse_github_issue.py <issue_body>", file=sys.stderr)
+        print("       python parse_github_issue.py --batch <issues.jsonl|dir> [--output-dir DIR] [--jobs N]",
+              file=sys.stderr)
         sys.exit(1)
     
     issue_body = sys.argv[1]
@@ -199,12 +361,14 @@ def main():
         entry = build_json_entry(parsed_data)
         
         # Validate required fields
-        required_fields = ['result_id', 'result_name', 'result_equations', 'explanation', 'definitions']
-        missing_fields = [field for field in required_fields if not entry.get(field)]
+        missing_fields = missing_required_fields(entry)
         
         if missing_fields:
             print(f"Error: Missing required fields: {missing_fields}", file=sys.stderr)
             sys.exit(1)
+        for error in invalid_result_id(entry):
+            print(f"Error: {error}", file=sys.stderr)
+            sys.exit(1)
         
         # Output JSON
         print(json.dumps(entry, indent=2))
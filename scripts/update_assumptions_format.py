@@ -27,15 +27,18 @@ To:
 
 import json
 import os
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from theoria import jsonio
+
 def update_entry_assumptions(entry_path):
     """Update a single entry from old to new assumption format."""
     print(f"Processing {entry_path.name}...")
     
     try:
-        with open(entry_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = jsonio.load(entry_path)
     except (json.JSONDecodeError, FileNotFoundError) as e:
         print(f"  Error reading {entry_path}: {e}")
         return False
@@ -89,7 +92,7 @@ def update_entry_assumptions(entry_path):
     # Write back to file
     try:
         with open(entry_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write(jsonio.dumps(data, indent=2))
         print(f"  [OK] Updated {entry_path.name}")
         print(f"     Assumptions: {len(new_assumptions)}")
         print(f"     Dependencies: {len(new_dependencies)}")
@@ -7,16 +7,17 @@ This script performs two key validations:
 2. Verifies all listed assumptions/dependencies are used in derivation steps
 """
 
-import json
 import sys
 from pathlib import Path
 from typing import Set, List, Dict, Any
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from theoria import jsonio
+
 
 def load_json(filepath: Path) -> Dict[str, Any]:
     """Load and parse a JSON file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return jsonio.load(filepath)
 
 
 def get_all_entry_ids(entries_dir: Path) -> Set[str]:
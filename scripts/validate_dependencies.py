@@ -6,16 +6,37 @@ Checks for:
 2. Circular dependencies
 3. Reviewed entries only depending on other reviewed entries
 4. All assumption references exist in global assumptions
+
+With --fix-used-in, the 'used_in' arrays of globals/assumptions.json are
+first regenerated from the entries (keeping the file's formatting), so the
+used_in check cannot fail.
 """
 
+import argparse
 import json
+import re
 import sys
 from pathlib import Path
-from collections import defaultdict, deque
+from collections import deque
 
 # Get project root
 ROOT = Path(__file__).resolve().parents[1]
 
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'scripts'))
+from assumption_index import build_assumption_index
+from theoria import jsonio
+
+
+def entry_record(data, filename):
+    """The per-entry record the checks below work on."""
+    return {
+        'data': data,
+        'filename': filename,
+        'dependencies': data.get('depends_on', []),
+        'review_status': data.get('review_status', 'draft')
+    }
+
 
 def load_all_entries():
     """Load all entries and return entry data mapped by result_id."""
@@ -24,16 +45,10 @@ def load_all_entries():
     
     for json_file in entries_dir.glob('*.json'):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                result_id = data.get('result_id')
-                if result_id:
-                    entries[result_id] = {
-                        'data': data,
-                        'filename': json_file.name,
-                        'dependencies': data.get('depends_on', []),
-                        'review_status': data.get('review_status', 'draft')
-                    }
+            data = jsonio.load(json_file)
+            result_id = data.get('result_id')
+            if result_id:
+                entries[result_id] = entry_record(data, json_file.name)
         except (json.JSONDecodeError, FileNotFoundError) as e:
             print(f"[WARNING] Could not load {json_file.name}: {e}")
     
@@ -43,9 +58,8 @@ def load_all_entries():
 def load_global_assumptions():
     """Load global assumptions."""
     try:
-        with open(ROOT / 'globals' / 'assumptions.json', 'r', encoding='utf-8') as f:
-            assumptions_data = json.load(f)
-            return {item['id']: item for item in assumptions_data['assumptions']}
+        assumptions_data = jsonio.load(ROOT / 'globals' / 'assumptions.json')
+        return {item['id']: item for item in assumptions_data['assumptions']}
     except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
         print(f"[WARNING] Could not load global assumptions: {e}")
         return {}
@@ -98,27 +112,19 @@ def find_circular_dependencies(entries):
     return found_cycles
 
 
-def validate_dependencies_and_references():
-    """Main validation function."""
-    print("Validating dependencies and references")
-    print("=" * 60)
-    
-    # Load data
-    entries = load_all_entries()
-    global_assumptions = load_global_assumptions()
-    
-    if not entries:
-        print("[ERROR] No entries found to validate")
-        return False
-    
-    print(f"Loaded {len(entries)} entries and {len(global_assumptions)} global assumptions")
-    print()
-    
+def check_dependencies(entries, global_assumptions, log=print):
+    """
+    Run checks 1-7 on loaded entries ({result_id: entry_record(...)}).
+
+    Returns (errors, warnings), lists of (entry_ids, message) with the
+    result_ids each message is about. Progress goes to log; watch.py passes
+    a no-op to check its in-memory corpus quietly.
+    """
     errors = []
     warnings = []
     
     # 1. Check for non-existent dependencies
-    print("1. Checking for non-existent dependencies...")
+    log("1. Checking for non-existent dependencies...")
     missing_deps_errors = []
     missing_deps_warnings = []
     
@@ -127,19 +133,19 @@ def validate_dependencies_and_references():
             if dep not in entries:
                 if entry_info['review_status'] == 'reviewed':
                     missing_deps_errors.append((entry_id, dep, entry_info['filename']))
-                    errors.append(f"[ERROR] Reviewed entry '{entry_id}' ({entry_info['filename']}) depends on non-existent entry '{dep}'")
+                    errors.append(([entry_id], f"[ERROR] Reviewed entry '{entry_id}' ({entry_info['filename']}) depends on non-existent entry '{dep}'"))
                 else:
                     missing_deps_warnings.append((entry_id, dep, entry_info['filename']))
-                    warnings.append(f"[WARNING] Draft entry '{entry_id}' ({entry_info['filename']}) depends on non-existent entry '{dep}' (acceptable for draft)")
+                    warnings.append(([entry_id], f"[WARNING] Draft entry '{entry_id}' ({entry_info['filename']}) depends on non-existent entry '{dep}' (acceptable for draft)"))
     
     total_missing = len(missing_deps_errors) + len(missing_deps_warnings)
     if total_missing > 0:
-        print(f"  Found {total_missing} missing dependencies ({len(missing_deps_errors)} errors, {len(missing_deps_warnings)} warnings)")
+        log(f"  Found {total_missing} missing dependencies ({len(missing_deps_errors)} errors, {len(missing_deps_warnings)} warnings)")
     else:
-        print("  [OK] All dependencies point to existing entries")
+        log("  [OK] All dependencies point to existing entries")
     
     # 2. Check for circular dependencies
-    print("\n2. Checking for circular dependencies...")
+    log("\n2. Checking for circular dependencies...")
     cycles = find_circular_dependencies(entries)
     cycle_errors = []
     cycle_warnings = []
@@ -152,18 +158,18 @@ def validate_dependencies_and_references():
             
             if has_reviewed_entry:
                 cycle_errors.append(cycle_path)
-                errors.append(f"[ERROR] Circular dependency found: {cycle_display}")
+                errors.append((cycle_path[:-1], f"[ERROR] Circular dependency found: {cycle_display}"))
             else:
                 cycle_warnings.append(cycle_path)
-                warnings.append(f"[WARNING] Circular dependency found: {cycle_display} (should be fixed before review)")
+                warnings.append((cycle_path[:-1], f"[WARNING] Circular dependency found: {cycle_display} (should be fixed before review)"))
         
         total_cycles = len(cycle_errors) + len(cycle_warnings)
-        print(f"  Found {total_cycles} circular dependencies ({len(cycle_errors)} errors, {len(cycle_warnings)} warnings)")
+        log(f"  Found {total_cycles} circular dependencies ({len(cycle_errors)} errors, {len(cycle_warnings)} warnings)")
     else:
-        print("  [OK] No circular dependencies found")
+        log("  [OK] No circular dependencies found")
     
     # 3. Check reviewed entries dependencies (informational only)
-    print("\n3. Checking reviewed entries dependencies...")
+    log("\n3. Checking reviewed entries dependencies...")
     reviewed_depending_on_draft = []
     for entry_id, entry_info in entries.items():
         if entry_info['review_status'] == 'reviewed':
@@ -172,14 +178,14 @@ def validate_dependencies_and_references():
                     reviewed_depending_on_draft.append((entry_id, dep))
     
     if reviewed_depending_on_draft:
-        print(f"  [INFO] {len(reviewed_depending_on_draft)} reviewed entries depend on draft entries (this is expected during development)")
+        log(f"  [INFO] {len(reviewed_depending_on_draft)} reviewed entries depend on draft entries (this is expected during development)")
         for entry_id, dep in reviewed_depending_on_draft:
-            print(f"    - '{entry_id}' depends on draft entry '{dep}'")
+            log(f"    - '{entry_id}' depends on draft entry '{dep}'")
     else:
-        print("  [OK] All reviewed entries depend only on reviewed entries")
+        log("  [OK] All reviewed entries depend only on reviewed entries")
     
     # 4. Check assumption references
-    print("\n4. Checking assumption references...")
+    log("\n4. Checking assumption references...")
     invalid_assumption_errors = []
 
     for entry_id, entry_info in entries.items():
@@ -194,15 +200,15 @@ def validate_dependencies_and_references():
                     # Invalid assumption reference - always an error (draft or reviewed)
                     error_msg = f"Entry '{entry_id}' ({entry_info['filename']}) has invalid assumption ID '{assumption}' at index {i}"
                     invalid_assumption_errors.append((entry_id, assumption, i))
-                    errors.append(f"[ERROR] {error_msg} - all entries must only reference existing global assumption IDs from globals/assumptions.json")
+                    errors.append(([entry_id], f"[ERROR] {error_msg} - all entries must only reference existing global assumption IDs from globals/assumptions.json"))
 
     if len(invalid_assumption_errors) > 0:
-        print(f"  Found {len(invalid_assumption_errors)} invalid assumption references")
+        log(f"  Found {len(invalid_assumption_errors)} invalid assumption references")
     else:
-        print("  [OK] All assumption references are valid")
+        log("  [OK] All assumption references are valid")
 
     # 5. Check step-level assumption references
-    print("\n5. Checking step-level assumption references...")
+    log("\n5. Checking step-level assumption references...")
     undeclared_step_assumptions_errors = []
     undeclared_step_assumptions_warnings = []
 
@@ -224,68 +230,69 @@ def validate_dependencies_and_references():
 
                     if is_reviewed:
                         undeclared_step_assumptions_errors.append((entry_id, step_num, step_assumption))
-                        errors.append(f"[ERROR] {error_msg}")
+                        errors.append(([entry_id], f"[ERROR] {error_msg}"))
                     else:
                         undeclared_step_assumptions_warnings.append((entry_id, step_num, step_assumption))
-                        warnings.append(f"[WARNING] {error_msg}")
+                        warnings.append(([entry_id], f"[WARNING] {error_msg}"))
 
     total_undeclared = len(undeclared_step_assumptions_errors) + len(undeclared_step_assumptions_warnings)
     if total_undeclared > 0:
-        print(f"  Found {total_undeclared} undeclared step-level assumptions ({len(undeclared_step_assumptions_errors)} errors, {len(undeclared_step_assumptions_warnings)} warnings)")
+        log(f"  Found {total_undeclared} undeclared step-level assumptions ({len(undeclared_step_assumptions_errors)} errors, {len(undeclared_step_assumptions_warnings)} warnings)")
     else:
-        print("  [OK] All step-level assumptions are declared in entry prerequisites")
+        log("  [OK] All step-level assumptions are declared in entry prerequisites")
 
     # 6. Validate 'used_in' field in global assumptions
-    print("\n6. Checking 'used_in' field accuracy in global assumptions...")
+    log("\n6. Checking 'used_in' field accuracy in global assumptions...")
     used_in_errors = []
     used_in_warnings = []
 
-    # Build actual usage map: which entries actually use each assumption
-    actual_usage = defaultdict(set)
-    for entry_id, entry_info in entries.items():
-        for assumption_id in entry_info['data'].get('assumptions', []):
-            if assumption_id in global_assumptions:
-                actual_usage[assumption_id].add(entry_id)
-
-    # Check each assumption's used_in field
-    for assumption_id, assumption_data in global_assumptions.items():
-        declared_used_in = set(assumption_data.get('used_in', []))
-        actual_users = actual_usage.get(assumption_id, set())
-
-        # Check for entries in used_in that don't actually use the assumption
-        false_positives = declared_used_in - actual_users
-        for entry_id in false_positives:
-            if entry_id in entries:
-                is_reviewed = entries[entry_id]['review_status'] == 'reviewed'
-                error_msg = f"Assumption '{assumption_id}' lists '{entry_id}' in used_in, but '{entry_id}' doesn't reference it"
-                if is_reviewed:
-                    used_in_errors.append((assumption_id, entry_id, 'false_positive'))
-                    errors.append(f"[ERROR] {error_msg}")
-                else:
-                    used_in_warnings.append((assumption_id, entry_id, 'false_positive'))
-                    warnings.append(f"[WARNING] {error_msg}")
-
-        # Check for reviewed entries that use the assumption but aren't in used_in
-        false_negatives = actual_users - declared_used_in
-        for entry_id in false_negatives:
-            if entry_id in entries and entries[entry_id]['review_status'] == 'reviewed':
-                error_msg = f"Reviewed entry '{entry_id}' uses assumption '{assumption_id}' but is not listed in its used_in field"
-                used_in_errors.append((assumption_id, entry_id, 'false_negative'))
-                errors.append(f"[ERROR] {error_msg}")
-            elif entry_id in entries:
-                # Draft entry - just a warning
-                warning_msg = f"Draft entry '{entry_id}' uses assumption '{assumption_id}' but is not listed in its used_in field"
-                used_in_warnings.append((assumption_id, entry_id, 'false_negative'))
-                warnings.append(f"[WARNING] {warning_msg}")
+    # One pass over all references: compare (assumption, entry) pairs declared
+    # in used_in against the pairs found by the inverted assumption index
+    index = build_assumption_index(entry_info['data'] for entry_info in entries.values())
+    actual_pairs = {
+        (assumption_id, entry_id)
+        for assumption_id, users in index['entry_level'].items()
+        if assumption_id in global_assumptions
+        for entry_id in users
+    }
+    declared_pairs = {
+        (assumption_id, entry_id)
+        for assumption_id, assumption_data in global_assumptions.items()
+        for entry_id in assumption_data.get('used_in', [])
+    }
+
+    # Entries listed in used_in that don't actually use the assumption
+    for assumption_id, entry_id in sorted(declared_pairs - actual_pairs):
+        if entry_id in entries:
+            is_reviewed = entries[entry_id]['review_status'] == 'reviewed'
+            error_msg = f"Assumption '{assumption_id}' lists '{entry_id}' in used_in, but '{entry_id}' doesn't reference it"
+            if is_reviewed:
+                used_in_errors.append((assumption_id, entry_id, 'false_positive'))
+                errors.append(([entry_id], f"[ERROR] {error_msg}"))
+            else:
+                used_in_warnings.append((assumption_id, entry_id, 'false_positive'))
+                warnings.append(([entry_id], f"[WARNING] {error_msg}"))
+
+    # Entries that use the assumption but aren't in used_in
+    for assumption_id, entry_id in sorted(actual_pairs - declared_pairs):
+        if entries[entry_id]['review_status'] == 'reviewed':
+            error_msg = f"Reviewed entry '{entry_id}' uses assumption '{assumption_id}' but is not listed in its used_in field"
+            used_in_errors.append((assumption_id, entry_id, 'false_negative'))
+            errors.append(([entry_id], f"[ERROR] {error_msg}"))
+        else:
+            # Draft entry - just a warning
+            warning_msg = f"Draft entry '{entry_id}' uses assumption '{assumption_id}' but is not listed in its used_in field"
+            used_in_warnings.append((assumption_id, entry_id, 'false_negative'))
+            warnings.append(([entry_id], f"[WARNING] {warning_msg}"))
 
     total_used_in_issues = len(used_in_errors) + len(used_in_warnings)
     if total_used_in_issues > 0:
-        print(f"  Found {total_used_in_issues} used_in field issues ({len(used_in_errors)} errors, {len(used_in_warnings)} warnings)")
+        log(f"  Found {total_used_in_issues} used_in field issues ({len(used_in_errors)} errors, {len(used_in_warnings)} warnings)")
     else:
-        print("  [OK] All used_in fields are accurate")
+        log("  [OK] All used_in fields are accurate")
 
     # 7. Check that declared dependencies are used in step-level assumptions
-    print("\n7. Checking dependency usage in derivation steps...")
+    log("\n7. Checking dependency usage in derivation steps...")
     unused_dependency_errors = []
     unused_dependency_warnings = []
 
@@ -308,16 +315,39 @@ def validate_dependencies_and_references():
 
                 if is_reviewed:
                     unused_dependency_errors.append((entry_id, dep_id))
-                    errors.append(f"[ERROR] {error_msg}")
+                    errors.append(([entry_id], f"[ERROR] {error_msg}"))
                 else:
                     unused_dependency_warnings.append((entry_id, dep_id))
-                    warnings.append(f"[WARNING] {error_msg}")
+                    warnings.append(([entry_id], f"[WARNING] {error_msg}"))
 
     total_unused_deps = len(unused_dependency_errors) + len(unused_dependency_warnings)
     if total_unused_deps > 0:
-        print(f"  Found {total_unused_deps} unused dependencies ({len(unused_dependency_errors)} errors, {len(unused_dependency_warnings)} warnings)")
+        log(f"  Found {total_unused_deps} unused dependencies ({len(unused_dependency_errors)} errors, {len(unused_dependency_warnings)} warnings)")
     else:
-        print("  [OK] All declared dependencies are used in derivation step assumptions")
+        log("  [OK] All declared dependencies are used in derivation step assumptions")
+
+    return errors, warnings
+
+
+def validate_dependencies_and_references():
+    """Main validation function."""
+    print("Validating dependencies and references")
+    print("=" * 60)
+    
+    # Load data
+    entries = load_all_entries()
+    global_assumptions = load_global_assumptions()
+    
+    if not entries:
+        print("[ERROR] No entries found to validate")
+        return False
+    
+    print(f"Loaded {len(entries)} entries and {len(global_assumptions)} global assumptions")
+    print()
+    
+    errors, warnings = check_dependencies(entries, global_assumptions)
+    errors = [message for _, message in errors]
+    warnings = [message for _, message in warnings]
 
     # 8. Summary statistics
     print("\n8. Dependency statistics...")
@@ -353,8 +383,139 @@ def validate_dependencies_and_references():
         return True
 
 
+USED_IN_PATTERN = re.compile(r'"used_in"(\s*):(\s*)\[([^\]]*)\]')
+ID_PATTERN = re.compile(r'^([ \t]*)"id"\s*:\s*"([^"]+)"', re.MULTILINE)
+
+
+def expected_used_in(entries, global_assumptions):
+    """
+    Compute the used_in list of every global assumption from the entries.
+    Existing order is kept for entries that still use the assumption; new
+    users are appended in alphabetical order.
+    """
+    index = build_assumption_index(entry_info['data'] for entry_info in entries.values())
+    expected = {}
+    for assumption_id, assumption_data in global_assumptions.items():
+        users = index['entry_level'].get(assumption_id, [])
+        kept = [entry_id for entry_id in assumption_data.get('used_in', []) if entry_id in users]
+        expected[assumption_id] = kept + sorted(entry_id for entry_id in users if entry_id not in kept)
+    return expected
+
+
+def _format_used_in(entry_ids, original_body, item_indent):
+    """Render a used_in array in the style (single- or multi-line) of the original."""
+    if not entry_ids:
+        return '[]'
+    if '\n' not in original_body:
+        return '[' + ', '.join(json.dumps(entry_id) for entry_id in entry_ids) + ']'
+    closing_indent = original_body[original_body.rindex('\n') + 1:]
+    items = (',\n').join(f"{item_indent}{json.dumps(entry_id)}" for entry_id in entry_ids)
+    return f"[\n{items}\n{closing_indent}]"
+
+
+def _object_end(text, start):
+    """Index of the closing brace of the JSON object that contains position start."""
+    depth = 0
+    in_string = False
+    i = start
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if char == '\\':
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            if depth == 0:
+                return i
+            depth -= 1
+        i += 1
+    raise ValueError("Unterminated JSON object")
+
+
+def rewrite_used_in(text, expected):
+    """
+    Rewrite the used_in arrays in the text of globals/assumptions.json.
+
+    Only the used_in arrays are touched: existing arrays are replaced in
+    place (keeping single-line or multi-line layout) and missing ones are
+    appended as the last property of their assumption. Returns the new text.
+    """
+    ids = list(ID_PATTERN.finditer(text))
+    pieces = []
+    cursor = 0
+
+    for n, id_match in enumerate(ids):
+        indent, assumption_id = id_match.group(1), id_match.group(2)
+        if assumption_id not in expected:
+            continue
+        object_end = _object_end(text, id_match.end())
+        next_start = ids[n + 1].start() if n + 1 < len(ids) else len(text)
+        used_in_match = USED_IN_PATTERN.search(text, id_match.end(), min(object_end, next_start))
+
+        if used_in_match:
+            new_array = _format_used_in(expected[assumption_id], used_in_match.group(3), indent + '  ')
+            pieces.append(text[cursor:used_in_match.start()])
+            pieces.append(f'"used_in"{used_in_match.group(1)}:{used_in_match.group(2)}{new_array}')
+            cursor = used_in_match.end()
+        elif expected[assumption_id]:
+            last_property_end = len(text[:object_end].rstrip())
+            new_array = _format_used_in(expected[assumption_id], '', indent + '  ')
+            pieces.append(text[cursor:last_property_end])
+            pieces.append(f',\n{indent}"used_in": {new_array}')
+            cursor = last_property_end
+
+    pieces.append(text[cursor:])
+    return ''.join(pieces)
+
+
+def fix_used_in(assumptions_path=None):
+    """
+    Regenerate the used_in arrays of globals/assumptions.json from the entries.
+    Returns the number of assumptions whose used_in changed.
+    """
+    assumptions_path = Path(assumptions_path or ROOT / 'globals' / 'assumptions.json')
+    entries = load_all_entries()
+    # Validate against the file being rewritten, not the default globals file
+    text = assumptions_path.read_text(encoding='utf-8')
+    global_assumptions = {item['id']: item for item in jsonio.loads(text)['assumptions']}
+    expected = expected_used_in(entries, global_assumptions)
+
+    new_text = rewrite_used_in(text, expected)
+
+    # The rewrite must only have changed used_in values
+    rewritten = {item['id']: item for item in jsonio.loads(new_text)['assumptions']}
+    for assumption_id, assumption_data in global_assumptions.items():
+        original = {key: value for key, value in assumption_data.items() if key != 'used_in'}
+        updated = {key: value for key, value in rewritten[assumption_id].items() if key != 'used_in'}
+        if original != updated or rewritten[assumption_id].get('used_in', []) != expected[assumption_id]:
+            raise RuntimeError(f"Could not rewrite used_in for '{assumption_id}' safely")
+
+    changed = [
+        assumption_id for assumption_id in global_assumptions
+        if global_assumptions[assumption_id].get('used_in', []) != expected[assumption_id]
+    ]
+    if new_text != text:
+        assumptions_path.write_text(new_text, encoding='utf-8')
+    return len(changed)
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='Validate dependencies and references across all entries')
+    parser.add_argument('--fix-used-in', action='store_true',
+                        help="Regenerate the 'used_in' arrays of globals/assumptions.json before validating")
+    args = parser.parse_args()
+
+    if args.fix_used_in:
+        changed = fix_used_in()
+        print(f"[FIX] Regenerated used_in for {changed} global assumptions")
+        print()
+
     success = validate_dependencies_and_references()
     sys.exit(0 if success else 1)
 
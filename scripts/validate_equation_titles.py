@@ -4,6 +4,11 @@ Validate equation_title and equation_proven usage across all entries.
 Checks for:
 1. Reviewed entries must have equation_title for all result_equations
 2. Each equation_title must have at least one derivation step with equation_proven
+
+Entries are decoded into the typed model (theoria.model), so the checks
+read attributes rather than defensive .get() chains. An entry whose
+structure does not decode (for example a result equation without
+equation_title) is an error, since none of the checks could run on it.
 """
 
 import json
@@ -13,28 +18,33 @@ from collections import defaultdict
 
 # Get project root
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from theoria import ModelError, load_entry
 
 
 def load_all_entries():
-    """Load all entries and return entry data mapped by result_id."""
+    """
+    Load all entries as typed Entry objects, mapped by result_id.
+    Returns (entries, load_errors) with one error message per file that
+    could not be loaded.
+    """
     entries_dir = ROOT / 'entries'
     entries = {}
+    load_errors = []
 
-    for json_file in entries_dir.glob('*.json'):
+    for json_file in sorted(entries_dir.glob('*.json')):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                result_id = data.get('result_id')
-                if result_id:
-                    entries[result_id] = {
-                        'data': data,
-                        'filename': json_file.name,
-                        'review_status': data.get('review_status', 'draft')
-                    }
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            print(f"[WARNING] Could not load {json_file.name}: {e}")
+            entry = load_entry(json_file)
+        except (json.JSONDecodeError, FileNotFoundError, ModelError) as e:
+            load_errors.append(f"[ERROR] Could not load {json_file.name}: {e}")
+            continue
+        entries[entry.result_id] = {
+            'data': entry,
+            'filename': json_file.name,
+            'review_status': entry.review_status
+        }
 
-    return entries
+    return entries, load_errors
 
 
 def validate_equation_titles_and_proven():
@@ -43,9 +53,9 @@ def validate_equation_titles_and_proven():
     print("=" * 60)
 
     # Load data
-    entries = load_all_entries()
+    entries, load_errors = load_all_entries()
 
-    if not entries:
+    if not entries and not load_errors:
         print("[ERROR] No entries found to validate")
         return False
 
@@ -53,9 +63,11 @@ def validate_equation_titles_and_proven():
     draft_entries = [e for e in entries.values() if e['review_status'] == 'draft']
 
     print(f"Loaded {len(entries)} entries ({len(reviewed_entries)} reviewed, {len(draft_entries)} draft)")
+    if load_errors:
+        print(f"  Found {len(load_errors)} entries that could not be loaded; their checks are skipped")
     print()
 
-    errors = []
+    errors = list(load_errors)
     warnings = []
 
     # 1. Check equation_title requirements for reviewed entries
@@ -65,11 +77,9 @@ def validate_equation_titles_and_proven():
 
     for entry_id, entry_info in entries.items():
         is_reviewed = entry_info['review_status'] == 'reviewed'
-        result_equations = entry_info['data'].get('result_equations', [])
-
-        for i, eq in enumerate(result_equations):
-            if 'equation_title' not in eq or not eq['equation_title'].strip():
-                eq_id = eq.get('id', f'index-{i}')
+        for eq in entry_info['data'].result_equations:
+            if not eq.equation_title.strip():
+                eq_id = eq.id
                 error_msg = f"Entry '{entry_id}' ({entry_info['filename']}) equation '{eq_id}' missing equation_title"
 
                 if is_reviewed:
@@ -101,19 +111,18 @@ def validate_equation_titles_and_proven():
         is_reviewed = entry_info['review_status'] == 'reviewed'
 
         # Map equations with titles
-        result_equations = entry_info['data'].get('result_equations', [])
-        equation_ids = {eq['id'] for eq in result_equations if 'id' in eq}
+        result_equations = entry_info['data'].result_equations
+        equation_ids = {eq.id for eq in result_equations}
 
         for eq in result_equations:
-            if 'equation_title' in eq and eq['equation_title'].strip():
-                equation_titles[entry_id].append((eq['id'], eq['equation_title']))
+            if eq.equation_title.strip():
+                equation_titles[entry_id].append((eq.id, eq.equation_title))
 
         # Map derivation steps with equation_proven
-        derivation = entry_info['data'].get('derivation', [])
-        for step in derivation:
-            if 'equation_proven' in step and step['equation_proven'].strip():
-                eq_proven_id = step['equation_proven']
-                step_num = step.get('step', '?')
+        for step in entry_info['data'].derivation:
+            if step.equation_proven and step.equation_proven.strip():
+                eq_proven_id = step.equation_proven
+                step_num = step.step
                 equation_proven_refs[entry_id].append((step_num, eq_proven_id))
 
                 # Bonus check: verify equation_proven references valid equation ID
@@ -169,20 +178,20 @@ def validate_equation_titles_and_proven():
         if entry_id not in equation_titles or len(equation_titles[entry_id]) == 0:
             continue
 
-        derivation = entry_info['data'].get('derivation', [])
+        derivation = entry_info['data'].derivation
         if not derivation:
             continue
 
         # Find the last step with equation_proven
         last_proven_step = None
         for step in derivation:
-            if 'equation_proven' in step and step['equation_proven'].strip():
-                last_proven_step = step.get('step', 0)
+            if step.equation_proven and step.equation_proven.strip():
+                last_proven_step = step.step
 
         # Check if there are steps after the last proven step
         if last_proven_step is not None:
             for step in derivation:
-                step_num = step.get('step', 0)
+                step_num = step.step
                 if step_num > last_proven_step:
                     error_msg = f"Entry '{entry_id}' ({entry_info['filename']}) has step {step_num} after the last equation is proven (step {last_proven_step})"
 
@@ -5,20 +5,23 @@ Schema validation with clear error messages for TheorIA dataset contributors.
 
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Get project root
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from theoria import jsonio
 
 
+@lru_cache(maxsize=None)
 def load_global_assumptions():
-    """Load consolidated global assumptions file for validation."""
+    """Load consolidated global assumptions file for validation (once per process)."""
     global_assumptions = {}
     
     try:
-        with open(ROOT / 'globals' / 'assumptions.json', 'r', encoding='utf-8') as f:
-            assumptions_data = json.load(f)
-            global_assumptions = {item['id']: item for item in assumptions_data['assumptions']}
+        assumptions_data = jsonio.load(ROOT / 'globals' / 'assumptions.json')
+        global_assumptions = {item['id']: item for item in assumptions_data['assumptions']}
     except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
         print(f"[WARNING] Could not load global assumptions: {e}")
     
@@ -30,16 +33,23 @@ def validate_entry_schema(entry_path):
     Validate a single entry against the schema with helpful error messages.
     Returns (is_valid, error_messages).
     """
-    errors = []
-    
     try:
-        with open(entry_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = jsonio.load(entry_path)
     except json.JSONDecodeError as e:
         return False, [f"[ERROR] Invalid JSON syntax: {e}"]
     except FileNotFoundError:
         return False, [f"[ERROR] File not found: {entry_path}"]
-    
+
+    return validate_entry_data(data, filename_stem=entry_path.stem)
+
+
+def validate_entry_data(data, filename_stem=None):
+    """
+    Validate already-parsed entry data. filename_stem, when given, must
+    match result_id. Returns (is_valid, error_messages).
+    """
+    errors = []
+
     # Check required fields with specific guidance
     required_fields = {
         'result_id': "Unique identifier (must match filename without .json)",
@@ -48,6 +58,7 @@ def validate_entry_schema(entry_path):
         'explanation': "2-5 sentence summary (≤100 words)",
         'definitions': "Array defining all symbols used",
         'assumptions': "Array of assumptions that lead to the result equations",
+        'depends_on': "Array of entry result_ids the derivation builds on (empty if none)",
         'derivation': "Array of derivation steps with 'step', 'description', and 'equation'", 
         'programmatic_verification': "Object with 'language', 'library', and 'code'",
         'domain': "arXiv category (e.g., 'hep-th', 'gr-qc')",
@@ -68,8 +79,7 @@ def validate_entry_schema(entry_path):
     global_assumptions = load_global_assumptions()
     
     # Detailed validation for specific fields
-    filename_stem = entry_path.stem
-    if data.get('result_id') != filename_stem:
+    if filename_stem is not None and data.get('result_id') != filename_stem:
         errors.append(f"[ERROR] result_id mismatch:")
         errors.append(f"   → Expected: '{filename_stem}' (based on filename)")
         errors.append(f"   → Got: '{data.get('result_id')}'")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Validate that the symbols used in equations are defined.
+
+For every entry, checks in one pass over its result_equations and
+derivation[].equation that each symbol appears in definitions[].symbol or
+in the symbol_definitions of a referenced global assumption, and that each
+definition is used somewhere. See theoria/symbols.py for the matching rules.
+
+Findings are warnings, since derivations often introduce auxiliary
+symbols inline; with --strict, undefined symbols fail the run.
+
+Usage:
+    python scripts/validate_symbols.py [ENTRY_ID ...] [--strict]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from theoria import Dataset
+from theoria.symbols import symbol_coverage
+
+
+def format_location(location):
+    kind, equation_id = location
+    return f"result equation '{equation_id}'" if kind == 'result' else f"step {equation_id}"
+
+
+def check_entries(ds, result_ids=None):
+    """Return (undefined, unused) message lists for the given entries (default: all)."""
+    undefined, unused = [], []
+    global_assumptions = ds.global_assumptions
+    for result_id in result_ids or ds.ids():
+        report = symbol_coverage(ds[result_id], global_assumptions)
+        for name, locations in report['undefined'].items():
+            where = ', '.join(format_location(location) for location in locations)
+            undefined.append(f"Entry '{result_id}' uses undefined symbol '{name}' ({where})")
+        for symbol in report['unused']:
+            unused.append(f"Entry '{result_id}' defines '{symbol}' but no equation uses it")
+    return undefined, unused
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that equation symbols are defined and definitions are used')
+    parser.add_argument('entries', nargs='*', metavar='ENTRY_ID', help='Entries to check (default: all)')
+    parser.add_argument('--strict', action='store_true', help='Fail if any symbol is undefined')
+    args = parser.parse_args()
+
+    print("Validating symbol definitions")
+    print("=" * 60)
+    ds = Dataset.open(ROOT)
+    unknown = [result_id for result_id in args.entries if result_id not in ds]
+    if unknown:
+        print(f"[ERROR] Unknown entries: {', '.join(unknown)}")
+        return 1
+
+    undefined, unused = check_entries(ds, args.entries or None)
+    level = 'ERROR' if args.strict else 'WARNING'
+    for message in undefined:
+        print(f"[{level}] {message}")
+    for message in unused:
+        print(f"[WARNING] {message}")
+
+    print(f"\n{len(undefined)} undefined symbols, {len(unused)} unused definitions")
+    if args.strict and undefined:
+        return 1
+    if not undefined and not unused:
+        print("[OK] All symbols are defined and all definitions are used")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
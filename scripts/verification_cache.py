@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Kernel-free execution of verification snippets with a persistent result cache.
+
+Results are stored under build/cache/verification/ keyed by a hash of the
+snippet source, the library pin and the running interpreter and library
+versions, so a snippet is only executed again when one of those changes.
+
+Compiled code objects are kept separately under build/cache/bytecode/ as
+marshal data keyed by the source, the filename and the interpreter, so
+snippets that do have to run are not parsed and compiled again.
+"""
+
+import contextlib
+import hashlib
+import importlib
+import importlib.util
+import io
+import json
+import marshal
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from theoria import jsonio
+CACHE_DIR = ROOT / 'build' / 'cache' / 'verification'
+BYTECODE_DIR = ROOT / 'build' / 'cache' / 'bytecode'
+
+
+def installed_version(lib_name):
+    """Return the installed version of a library, or None if it is not importable."""
+    try:
+        mod = importlib.import_module(lib_name)
+    except ImportError:
+        return None
+    return getattr(mod, '__version__', 'unknown')
+
+
+def cache_key(code_lines, library):
+    """Hash a snippet together with the environment it runs in."""
+    lib_name = library.split()[0] if library else 'none'
+    payload = json.dumps({
+        'code': list(code_lines),
+        'library': library,
+        'library_version': installed_version(lib_name) if lib_name.lower() != 'none' else None,
+        'python': '.'.join(map(str, sys.version_info[:3])),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_result(key, cache_dir=None):
+    """Return a cached result for key, or None on a cache miss."""
+    path = Path(cache_dir or CACHE_DIR) / f"{key}.json"
+    try:
+        return jsonio.load(path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def store_result(key, result, cache_dir=None):
+    """Persist a result under key."""
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / f"{key}.json.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(jsonio.dumps(result))
+    tmp_path.replace(cache_dir / f"{key}.json")
+
+
+def compile_snippet(code_lines, filename='<verification>', cache_dir=None):
+    """
+    Compile a snippet, reusing a marshalled code object from an earlier run.
+    filename (e.g. '<entry:vis_viva>') shows up in tracebacks; see snippet_lineno.
+    Raises SyntaxError like compile().
+    """
+    source = '\n'.join(code_lines)
+    payload = json.dumps({
+        'source': source,
+        'filename': filename,
+        'python': sys.version,
+        'magic': importlib.util.MAGIC_NUMBER.hex(),
+    }, sort_keys=True)
+    key = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    path = Path(cache_dir or BYTECODE_DIR) / f"{key}.marshal"
+    try:
+        return marshal.loads(path.read_bytes())
+    except (FileNotFoundError, EOFError, ValueError, TypeError):
+        pass
+
+    code = compile(source, filename, 'exec', dont_inherit=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+    tmp_path.write_bytes(marshal.dumps(code))
+    tmp_path.replace(path)
+    return code
+
+
+def snippet_lineno(error, filename):
+    """
+    Line of the snippet compiled as filename where error was raised, or None.
+    Works for syntax errors and for exceptions raised while the snippet ran.
+    """
+    if isinstance(error, SyntaxError):
+        return error.lineno if error.filename == filename else None
+    frames = [frame for frame in traceback.extract_tb(error.__traceback__) if frame.filename == filename]
+    return frames[-1].lineno if frames else None
+
+
+def snippet_traceback(error, filename):
+    """
+    Traceback lines of error restricted to the frames of the snippet compiled
+    as filename, so the text does not depend on where the runner is installed.
+    """
+    frames = [frame for frame in traceback.extract_tb(error.__traceback__) if frame.filename == filename]
+    lines = ['Traceback (most recent call last):\n'] + traceback.format_list(frames) if frames else []
+    return lines + traceback.format_exception_only(type(error), error)
+
+
+def execute_snippet(code_lines, filename='<verification>'):
+    """
+    Execute a verification snippet in a clean namespace in this process.
+
+    Returns a dict with 'status' ('passed' or 'failed'), captured 'stdout'
+    and 'stderr', an 'error' dict (ename, evalue, traceback) or None, and
+    the wall-clock 'duration' in seconds. A snippet calling sys.exit() fails
+    like any other; only KeyboardInterrupt propagates.
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    error = None
+    start = time.perf_counter()
+
+    try:
+        code = compile_snippet(code_lines, filename)
+        exec_globals = {'__name__': '__main__', '__file__': filename}
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exec(code, exec_globals)
+    except KeyboardInterrupt:
+        raise
+    except BaseException as e:
+        error = {
+            'ename': type(e).__name__,
+            'evalue': str(e),
+            'traceback': snippet_traceback(e, filename),
+        }
+
+    return {
+        'status': 'failed' if error else 'passed',
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue(),
+        'error': error,
+        'duration': time.perf_counter() - start,
+    }
+
+
+def run_cached(code_lines, library, filename='<verification>', cache_dir=None):
+    """
+    Execute a snippet unless a result for the same code and environment is cached.
+    Returns (result, cache_hit).
+    """
+    key = cache_key(code_lines, library)
+    result = load_result(key, cache_dir)
+    if result is not None:
+        return result, True
+
+    result = execute_snippet(code_lines, filename)
+    store_result(key, result, cache_dir)
+    return result, False
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Warm verification worker, started by env_pool inside a pinned virtualenv.
+
+Imports the pinned library once, then reads one JSON job per line from
+stdin ({"code": [...], "filename": "<entry:...>"}) and writes one JSON
+result per line (see verification_cache.execute_snippet). Only the standard
+library and this repository are needed, so it runs in bare virtualenvs.
+
+Usage:
+    python scripts/verification_worker.py [LIBRARY]
+"""
+
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / 'scripts'))
+from verification_cache import execute_snippet, installed_version
+
+
+def main():
+    # Keep the protocol on a private copy of stdout; anything the snippets
+    # write to file descriptor 1 ends up on stderr instead
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    library = sys.argv[1] if len(sys.argv) > 1 else None
+    if library and library.lower() != 'none':
+        importlib.import_module(library)
+    protocol.write(json.dumps({
+        'python': '.'.join(map(str, sys.version_info[:3])),
+        'library_version': installed_version(library) if library and library.lower() != 'none' else None,
+    }) + '\n')
+    protocol.flush()
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        result = execute_snippet(job['code'], job.get('filename', '<verification>'))
+        protocol.write(json.dumps(result) + '\n')
+        protocol.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
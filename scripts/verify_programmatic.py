@@ -1,7 +1,19 @@
+import argparse
+import heapq
 import json
 import os
 import sys
 import importlib
+import re
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dependency_graph import build_graph, downstream
+from env_pool import EnvError, EnvPool, env_name, parse_pin
+from verification_cache import compile_snippet, installed_version, snippet_lineno
+from theoria import jsonio
 
 
 def normalize_version(ver: str):
@@ -14,132 +26,286 @@ def normalize_version(ver: str):
 entries_dir = os.path.join(os.path.dirname(__file__), '..', 'entries')
 
 
-def run_verifications() -> None:
-    """Run all programmatic verifications for dataset entries."""
+def runs_here(data: dict) -> bool:
+    """Whether the running interpreter and library match the entry's pins."""
+    pv = data.get('programmatic_verification') or {}
+    try:
+        python, lib_name, lib_ver = parse_pin(pv)
+    except ValueError:
+        # Malformed fields are reported by verify_entry
+        return True
+    current = '.'.join(map(str, sys.version_info[:3]))
+    if not current.startswith(pv['language'].split()[-1]):
+        return False
+    if lib_name == 'none':
+        return True
+    installed = installed_version(lib_name)
+    return installed is not None and (installed == 'unknown' or normalize_version(installed) == normalize_version(lib_ver))
+
+
+def verify_in_env(fname: str, data: dict, pool: EnvPool, filename: str) -> dict:
+    """Run an entry's snippet in the pooled environment matching its pins."""
+    pv = data['programmatic_verification']
+    pin = parse_pin(pv)
+    errors = []
+    try:
+        outcome = pool.run(pin, pv['code'], filename)
+    except EnvError as e:
+        errors.append(f"❌ {fname}: {e}")
+        errors.append(f"   → Fix: Add wheels for '{pv['library']}' to the wheelhouse or install Python {pin[0]}")
+        return {'status': 'failed', 'errors': errors, 'passed': None}
+
+    if outcome['status'] == 'passed':
+        return {'status': 'passed', 'errors': errors, 'passed': f"✅ {fname}: verification passed in {env_name(pin)}"}
+    error = outcome['error']
+    errors.append(f"❌ {fname}: Verification code failed in {env_name(pin)}")
+    errors.append(f"   → Error: {error['ename']}: {error['evalue']}")
+    lines = re.findall(rf'File "{re.escape(filename)}", line (\d+)', ''.join(error['traceback']))
+    if lines and int(lines[-1]) <= len(pv['code']):
+        errors.append(f"   → Problem near line {lines[-1]}: {pv['code'][int(lines[-1]) - 1].strip()}")
+    return {'status': 'failed', 'errors': errors, 'passed': None}
+
+
+def verify_entry(fname: str, path: str, data: dict, pool: EnvPool = None) -> dict:
+    """
+    Run the programmatic verification of a single loaded entry.
+
+    Returns a dict with 'status' ('passed', 'failed' or 'skipped'), the
+    'errors' messages to report and the 'passed' message, if any. With a
+    pool, entries pinned to another interpreter or library version run in
+    the matching pooled environment instead of failing the version checks.
+    """
     current_py_version = '.'.join(map(str, sys.version_info[:3]))
     errors = []
-    passed = []
+
+    def result(status, passed_msg=None):
+        return {'status': status, 'errors': errors, 'passed': passed_msg}
+
+    pv = data.get('programmatic_verification')
+    if not pv:
+        print(f"⚠️  {fname}: no programmatic_verification section - skipping")
+        return result('skipped')
+
+    # Validate required fields
+    missing_fields = []
+    language = pv.get('language', '')
+    library = pv.get('library', '')
+    code_lines = pv.get('code', [])
+
+    if not language:
+        missing_fields.append('language')
+    if not library:
+        missing_fields.append('library')
+    if not code_lines:
+        missing_fields.append('code')
+
+    if missing_fields:
+        errors.append(f"❌ {fname}: Missing required fields in programmatic_verification: {', '.join(missing_fields)}")
+        return result('failed')
+
+    # Parse versions
+    try:
+        py_ver = language.split()[-1]
+        if not py_ver.replace('.', '').isdigit():
+            errors.append(f"❌ {fname}: Invalid Python version format in 'language' field: '{language}'. Expected format: 'python X.Y.Z'")
+            return result('failed')
+    except IndexError:
+        errors.append(f"❌ {fname}: Invalid language format: '{language}'. Expected format: 'python X.Y.Z'")
+        return result('failed')
+
+    # Skip verification if no additional libraries are used
+    if library.lower() == 'none':
+        return result('skipped')
+
+    try:
+        lib_parts = library.split()
+        lib_name = lib_parts[0]
+        lib_ver = lib_parts[1] if len(lib_parts) > 1 else ''
+        if not lib_ver:
+            errors.append(f"❌ {fname}: Library version missing in 'library' field: '{library}'. Expected format: 'library_name X.Y.Z'")
+            return result('failed')
+    except IndexError:
+        errors.append(f"❌ {fname}: Invalid library format: '{library}'. Expected format: 'library_name X.Y.Z'")
+        return result('failed')
+
+    filename = f"<entry:{data.get('result_id', fname[:-len('.json')])}>"
+    if pool is not None and not runs_here(data):
+        return verify_in_env(fname, data, pool, filename)
+
+    # Check Python version compatibility
+    if not current_py_version.startswith(py_ver):
+        errors.append(f"❌ {fname}: Python version mismatch")
+        errors.append(f"   → Required: {py_ver}")
+        errors.append(f"   → Available: {current_py_version}")
+        errors.append(f"   → Fix: Update 'language' field to 'python {current_py_version}' or install Python {py_ver}")
+        return result('failed')
+
+    # Check library availability and version
+    try:
+        mod = importlib.import_module(lib_name)
+    except ImportError:
+        errors.append(f"❌ {fname}: Library '{lib_name}' not available")
+        errors.append(f"   → Fix: Install library with 'pip install {lib_name}=={lib_ver}'")
+        return result('failed')
+
+    cur_lib_ver = getattr(mod, '__version__', 'unknown')
+    if cur_lib_ver == 'unknown':
+        errors.append(f"⚠️  {fname}: Cannot determine {lib_name} version - proceeding anyway")
+    elif normalize_version(cur_lib_ver) != normalize_version(lib_ver):
+        errors.append(f"❌ {fname}: {lib_name} version mismatch")
+        errors.append(f"   → Required: {lib_ver}")
+        errors.append(f"   → Available: {cur_lib_ver}")
+        errors.append(f"   → Fix: Update 'library' field to '{lib_name} {cur_lib_ver}' or install {lib_name}=={lib_ver}")
+        return result('failed')
+
+    # Execute verification code, compiled under a filename that tracebacks can point to
+    try:
+        code = compile_snippet(code_lines, filename)
+        # Create a clean execution environment
+        exec_globals = {
+            '__name__': '__main__',
+            '__file__': path,
+        }
+        exec(code, exec_globals)
+        return result('passed', f"✅ {fname}: verification passed")
+    except Exception as e:
+        errors.append(f"❌ {fname}: Verification code failed")
+        errors.append(f"   → Error: {type(e).__name__}: {e}")
+
+        # Try to provide more specific guidance
+        if 'NameError' in str(type(e)):
+            errors.append(f"   → Tip: Check if all required imports are included in the code")
+        elif 'ImportError' in str(type(e)):
+            errors.append(f"   → Tip: Verify library dependencies are correctly specified")
+        elif 'AttributeError' in str(type(e)):
+            errors.append(f"   → Tip: Check object method names and library API compatibility")
+        elif 'ValueError' in str(type(e)) or 'TypeError' in str(type(e)):
+            errors.append(f"   → Tip: Verify input parameters and data types in calculations")
+
+        # Show problematic code section if possible
+        lineno = snippet_lineno(e, filename)
+        if lineno:
+            problem_line = code_lines[lineno - 1] if lineno <= len(code_lines) else "unknown"
+            errors.append(f"   → Problem near line {lineno}: {problem_line.strip()}")
+        failed = result('failed')
+        failed['traceback'] = traceback.format_exception(type(e), e, e.__traceback__)
+        return failed
+
+
+def dependency_edges(loaded: dict) -> dict:
+    """Map each entry file to the entry files it depends on via depends_on."""
+    id_to_fname = {data.get('result_id', fname[:-len('.json')]): fname for fname, (_, data) in loaded.items()}
+    edges = {}
+    for fname, (_, data) in loaded.items():
+        edges[fname] = [id_to_fname[dep] for dep in data.get('depends_on') or []
+                        if dep in id_to_fname and id_to_fname[dep] != fname]
+    return edges
+
+
+def run_verifications(jobs: int = 1, fail_fast: bool = False, env_pool: bool = False,
+                      wheelhouse: str = None) -> None:
+    """
+    Run all programmatic verifications for dataset entries.
+
+    Entries are verified in dependency order: an entry starts once every entry
+    it depends on has finished, and with jobs > 1 independent entries run in
+    parallel worker processes. With fail_fast, entries downstream of a failed
+    verification are reported as blocked instead of being executed. With
+    env_pool, entries whose pins differ from the running environment run in
+    warm workers from pinned virtualenvs (see env_pool.py).
+    """
+    results = {}
+    loaded = {}
 
     for fname in sorted(os.listdir(entries_dir)):
         if not fname.endswith('.json'):
             continue
         path = os.path.join(entries_dir, fname)
-        
+
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
+            data = jsonio.load(path)
         except json.JSONDecodeError as e:
-            errors.append(f"❌ {fname}: Invalid JSON format - {e}")
+            results[fname] = {'status': 'failed', 'errors': [f"❌ {fname}: Invalid JSON format - {e}"], 'passed': None}
             continue
         except FileNotFoundError:
-            errors.append(f"❌ {fname}: File not found")
+            results[fname] = {'status': 'failed', 'errors': [f"❌ {fname}: File not found"], 'passed': None}
             continue
 
-        pv = data.get('programmatic_verification')
-        if not pv:
-            print(f"⚠️  {fname}: no programmatic_verification section - skipping")
-            continue
+        loaded[fname] = (path, data)
 
-        # Validate required fields
-        missing_fields = []
-        language = pv.get('language', '')
-        library = pv.get('library', '')
-        code_lines = pv.get('code', [])
-        
-        if not language:
-            missing_fields.append('language')
-        if not library:
-            missing_fields.append('library')
-        if not code_lines:
-            missing_fields.append('code')
-            
-        if missing_fields:
-            errors.append(f"❌ {fname}: Missing required fields in programmatic_verification: {', '.join(missing_fields)}")
-            continue
+    graph = build_graph(dependency_edges(loaded))
+    pending = {fname: len(deps) for fname, deps in graph['adjacency'].items()}
+    ready = [fname for fname, count in pending.items() if count == 0]
+    heapq.heapify(ready)
 
-        # Parse versions
-        try:
-            py_ver = language.split()[-1]
-            if not py_ver.replace('.', '').isdigit():
-                errors.append(f"❌ {fname}: Invalid Python version format in 'language' field: '{language}'. Expected format: 'python X.Y.Z'")
-                continue
-        except IndexError:
-            errors.append(f"❌ {fname}: Invalid language format: '{language}'. Expected format: 'python X.Y.Z'")
-            continue
+    def finish(fname, result):
+        results[fname] = result
+        if fail_fast and result['status'] == 'failed':
+            blocked_here = [dependent for dependent in downstream(graph, fname) if dependent not in results]
+            for dependent in blocked_here:
+                results[dependent] = {'status': 'blocked', 'errors': [], 'passed': None, 'blocked_by': fname}
+            if blocked_here:
+                result['errors'].append(f"   → Blocks {len(blocked_here)} dependent entries: {', '.join(blocked_here)}")
+        for dependent in graph['reverse_adjacency'][fname]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0 and dependent not in results:
+                heapq.heappush(ready, dependent)
 
-        # Skip verification if no additional libraries are used
-        if library.lower() == 'none':
-            continue
-            
-        try:
-            lib_parts = library.split()
-            lib_name = lib_parts[0]
-            lib_ver = lib_parts[1] if len(lib_parts) > 1 else ''
-            if not lib_ver:
-                errors.append(f"❌ {fname}: Library version missing in 'library' field: '{library}'. Expected format: 'library_name X.Y.Z'")
-                continue
-        except IndexError:
-            errors.append(f"❌ {fname}: Invalid library format: '{library}'. Expected format: 'library_name X.Y.Z'")
-            continue
+    def next_ready(running):
+        while ready:
+            fname = heapq.heappop(ready)
+            if fname not in results and fname not in running:
+                return fname
+        if not running:
+            # Entries on a dependency cycle never become ready; run them in name order
+            remaining = sorted(fname for fname in loaded if fname not in results)
+            if remaining:
+                return remaining[0]
+        return None
 
-        # Check Python version compatibility
-        if not current_py_version.startswith(py_ver):
-            errors.append(f"❌ {fname}: Python version mismatch")
-            errors.append(f"   → Required: {py_ver}")
-            errors.append(f"   → Available: {current_py_version}")
-            errors.append(f"   → Fix: Update 'language' field to 'python {current_py_version}' or install Python {py_ver}")
-            continue
+    pool = EnvPool(wheelhouse=wheelhouse) if env_pool else None
+    if jobs <= 1:
+        fname = next_ready(())
+        while fname:
+            finish(fname, verify_entry(fname, *loaded[fname], pool))
+            fname = next_ready(())
+    else:
+        # Pooled entries only wait on their environment's worker, so threads are enough for them
+        with ProcessPoolExecutor(max_workers=jobs) as executor, ThreadPoolExecutor(max_workers=jobs) as threads:
+            running = {}
+            while True:
+                while len(running) < jobs:
+                    fname = next_ready(running.values())
+                    if not fname:
+                        break
+                    if pool is not None and not runs_here(loaded[fname][1]):
+                        future = threads.submit(verify_entry, fname, *loaded[fname], pool)
+                    else:
+                        future = executor.submit(verify_entry, fname, *loaded[fname])
+                    running[future] = fname
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fname = running.pop(future)
+                    try:
+                        finish(fname, future.result())
+                    except Exception as e:
+                        finish(fname, {'status': 'failed', 'passed': None,
+                                       'errors': [f"❌ {fname}: Verification worker failed - {type(e).__name__}: {e}"]})
+    if pool is not None:
+        pool.close()
 
-        # Check library availability and version
-        try:
-            mod = importlib.import_module(lib_name)
-        except ImportError:
-            errors.append(f"❌ {fname}: Library '{lib_name}' not available")
-            errors.append(f"   → Fix: Install library with 'pip install {lib_name}=={lib_ver}'")
-            continue
-
-        cur_lib_ver = getattr(mod, '__version__', 'unknown')
-        if cur_lib_ver == 'unknown':
-            errors.append(f"⚠️  {fname}: Cannot determine {lib_name} version - proceeding anyway")
-        elif normalize_version(cur_lib_ver) != normalize_version(lib_ver):
-            errors.append(f"❌ {fname}: {lib_name} version mismatch")
-            errors.append(f"   → Required: {lib_ver}")
-            errors.append(f"   → Available: {cur_lib_ver}")
-            errors.append(f"   → Fix: Update 'library' field to '{lib_name} {cur_lib_ver}' or install {lib_name}=={lib_ver}")
-            continue
-
-        # Execute verification code
-        code = '\n'.join(code_lines)
-        try:
-            # Create a clean execution environment
-            exec_globals = {
-                '__name__': '__main__',
-                '__file__': path,
-            }
-            exec(code, exec_globals)
-            passed.append(f"✅ {fname}: verification passed")
-        except Exception as e:
-            errors.append(f"❌ {fname}: Verification code failed")
-            errors.append(f"   → Error: {type(e).__name__}: {e}")
-            
-            # Try to provide more specific guidance
-            if 'NameError' in str(type(e)):
-                errors.append(f"   → Tip: Check if all required imports are included in the code")
-            elif 'ImportError' in str(type(e)):
-                errors.append(f"   → Tip: Verify library dependencies are correctly specified")
-            elif 'AttributeError' in str(type(e)):
-                errors.append(f"   → Tip: Check object method names and library API compatibility")
-            elif 'ValueError' in str(type(e)) or 'TypeError' in str(type(e)):
-                errors.append(f"   → Tip: Verify input parameters and data types in calculations")
-            
-            # Show problematic code section if possible
-            if hasattr(e, 'lineno'):
-                try:
-                    problem_line = code_lines[e.lineno - 1] if e.lineno <= len(code_lines) else "unknown"
-                    errors.append(f"   → Problem near line {e.lineno}: {problem_line.strip()}")
-                except:
-                    pass
-            continue
+    errors = []
+    passed = []
+    blocked = []
+    for fname in sorted(results):
+        result = results[fname]
+        errors.extend(result['errors'])
+        if result['passed']:
+            passed.append(result['passed'])
+        if result['status'] == 'blocked':
+            blocked.append(f"⛔ {fname}: not executed, depends on failed entry '{result['blocked_by']}'")
 
     # Print summary
     print("\n" + "="*60)
@@ -151,6 +317,11 @@ def run_verifications() -> None:
         for msg in passed:
             print(f"  {msg}")
     
+    if blocked:
+        print(f"\n⛔ BLOCKED ({len(blocked)} entries):")
+        for msg in blocked:
+            print(f"  {msg}")
+
     if errors:
         print(f"\n❌ FAILED ({len([e for e in errors if e.startswith('❌')])} entries):")
         for msg in errors:
@@ -169,5 +340,29 @@ def run_verifications() -> None:
     print(f"\n🎉 All {len(passed)} entries passed verification!")
 
 
+def main():
+    parser = argparse.ArgumentParser(description='Run programmatic verifications for TheorIA entries')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of worker processes for independent entries (default: 1)')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='Do not execute entries that depend on a failed entry; report them as blocked')
+    parser.add_argument('--fast', action='store_true',
+                        help='Accept numeric spot checks in theoria.verification.assert_equal without a symbolic proof')
+    parser.add_argument('--env-pool', action='store_true',
+                        help='Run entries pinned to other Python/library versions in pinned virtualenvs')
+    parser.add_argument('--wheelhouse', default=None,
+                        help='Wheel directory for building pinned virtualenvs (default: build/wheelhouse)')
+    parser.add_argument('--memo', action='store_true',
+                        help='Memoize simplify/expand/trigsimp/integrate from theoria.verification under build/cache/sympy')
+
+    args = parser.parse_args()
+    # Read by theoria.verification in this process and in the worker processes
+    if args.memo:
+        os.environ.setdefault('THEORIA_SYMPY_MEMO', '1')
+    if args.fast:
+        os.environ['THEORIA_VERIFY_MODE'] = 'fast'
+    run_verifications(jobs=args.jobs, fail_fast=args.fail_fast, env_pool=args.env_pool, wheelhouse=args.wheelhouse)
+
+
 if __name__ == "__main__":
-    run_verifications()
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+theoria-verifyd: a verification server for interactive authoring.
+
+Keeps the verification libraries (SymPy by default) imported and listens on
+a Unix socket. Every request is handled in a forked child, so a snippet that
+crashes, hangs or pollutes global state never affects the server or the next
+request, and the child starts with the libraries already imported.
+
+Requests and responses are single JSON lines:
+
+    {"path": "entries/vis_viva.json"}        run the entry's verification
+    {"code": [...], "filename": "<entry:x>"} run a snippet
+    {"op": "ping"}                           server pid and library versions
+
+An optional "timeout" (seconds) aborts a job with TimeoutError. Entry jobs
+return the verify_programmatic result ('status', 'errors', 'passed' and, on
+failure, 'traceback'); snippet jobs return the verification_cache result.
+Both include the 'duration' in seconds. test_entry.py and watch.py --daemon
+use the server when it is running, through submit_entry(), which limits
+each job to TIMEOUT seconds and stops waiting for a server that does not
+answer, so they can verify in-process instead.
+
+Usage:
+    python scripts/verifyd.py [--socket build/verifyd.sock] [--preload sympy,numpy]
+    python scripts/verifyd.py --stop
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'scripts'))
+from theoria import jsonio
+from verification_cache import execute_snippet, installed_version
+from verify_programmatic import verify_entry
+
+SOCKET = Path(os.environ.get('THEORIA_VERIFYD_SOCKET', ROOT / 'build' / 'verifyd.sock'))
+PRELOAD = ('sympy',)
+# Default job time limit for submit_entry, and how much longer the client waits for the reply
+TIMEOUT = 60
+GRACE = 5
+
+
+def pid_path(socket_path):
+    return Path(f"{socket_path}.pid")
+
+
+def _on_alarm(signum, frame):
+    raise TimeoutError('verification timed out')
+
+
+def verify_path(path):
+    """Run an entry file's verification, as verify_programmatic would."""
+    path = Path(path)
+    try:
+        data = jsonio.load(path)
+    except (OSError, json.JSONDecodeError) as e:
+        return {'status': 'failed', 'errors': [f"❌ {path.name}: Could not load entry - {e}"], 'passed': None}
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        result = verify_entry(path.name, str(path), data)
+    result['output'] = output.getvalue()
+    return result
+
+
+def handle_request(request, libraries=()):
+    """Compute the response to one request (runs in the forked child)."""
+    op = request.get('op', 'verify')
+    if op == 'ping':
+        return {'status': 'ok', 'pid': os.getppid(), 'python': '.'.join(map(str, sys.version_info[:3])),
+                'libraries': {name: installed_version(name) for name in libraries}}
+    if op != 'verify':
+        return {'status': 'error', 'error': f"Unknown op '{op}'"}
+
+    if request.get('timeout'):
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.alarm(max(1, int(request['timeout'])))
+    start = time.perf_counter()
+    if 'path' in request:
+        result = verify_path(request['path'])
+    elif 'code' in request:
+        result = execute_snippet(request['code'], request.get('filename', '<verification>'))
+    else:
+        return {'status': 'error', 'error': "A verify request needs 'path' or 'code'"}
+    signal.alarm(0)
+    result['duration'] = time.perf_counter() - start
+    return result
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = handle_request(request, self.server.libraries)
+        except Exception as e:
+            response = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+
+class VerificationServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server forking one child per request."""
+
+    def __init__(self, socket_path, libraries=PRELOAD):
+        self.libraries = [name for name in libraries if installed_version(name) is not None]
+        super().__init__(str(socket_path), _Handler)
+
+
+def submit(request, socket_path=None, timeout=None):
+    """
+    Send a request to a running server and return its response. Raises
+    OSError (e.g. FileNotFoundError, ConnectionRefusedError) when no server
+    is listening.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path or SOCKET))
+        client.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with client.makefile('rb') as reply:
+            line = reply.readline()
+    if not line:
+        raise ConnectionError('verification server closed the connection')
+    return json.loads(line)
+
+
+def submit_entry(path, socket_path=None, timeout=TIMEOUT):
+    """
+    Verify an entry file in a running server. The job is aborted after
+    timeout seconds and the reply awaited GRACE seconds longer. Returns the
+    verify_programmatic result, or None when no server answered in time or
+    the job did not finish (callers then verify in-process).
+    """
+    request = {'path': str(path), 'timeout': timeout}
+    try:
+        outcome = submit(request, socket_path, timeout=timeout + GRACE if timeout else None)
+    except (OSError, ValueError):
+        return None
+    return outcome if outcome.get('status') in ('passed', 'failed', 'skipped') else None
+
+
+def is_running(socket_path=None):
+    try:
+        return submit({'op': 'ping'}, socket_path, timeout=5)['status'] == 'ok'
+    except (OSError, ValueError):
+        return False
+
+
+def serve(socket_path=None, libraries=PRELOAD):
+    socket_path = Path(socket_path or SOCKET)
+    if is_running(socket_path):
+        print(f"[ERROR] A verification server is already listening on {socket_path}")
+        return 1
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        socket_path.unlink()
+
+    server = VerificationServer(socket_path, libraries)
+    # Terminate cleanly on SIGTERM so the socket and pid file are removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    pid_path(socket_path).write_text(str(os.getpid()))
+    print(f"[OK] theoria-verifyd listening on {socket_path} (pid {os.getpid()}, "
+          f"preloaded: {', '.join(server.libraries) or 'nothing'})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for path in (socket_path, pid_path(socket_path)):
+            if path.exists():
+                path.unlink()
+    return 0
+
+
+def stop(socket_path=None):
+    path = pid_path(socket_path or SOCKET)
+    if not path.exists():
+        print("[WARNING] No verification server is running")
+        return 0
+    try:
+        os.kill(int(path.read_text()), signal.SIGTERM)
+    except ProcessLookupError:
+        path.unlink()
+        print("[WARNING] Removed stale pid file")
+        return 0
+    print("[OK] Stopped verification server")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve programmatic verifications over a Unix socket')
+    parser.add_argument('--socket', default=str(SOCKET), help='Socket path (default: build/verifyd.sock)')
+    parser.add_argument('--preload', default=','.join(PRELOAD),
+                        help='Comma-separated libraries to import up front (default: sympy)')
+    parser.add_argument('--stop', action='store_true', help='Stop the server listening on --socket')
+    args = parser.parse_args()
+
+    if args.stop:
+        return stop(args.socket)
+    libraries = [name for name in args.preload.split(',') if name]
+    for name in libraries:
+        if installed_version(name) is None:
+            print(f"[WARNING] Cannot preload '{name}': not installed")
+    return serve(args.socket, libraries)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Watch entries/, globals/ and schemas/ and recheck only what an edit touches.
+
+Keeps the parsed corpus, the dependency graph and the imported verification
+libraries in memory. On each change it re-parses the edited files, updates
+the graph incrementally and, for the changed entries and everything that
+depends on them, runs schema validation, dependency checks and programmatic
+verification. Notebooks and the entries index are regenerated for changed
+entries. A change under globals/ or schemas/ rechecks every entry. The
+dependency checks are those of validate_dependencies.py, run on the
+in-memory corpus, and a verification running longer than --timeout seconds
+fails with TimeoutError instead of stalling the watcher. With --daemon,
+snippets run in forked children of a running theoria-verifyd
+(scripts/verifyd.py) instead of in the watcher itself.
+
+File events come from watchdog (inotify and friends) when it is installed;
+otherwise the directories are polled.
+
+Usage:
+    python scripts/watch.py [--interval 0.5] [--timeout 60] [--no-verify] [--no-regenerate] [--daemon]
+    python scripts/watch.py --once      # check everything once and exit
+"""
+
+import argparse
+import io
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / 'scripts'))
+from theoria import jsonio
+from dependency_graph import build_graph, downstream, update_graph
+import validate_schema
+from validate_dependencies import check_dependencies, entry_record
+from verify_programmatic import verify_entry
+import verifyd
+
+WATCHED_DIRS = ('entries', 'globals', 'schemas')
+TIMEOUT = verifyd.TIMEOUT
+
+
+@contextmanager
+def time_limit(seconds):
+    """Raise TimeoutError after seconds; no limit where SIGALRM is unavailable."""
+    if not seconds or not hasattr(signal, 'SIGALRM'):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, verifyd._on_alarm)
+    signal.alarm(max(1, int(seconds)))
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def snapshot(root):
+    """Return {path: (mtime_ns, size)} for the JSON files under the watched directories."""
+    state = {}
+    for name in WATCHED_DIRS:
+        for path in (Path(root) / name).glob('*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_paths(old, new):
+    """Paths added, removed or modified between two snapshots."""
+    return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+
+class Watcher:
+    """In-memory corpus that rechecks the entries affected by file changes."""
+
+    def __init__(self, root=None, verify=True, regenerate=True, daemon=False, timeout=TIMEOUT):
+        self.root = Path(root) if root else ROOT
+        self.entries_dir = self.root / 'entries'
+        self.verify = verify
+        self.daemon = daemon
+        self.timeout = timeout
+        self.regenerate = regenerate
+        self.corpus = {}
+        self.paths = {}
+        self.load_errors = {}
+        self.global_assumptions = {}
+        self.graph = None
+        self.state = {}
+
+    def _load_globals(self):
+        path = self.root / 'globals' / 'assumptions.json'
+        try:
+            self.global_assumptions = {item['id']: item for item in jsonio.load(path)['assumptions']}
+        except (OSError, ValueError, KeyError):
+            self.global_assumptions = {}
+        validate_schema.load_global_assumptions.cache_clear()
+
+    def _load_entry(self, path):
+        """Parse one entry file into the corpus; returns its result_id."""
+        result_id = path.stem
+        self.load_errors.pop(result_id, None)
+        try:
+            self.corpus[result_id] = jsonio.load(path)
+            self.paths[result_id] = path
+        except (OSError, ValueError) as e:
+            self.corpus.pop(result_id, None)
+            self.paths[result_id] = path
+            self.load_errors[result_id] = f"[ERROR] Invalid JSON syntax: {e}"
+        return result_id
+
+    def _edges(self):
+        return {result_id: list(data.get('depends_on') or []) for result_id, data in self.corpus.items()}
+
+    def start(self):
+        """Load everything; returns the result_ids to check initially (all of them)."""
+        self.state = snapshot(self.root)
+        self._load_globals()
+        for path in sorted(self.entries_dir.glob('*.json')):
+            self._load_entry(path)
+        self.graph = build_graph(self._edges())
+        return set(self.paths)
+
+    def apply(self, paths):
+        """
+        Fold changed paths into the corpus and graph. Returns (to_check,
+        changed, removed): entries to recheck, entries whose files changed
+        and entries whose files were deleted.
+        """
+        changed, removed = set(), set()
+        everything = False
+        for path in paths:
+            if path.parent == self.entries_dir:
+                if path.exists():
+                    changed.add(self._load_entry(path))
+                else:
+                    removed.add(path.stem)
+            else:
+                everything = True
+
+        # Dependents of deleted entries come from the graph before the update
+        dependents = set()
+        for result_id in removed:
+            if result_id in self.graph['nodes']:
+                dependents.update(downstream(self.graph, result_id))
+            self.corpus.pop(result_id, None)
+            self.paths.pop(result_id, None)
+            self.load_errors.pop(result_id, None)
+
+        if everything:
+            self._load_globals()
+        self.graph = update_graph(self.graph, self._edges())
+
+        if everything:
+            return set(self.paths), changed, removed
+        for result_id in changed:
+            if result_id in self.graph['nodes']:
+                dependents.update(downstream(self.graph, result_id))
+        return (changed | dependents) - removed, changed, removed
+
+    def dependency_errors(self):
+        """{result_id: [errors]} from the validate_dependencies checks on the whole corpus."""
+        entries = {result_id: entry_record(data, self.paths[result_id].name)
+                   for result_id, data in self.corpus.items()}
+        errors, _ = check_dependencies(entries, self.global_assumptions, log=lambda *args: None)
+        by_entry = {}
+        for entry_ids, message in errors:
+            for result_id in entry_ids:
+                by_entry.setdefault(result_id, []).append(message)
+        return by_entry
+
+    def check(self, result_ids):
+        """Return {result_id: [messages]} for the given entries; empty lists mean passed."""
+        order = [node for level in self.graph['levels'] for node in level] + self.graph['cyclic']
+        ranked = {node: i for i, node in enumerate(order)}
+        dependency_errors = self.dependency_errors()
+        results = {}
+        for result_id in sorted(result_ids, key=lambda node: (ranked.get(node, len(ranked)), node)):
+            if result_id in self.load_errors:
+                results[result_id] = [self.load_errors[result_id]]
+                continue
+            path = self.paths[result_id]
+            data = self.corpus[result_id]
+            _, errors = validate_schema.validate_entry_data(data, filename_stem=path.stem)
+            errors = [error for error in errors if not error.startswith('[WARNING]')]
+            errors += dependency_errors.get(result_id, [])
+            if self.verify and not errors:
+                outcome = self.verify_entry(path, data)
+                if outcome['status'] == 'failed':
+                    errors += outcome['errors']
+            results[result_id] = errors
+        return results
+
+    def verify_entry(self, path, data):
+        """Run an entry's verification, in the verification server with --daemon."""
+        if self.daemon:
+            outcome = verifyd.submit_entry(path, timeout=self.timeout)
+            if outcome is not None:
+                return outcome
+            # Server gone, stuck or the child died mid-job: fall back to running it here
+        with redirect_stdout(io.StringIO()):
+            try:
+                with time_limit(self.timeout):
+                    return verify_entry(path.name, str(path), data)
+            except TimeoutError:
+                # Fired outside the snippet, which verify_entry reports itself
+                return {'status': 'failed', 'errors': [f"❌ {path.name}: Verification timed out after "
+                                                       f"{self.timeout}s"], 'passed': None}
+
+    def regenerate_outputs(self, changed, removed):
+        """Rewrite notebooks of changed entries and the entries index page."""
+        from generate_index import generate_index_page
+        from generate_notebooks import NOTEBOOK_SUFFIX, render_notebook, write_if_changed
+
+        notebooks_dir = self.root / 'notebooks'
+        for result_id in sorted(changed):
+            if result_id in self.corpus:
+                write_if_changed(notebooks_dir / f"{result_id}{NOTEBOOK_SUFFIX}",
+                                 render_notebook(self.corpus[result_id]))
+        for result_id in removed:
+            (notebooks_dir / f"{result_id}{NOTEBOOK_SUFFIX}").unlink(missing_ok=True)
+        with redirect_stdout(io.StringIO()):
+            generate_index_page()
+
+    def poll(self):
+        """Return the paths changed since the last call."""
+        new_state = snapshot(self.root)
+        paths = changed_paths(self.state, new_state)
+        self.state = new_state
+        return paths
+
+
+def report(results):
+    """Print check results; returns True if everything passed."""
+    failed = {result_id: errors for result_id, errors in results.items() if errors}
+    for result_id, errors in failed.items():
+        print(f"[ERROR] {result_id}:")
+        for error in errors:
+            print(f"    {error}")
+    passed = len(results) - len(failed)
+    stamp = time.strftime('%H:%M:%S')
+    noun = 'entry' if len(results) == 1 else 'entries'
+    if failed:
+        print(f"[{stamp}] {passed}/{len(results)} {noun} passed, {len(failed)} failed")
+    else:
+        print(f"[{stamp}] [OK] {len(results)} {noun} passed")
+    return not failed
+
+
+def file_events(root):
+    """
+    Return a threading.Event set on file-system activity under the watched
+    directories, or None if watchdog is not installed.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    event = threading.Event()
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, _):
+            event.set()
+
+    observer = Observer()
+    for name in WATCHED_DIRS:
+        if (Path(root) / name).is_dir():
+            observer.schedule(Handler(), str(Path(root) / name), recursive=False)
+    observer.daemon = True
+    observer.start()
+    return event
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recheck entries affected by edits as you save them')
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help='Polling interval in seconds without watchdog (default: 0.5)')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT,
+                        help=f'Fail a verification after this many seconds (default: {TIMEOUT})')
+    parser.add_argument('--no-verify', action='store_true', help='Skip programmatic verification')
+    parser.add_argument('--no-regenerate', action='store_true',
+                        help='Do not rewrite notebooks and the entries index')
+    parser.add_argument('--once', action='store_true', help='Check every entry once and exit')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Run verifications in a running theoria-verifyd (scripts/verifyd.py)')
+    args = parser.parse_args()
+
+    if args.daemon and not verifyd.is_running():
+        print("[WARNING] No verification server is running; verifying in this process")
+    watcher = Watcher(verify=not args.no_verify, regenerate=not args.no_regenerate, daemon=args.daemon,
+                      timeout=args.timeout)
+    print(f"Loading {watcher.entries_dir}...")
+    ok = report(watcher.check(watcher.start()))
+    if args.once:
+        return 0 if ok else 1
+
+    events = file_events(watcher.root)
+    mode = 'file events' if events else f'polling every {args.interval}s'
+    print(f"Watching {', '.join(WATCHED_DIRS)} ({mode}); Ctrl+C to stop")
+    try:
+        while True:
+            if events:
+                events.wait()
+                time.sleep(0.1)  # let editors finish writing
+                events.clear()
+            else:
+                time.sleep(args.interval)
+            paths = watcher.poll()
+            if not paths:
+                continue
+            names = ', '.join(sorted(str(path.relative_to(watcher.root)) for path in paths))
+            print(f"\nChanged: {names}")
+            to_check, changed, removed = watcher.apply(paths)
+            report(watcher.check(to_check))
+            if watcher.regenerate and (changed or removed):
+                watcher.regenerate_outputs(changed, removed)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
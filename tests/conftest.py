@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def theoria_cache_dir(tmp_path_factory):
+    # Keep the AsciiMath parse cache (and any subprocess's) out of the user's home directory
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("THEORIA_CACHE_DIR", str(tmp_path_factory.mktemp("theoria-cache")))
+        yield
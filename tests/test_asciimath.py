@@ -0,0 +1,124 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import asciimath
+from theoria.asciimath import ParseCache, entry_equations, parse_uncached, to_text
+
+
+def corpus_equations():
+    for path in sorted((ROOT / "entries").glob("*.json")):
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        for _, equation in entry_equations(entry):
+            yield equation
+
+
+def test_corpus_parses_without_raising(tmp_path):
+    cache = ParseCache(tmp_path)
+    trees = [cache.parse(equation) for equation in corpus_equations()]
+    failed = [tree for tree in trees if tree[0] == "error"]
+    assert len(trees) > 400
+    assert len(failed) <= len(trees) // 50
+
+
+def test_ast_shapes():
+    assert parse_uncached("Delta q_i * Delta p_i >= hbar/2") == [
+        "rel", [">="], [
+            ["mul", ["juxt", ["sym", "Delta"], ["sub", ["sym", "q"], ["sym", "i"]]],
+                    ["juxt", ["sym", "Delta"], ["sub", ["sym", "p"], ["sym", "i"]]]],
+            ["frac", ["sym", "hbar"], ["num", "2"]],
+        ]]
+    # Unknown letter runs split like AsciiMath; aliases are normalized
+    assert parse_uncached("GM") == ["juxt", ["sym", "G"], ["sym", "M"]]
+    assert parse_uncached("partial x cdot y") == parse_uncached("del x * y")
+    assert parse_uncached("a_k, b; c")[0] == "list"
+
+
+def test_dirac_notation():
+    tree = parse_uncached("(:psi:| A |:psi:) = (:phi:|:chi:)")
+    assert tree[2][0] == ["juxt", ["bra", [["sym", "psi"]]], ["sym", "A"], ["ket", [["sym", "psi"]]]]
+    assert tree[2][1] == ["braket", [["sym", "phi"]], [["sym", "chi"]]]
+    assert parse_uncached("1/2*|(:psi:|[A,B]|:psi:)|")[2][0] == "apply"
+
+
+@pytest.mark.parametrize("text, canonical", [
+    ("vec L xx vec p", "vec(L) xx vec(p)"),
+    ("r(theta) = p/(1 + e*cos(theta))", "r(theta) = p/(1 + e*cos(theta))"),
+    ("E=-(G M m)/(2a)", "E = -(G M m)/(2 a)"),
+    ("x'^2 <= y_(i j)", "x'^2 <= y_(i j)"),
+])
+def test_to_text(text, canonical):
+    assert to_text(parse_uncached(text)) == canonical
+
+
+def test_errors_become_nodes(tmp_path):
+    cache = ParseCache(tmp_path)
+    tree = cache.parse("a = (b")
+    assert tree[0] == "error" and tree[1] == "a = (b"
+    with pytest.raises(asciimath.AsciiMathError):
+        parse_uncached("a = (b")
+
+
+def test_persistent_cache(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    tree = cache.parse("E = m*c^2")
+    cache.save()
+    assert cache.path.exists()
+
+    calls = []
+    monkeypatch.setattr(asciimath, "parse_uncached", lambda text: calls.append(text))
+    assert ParseCache(tmp_path).parse("E = m*c^2") == tree
+    assert calls == []
+
+
+def test_cache_location_and_concurrent_saves(tmp_path, monkeypatch):
+    monkeypatch.setenv("THEORIA_CACHE_DIR", str(tmp_path))
+    assert asciimath.cache_dir() == tmp_path / "asciimath"
+    monkeypatch.delenv("THEORIA_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert asciimath.cache_dir() == tmp_path / "xdg" / "theoria" / "asciimath"
+
+    # Two processes' caches, loaded before either saved, keep each other's entries
+    first, second = ParseCache(tmp_path), ParseCache(tmp_path)
+    first.parse("a = b")
+    second.parse("c = d")
+    first.save()
+    second.save()
+    assert len(json.loads(second.path.read_text(encoding="utf-8"))) == 2
+
+    # An unwritable location is skipped
+    (tmp_path / "file").write_text("")
+    cache = ParseCache(tmp_path / "file" / "asciimath")
+    cache.parse("a = b")
+    cache.save()
+
+
+def test_sympy_form():
+    sympy = pytest.importorskip("sympy")
+    E, m, v = sympy.symbols("E m v")
+    assert asciimath.sympy_form("E = 1/2*m*v^2") == sympy.Eq(E, m * v**2 / 2, evaluate=False)
+    theta = sympy.Symbol("theta")
+    assert asciimath.sympy_form("r(theta)") == sympy.Function("r")(theta)
+    assert asciimath.sympy_form("vec L") == sympy.Symbol("vec(L)")
+    # Derivatives and bra-kets stay ASTs
+    assert asciimath.sympy_form("(dJ)/(dt) = 0") is None
+    assert asciimath.sympy_form("(:psi:|psi:)") is None
+
+
+@pytest.mark.parametrize("text", ["sin(x, y) = 1", "log(a,b,c) = 0", "x^(a=b)", "(a=b) + 1", "2^(x > 1)"])
+def test_sympy_form_rejects_what_sympy_cannot_build(text):
+    pytest.importorskip("sympy")
+    assert asciimath.sympy_form(text) is None
+    with pytest.raises(asciimath.ConversionError):
+        asciimath.to_sympy(parse_uncached(text))
+
+
+def test_malformed_numbers():
+    with pytest.raises(asciimath.AsciiMathError, match="malformed number"):
+        parse_uncached("x = 0.5.3")
+    assert parse_uncached("x = .5")[2][1] == ["num", ".5"]
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / 'scripts'))
+
+from assumption_index import build_assumption_index, usage_counts
+
+
+ENTRIES = [
+    {
+        "result_id": "first",
+        "assumptions": ["shared", "only_first"],
+        "derivation": [
+            {"step": 1, "assumptions": ["shared"]},
+            {"step": 2, "assumptions": ["shared", "some_dependency"]},
+            {"step": 3},
+        ],
+    },
+    {
+        "result_id": "second",
+        "assumptions": ["shared"],
+        "derivation": [{"step": 1, "assumptions": ["shared"]}],
+    },
+    {"result_id": "third"},
+]
+
+
+def test_entry_and_step_level_use_are_split():
+    index = build_assumption_index(ENTRIES)
+
+    assert index["entry_level"] == {"shared": ["first", "second"], "only_first": ["first"]}
+    assert index["step_level"]["shared"] == [("first", 1), ("first", 2), ("second", 1)]
+    assert index["step_level"]["some_dependency"] == [("first", 2)]
+    assert "only_first" not in index["step_level"]
+
+
+def test_usage_counts():
+    index = build_assumption_index(ENTRIES)
+
+    assert usage_counts(index, "shared") == {"entries": 2, "steps": 3}
+    assert usage_counts(index, "unknown") == {"entries": 0, "steps": 0}
@@ -32,6 +32,8 @@ except ImportError as e:
     print(f"Could not import build_ml_dataset module: {e}")
     sys.exit(1)
 
+from theoria.symbol_index import SymbolIndex
+
 class TestBuildMLDataset(unittest.TestCase):
 
     def setUp(self):
@@ -232,6 +234,9 @@ class TestBuildMLDataset(unittest.TestCase):
 
             # Check global assumptions
             self.assertEqual(len(dataset["global_assumptions"]), 2)
+            usage = {a["id"]: a["usage"] for a in dataset["global_assumptions"]}
+            self.assertEqual(usage["classical_mechanics_framework"], {"entries": 1, "steps": 0})
+            self.assertEqual(usage["inertial_reference_frame"], {"entries": 0, "steps": 0})
 
             # Check entries
             self.assertEqual(len(dataset["entries"]), 1)
@@ -243,8 +248,14 @@ class TestBuildMLDataset(unittest.TestCase):
             self.assertEqual(entry["assumptions"][0]["type"], "global")
             self.assertEqual(entry["assumptions"][1]["type"], "direct")
 
-            # Check output file was created
+            # Check output file and equation and symbol indexes were created
             self.assertTrue(os.path.exists(output_file))
+            self.assertEqual(info["equation_index"], "test_output.json.equations.json")
+            self.assertTrue(os.path.exists("test_output.json.equations.json"))
+            self.assertEqual(info["symbol_index"], "test_output.json.symbols.json")
+            symbols = SymbolIndex.load("test_output.json.symbols.json")
+            self.assertEqual(symbols.contexts("c"), [{"source": "assumption", "id": "classical_mechanics_framework",
+                                                      "symbol": "c", "definition": "Speed of light"}])
 
             # Clean up
             os.remove(output_file)
@@ -277,6 +288,51 @@ class TestBuildMLDataset(unittest.TestCase):
         finally:
             os.chdir(original_cwd)
 
+    def test_build_dataset_encode_ids(self):
+        """Test integer-ID encoding with a vocabulary file"""
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+        from theoria import Dataset
+
+        original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+
+        try:
+            os.makedirs("globals", exist_ok=True)
+            with open("globals/assumptions.json", 'w') as f:
+                json.dump(self.sample_assumptions, f)
+
+            plain = build_dataset(include_drafts=True, output_file="plain.json")
+            encoded = build_dataset(include_drafts=True, output_file="encoded.json", encode_ids=True)
+
+            self.assertEqual(encoded["dataset_info"]["vocabulary"]["file"], "encoded.json.vocab.json")
+            with open("encoded.json.vocab.json") as f:
+                strings = json.load(f)["strings"]
+            entry = encoded["entries"][0]
+            self.assertEqual(strings[entry["review_status"]], "reviewed")
+            self.assertEqual(strings[entry["assumptions"][0]["id"]], "classical_mechanics_framework")
+            self.assertEqual(strings[entry["result_equations"][0]["id"]], "eq1")
+
+            # Readers decode the IDs back transparently
+            decoded = Dataset.open("encoded.json")
+            for original in plain["entries"]:
+                self.assertEqual(decoded[original["result_id"]], original)
+
+            # Another format gets its own vocabulary and index instead of overwriting these
+            build_dataset(include_drafts=False, output_file="encoded.pack", output_format="packed", encode_ids=True)
+            self.assertTrue(os.path.exists("encoded.pack.vocab.json"))
+            self.assertTrue(os.path.exists("encoded.pack.equations.json"))
+            self.assertTrue(os.path.exists("encoded.pack.symbols.json"))
+            self.assertEqual(Dataset.open("encoded.json")["test_entry_1"], plain["entries"][0])
+
+            # A vocabulary that does not match the dataset is refused
+            with open("encoded.json.vocab.json", "w") as f:
+                json.dump({"strings": list(reversed(strings))}, f)
+            with self.assertRaises(ValueError):
+                Dataset.open("encoded.json")
+
+        finally:
+            os.chdir(original_cwd)
+
     def test_invalid_json_handling(self):
         """Test handling of invalid JSON files"""
         # Create invalid JSON file
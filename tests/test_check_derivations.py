@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "scripts"))
+
+pytest.importorskip("sympy")
+
+from check_derivations import check_entries, check_step, relation_pairs
+from theoria import Dataset
+
+
+def test_relation_pairs():
+    assert len(relation_pairs("a = b = c")) == 2
+    assert len(relation_pairs("x = 1, y = 2 => x + y = 3")) == 3
+    assert relation_pairs("x < y") == []
+
+
+@pytest.mark.parametrize("equation, sources, status, route", [
+    ("(a + b)^2 = a^2 + 2 a b + b^2", [], "proved", "identity"),
+    ("2 E = m v^2", ["E = 1/2 m v^2"], "proved", "equivalent"),
+    ("v_p = (r_a v_a)/r_p", ["v_a r_a = v_p r_p"], "proved", "substitution"),
+    ("E = p c", ["E = m c^2", "m = p/c"], "proved", "substitution"),
+])
+def test_confirmed_steps(equation, sources, status, route):
+    assert check_step({"equation": equation, "sources": sources}) == {"status": status, "route": route}
+
+
+def test_wrong_step_is_unconfirmed():
+    result = check_step({"equation": "E = m c^3", "sources": ["E = m c^2"]})
+    assert result["status"] == "unconfirmed"
+    assert check_step({"equation": "(dE)/(dt) = 0", "sources": ["E = m c^2"]})["status"] == "skipped"
+
+
+def test_check_entries_caches_results(tmp_path, monkeypatch):
+    ds = Dataset.open(ROOT)
+    results = check_entries(ds, ["vis_viva"], cache_dir=tmp_path)
+    statuses = [outcome["status"] for outcome in results["vis_viva"]]
+    assert statuses.count("proved") >= 2
+    assert len(list(tmp_path.rglob("*.json"))) == len(statuses)
+
+    import check_derivations
+    monkeypatch.setattr(check_derivations, "check_step", lambda task: pytest.fail("cache miss"))
+    assert check_entries(ds, ["vis_viva"], cache_dir=tmp_path) == results
@@ -0,0 +1,51 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import Dataset
+from theoria.compression import detect_compression, open_compressed, read_bytes, with_suffix
+
+
+DATASET = {
+    "dataset_info": {"name": "TheorIA Dataset"},
+    "global_assumptions": [],
+    "entries": [{"result_id": "a", "explanation": "ℏ ω / 2"}],
+}
+
+
+def test_gzip_round_trip_is_detected_and_deterministic(tmp_path):
+    first, second = tmp_path / "one.json.gz", tmp_path / "two.json.gz"
+    for path in (first, second):
+        with open_compressed(path, "wt", compression="gzip") as f:
+            json.dump(DATASET, f, indent=2, ensure_ascii=False)
+
+    assert detect_compression(first) == "gzip"
+    assert first.read_bytes() == second.read_bytes()
+    assert json.loads(read_bytes(first)) == DATASET
+    assert Dataset.open(first)["a"]["explanation"] == "ℏ ω / 2"
+
+
+def test_uncompressed_files_read_unchanged(tmp_path):
+    path = tmp_path / "dataset.json"
+    path.write_text(json.dumps(DATASET), encoding="utf-8")
+
+    assert detect_compression(path) is None
+    with open_compressed(path) as f:
+        assert json.load(f) == DATASET
+    assert with_suffix("dataset.json", None) == "dataset.json"
+    assert with_suffix("dataset.json", "zstd") == "dataset.json.zst"
+
+
+def test_zstd_round_trip(tmp_path):
+    pytest.importorskip("zstandard")
+    path = tmp_path / "dataset.json.zst"
+    with open_compressed(path, "wt", compression="zstd") as f:
+        json.dump(DATASET, f)
+
+    assert detect_compression(path) == "zstd"
+    assert Dataset.open(path).ids() == ["a"]
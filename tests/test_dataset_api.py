@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import Dataset
+
+
+ENTRIES = {
+    "base": {"domain": "hep-th", "review_status": "reviewed", "assumptions": ["shared"]},
+    "middle": {"domain": "hep-th", "review_status": "draft", "depends_on": ["base"],
+               "derivation": [{"step": 1, "assumptions": ["base"]}]},
+    "top": {"domain": "gr-qc", "review_status": "reviewed", "depends_on": ["middle", "missing"],
+            "assumptions": ["shared"]},
+}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "entries").mkdir()
+    (tmp_path / "globals").mkdir()
+    for result_id, fields in ENTRIES.items():
+        data = dict(fields, result_id=result_id, result_name=result_id.title())
+        (tmp_path / "entries" / f"{result_id}.json").write_text(json.dumps(data))
+    (tmp_path / "globals" / "assumptions.json").write_text(
+        json.dumps({"assumptions": [{"id": "shared", "text": "Shared"}]}))
+    return tmp_path
+
+
+def test_open_repository_and_lookup(repo):
+    ds = Dataset.open(repo)
+
+    assert len(ds) == 3
+    assert ds.ids() == ["base", "middle", "top"]
+    assert ds["top"]["result_name"] == "Top"
+    assert "missing" not in ds
+    assert ds.get("missing") is None
+    with pytest.raises(KeyError):
+        ds["missing"]
+    assert list(ds.global_assumptions) == ["shared"]
+
+
+def test_entries_are_loaded_lazily(repo):
+    ds = Dataset.open(repo / "entries")
+    (repo / "entries" / "middle.json").write_text("{ not json")
+
+    assert ds["base"]["result_id"] == "base"
+    with pytest.raises(json.JSONDecodeError):
+        ds["middle"]
+
+
+def test_filtered_iteration(repo):
+    ds = Dataset.open(repo)
+
+    assert [e["result_id"] for e in ds.filter(domain="hep-th")] == ["base", "middle"]
+    assert [e["result_id"] for e in ds.filter(review_status="reviewed", assumption="shared")] == ["base", "top"]
+    assert [e["result_id"] for e in ds.filter(step_assumption="base")] == ["middle"]
+
+
+def test_graph_traversal(repo):
+    ds = Dataset.open(repo)
+
+    assert ds.dependencies("top") == ["middle"]
+    assert ds.dependents("base") == ["middle"]
+    assert ds.upstream("top") == ["base", "middle"]
+    assert ds.downstream("base") == ["middle", "top"]
+
+
+def test_graph_artifact_is_used_when_fresh(repo):
+    sys.path.append(str(ROOT / "scripts"))
+    import dependency_graph
+
+    graph = dependency_graph.build_graph({"base": [], "middle": [], "top": ["base"]})
+    dependency_graph.write_graph(graph, repo / "build" / "graph.json")
+    assert Dataset.open(repo).upstream("top") == ["base"]
+
+    # An entry edited after the artifact was built makes it stale
+    os.utime(repo / "build" / "graph.json", (1, 1))
+    assert Dataset.open(repo).upstream("top") == ["base", "middle"]
+
+
+def test_open_built_dataset(tmp_path):
+    dataset = {
+        "dataset_info": {"name": "TheorIA Dataset"},
+        "global_assumptions": [{"id": "shared", "text": "Shared"}],
+        "entries": [
+            {"result_id": "b", "domain": "gr-qc", "depends_on": ["a"],
+             "assumptions": [{"type": "global", "id": "shared", "text": "Shared"}]},
+            {"result_id": "a", "domain": "hep-th", "assumptions": []},
+        ],
+    }
+    path = tmp_path / "dataset.json"
+    path.write_text(json.dumps(dataset))
+    ds = Dataset.open(path)
+
+    assert ds.ids() == ["a", "b"]
+    assert [e["result_id"] for e in ds.filter(assumption="shared")] == ["b"]
+    assert ds.downstream("a") == ["b"]
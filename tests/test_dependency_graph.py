@@ -0,0 +1,77 @@
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import scripts.dependency_graph as dg
+
+
+EDGES = {
+    "a": [],
+    "b": ["a"],
+    "c": ["a"],
+    "d": ["b", "c"],
+    "e": ["d", "missing_entry"],
+}
+
+
+def test_levels_and_closure():
+    graph = dg.build_graph(EDGES)
+
+    assert graph["levels"] == [["a"], ["b", "c"], ["d"], ["e"]]
+    assert graph["cyclic"] == []
+    assert graph["missing"] == {"e": ["missing_entry"]}
+    assert graph["reverse_adjacency"]["a"] == ["b", "c"]
+    assert dg.upstream(graph, "e") == ["a", "b", "c", "d"]
+    assert dg.downstream(graph, "b") == ["d", "e"]
+    assert dg.upstream(graph, "a") == []
+
+
+def test_cycles_are_reported_and_closed():
+    edges = dict(EDGES, a=["d"])
+    graph = dg.build_graph(edges)
+
+    assert graph["levels"] == []
+    assert graph["cyclic"] == ["a", "b", "c", "d", "e"]
+    assert dg.upstream(graph, "a") == ["a", "b", "c", "d"]
+    assert dg.downstream(graph, "e") == []
+
+
+def test_incremental_update_matches_full_build():
+    rng = random.Random(0)
+    nodes = [f"n{i:02d}" for i in range(30)]
+    edges = {node: [] for node in nodes}
+    graph = dg.build_graph(edges)
+
+    for _ in range(200):
+        node = rng.choice(nodes)
+        edges = dict(edges)
+        edges[node] = rng.sample(nodes, rng.randint(0, 3))
+        graph = dg.update_graph(graph, edges)
+        assert graph == dg.build_graph(edges)
+
+
+def test_update_with_new_entry_rebuilds(tmp_path):
+    graph = dg.build_graph(EDGES)
+    dg.write_graph(graph, tmp_path / "graph.json")
+
+    edges = dict(EDGES, f=["e"])
+    updated = dg.update_graph(dg.load_graph(tmp_path / "graph.json"), edges)
+    assert updated == dg.build_graph(edges)
+    assert dg.upstream(updated, "f") == ["a", "b", "c", "d", "e"]
+
+
+def test_missing_only_change_is_persisted(tmp_path, monkeypatch):
+    path = tmp_path / "graph.json"
+    dg.write_graph(dg.build_graph(EDGES), path)
+    graph = dg.load_graph(path)
+    assert dg.update_graph(graph, EDGES) is graph
+
+    edges = dict(EDGES, e=["d", "other_missing_entry"])
+    monkeypatch.setattr(dg, "load_edges", lambda: edges)
+    monkeypatch.setattr(sys, "argv", ["dependency_graph.py", "--output", str(path)])
+    assert dg.main() == 0
+    assert dg.load_graph(path)["missing"] == {"e": ["other_missing_entry"]}
+    assert dg.load_graph(path) == dg.build_graph(edges)
@@ -0,0 +1,80 @@
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "scripts"))
+
+import env_pool
+import verify_programmatic as vp
+from env_pool import EnvError, EnvPool, env_name, parse_pin
+
+
+def build_wheel(wheelhouse, name, version):
+    """A minimal pure-Python wheel for name==version."""
+    wheelhouse.mkdir(exist_ok=True)
+    dist_info = f"{name}-{version}.dist-info"
+    files = {
+        f"{name}/__init__.py": f"__version__ = {version!r}\n",
+        f"{dist_info}/METADATA": f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+        f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    files[f"{dist_info}/RECORD"] = "".join(f"{path},,\n" for path in files) + f"{dist_info}/RECORD,,\n"
+    with zipfile.ZipFile(wheelhouse / f"{name}-{version}-py3-none-any.whl", "w") as wheel:
+        for path, text in files.items():
+            wheel.writestr(path, text)
+
+
+def test_parse_pin():
+    assert parse_pin({"language": "python 3.11.12", "library": "sympy 1.13.1"}) == ("3.11", "sympy", "1.13.1")
+    assert parse_pin({"language": "python 3.11", "library": "none"}) == ("3.11", "none", "")
+    assert env_name(("3.11", "sympy", "1.13.1")) == "py3.11-sympy-1.13.1"
+    with pytest.raises(ValueError):
+        parse_pin({"language": "python", "library": "sympy 1.13.1"})
+
+
+def test_missing_wheel_is_reported(tmp_path):
+    python = "%d.%d" % sys.version_info[:2]
+    with EnvPool(envs_dir=tmp_path / "envs", wheelhouse=tmp_path / "empty") as pool:
+        with pytest.raises(EnvError, match="Could not build environment"):
+            pool.run((python, "theoria_missing_lib", "1.0"), ["print(1)"])
+    assert not (tmp_path / "envs" / f"py{python}-theoria_missing_lib-1.0").exists()
+
+
+def test_old_pip_is_reported(tmp_path, monkeypatch):
+    python = "%d.%d" % sys.version_info[:2]
+    monkeypatch.setattr(env_pool, "pip_version", lambda: (22, 2))
+    with pytest.raises(EnvError, match=r"needs pip >= 22\.3 .*found 22\.2"):
+        env_pool.ensure_env((python, "theoria_pinlib", "2.0"), envs_dir=tmp_path / "envs")
+    assert not (tmp_path / "envs").exists()
+
+
+def test_mismatched_pins_run_in_pooled_env(tmp_path, monkeypatch, capsys):
+    python = "%d.%d" % sys.version_info[:2]
+    build_wheel(tmp_path / "wheels", "theoria_pinlib", "2.0")
+    monkeypatch.setattr(env_pool, "ENVS_DIR", tmp_path / "envs")
+    entries = tmp_path / "entries"
+    entries.mkdir()
+    for result_id, version, check in [("a_pinned", "2.0", "== '2.0'"), ("b_pinned", "2.0", "== '3.0'")]:
+        code = ["import theoria_pinlib", "import sys", f"assert theoria_pinlib.__version__ {check}"]
+        (entries / f"{result_id}.json").write_text(json.dumps({
+            "result_id": result_id,
+            "programmatic_verification": {
+                # Same minor version, different patch level: fails the in-process check
+                "language": f"python {python}.999",
+                "library": f"theoria_pinlib {version}",
+                "code": code,
+            },
+        }))
+    monkeypatch.setattr(vp, "entries_dir", entries)
+
+    with pytest.raises(RuntimeError, match="1 entries"):
+        vp.run_verifications(env_pool=True, wheelhouse=str(tmp_path / "wheels"))
+    out = capsys.readouterr().out
+    assert f"a_pinned.json: verification passed in py{python}-theoria_pinlib-2.0" in out
+    assert "b_pinned.json: Verification code failed" in out
+    assert "Problem near line 3" in out
+    assert (tmp_path / "envs" / f"py{python}-theoria_pinlib-2.0" / env_pool.MARKER).exists()
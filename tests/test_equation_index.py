@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import Dataset, asciimath
+from theoria.equation_index import EquationIndex, fingerprint, load_equation_index
+
+
+def entry(result_id, results=(), steps=()):
+    return {
+        "result_id": result_id,
+        "result_equations": [{"id": f"eq{i}", "equation": text} for i, text in enumerate(results, 1)],
+        "derivation": [{"step": i, "equation": text} for i, text in enumerate(steps, 1)],
+    }
+
+
+@pytest.mark.parametrize("a, b", [
+    ("E = m*c^2", "m c^2 = E"),
+    ("E = 1/2*m*v^2", "(m v^2)/2 = E"),
+    ("a - b = c", "a = b + c"),
+    ("x >= y", "y <= x"),
+    ("v = sqrt(G*M/r)", "v = (G M r^(-1))^(1/2)"),
+    ("F = -k*x", "-F = k x"),
+    ("E - m c^2 = 0", "E = m c^2"),
+    ("0 = x - y", "x + 0 = y"),
+])
+def test_equivalent_spellings_share_fingerprint(a, b):
+    assert fingerprint(asciimath.parse(a)) == fingerprint(asciimath.parse(b))
+
+
+@pytest.mark.parametrize("a, b", [
+    ("E = m*c^2", "E = m*c^3"),
+    ("x < y", "y < x"),
+    ("psi(t) = 0", "psi*t = 1"),
+    ("C = x p - p x", "C = p x - x p"),
+    ("H = a^dagger a", "H = a a^dagger"),
+])
+def test_different_equations_differ(a, b):
+    assert fingerprint(asciimath.parse(a)) != fingerprint(asciimath.parse(b))
+
+
+def test_renaming():
+    a, b = asciimath.parse("E = m*c^2"), asciimath.parse("F = k*x^2")
+    assert fingerprint(a) != fingerprint(b)
+    assert fingerprint(a, up_to_renaming=True) == fingerprint(b, up_to_renaming=True)
+    # Constants and functions keep their names
+    assert fingerprint(asciimath.parse("y = sin(x)"), True) != fingerprint(asciimath.parse("y = cos(x)"), True)
+
+
+def test_index_lookup_and_duplicates(tmp_path):
+    index = EquationIndex.build([
+        entry("energy", results=["E = m*c^2"], steps=["p = 0", "E = m c^2"]),
+        entry("other", steps=["m*c^2 = E, p = m v"]),
+    ])
+    assert index.find_equivalent("m*c^2 = E") == [("energy", "result", "eq1"), ("energy", "step", 2),
+                                                   ("other", "step", 1)]
+    assert index.find_equivalent("m v = p") == [("other", "step", 1)]
+    assert index.find_equivalent("U = M*C^2") == []
+    # Factors other than numbers and constants may not commute
+    assert index.find_equivalent("c^2 m = E") == []
+    assert ("energy", "result", "eq1") in index.find_equivalent("U = M*C^2", up_to_renaming=True)
+    assert index.duplicates() == [[("energy", "result", "eq1"), ("energy", "step", 2), ("other", "step", 1)]]
+
+    index.save(tmp_path / "dataset.equations.json")
+    loaded = load_equation_index(tmp_path / "dataset.json", {"equation_index": "dataset.equations.json"})
+    assert loaded.exact == index.exact and loaded.renamed == index.renamed
+    assert load_equation_index(tmp_path / "dataset.json", {}) is None
+
+
+def test_dataset_find_equivalent():
+    ds = Dataset.open(ROOT)
+    locations = ds.find_equivalent("E^2 = (p c)^2 + (m c^2)^2")
+    assert ("relativistic_energy_momentum", "result", "energy_momentum_relation") in locations
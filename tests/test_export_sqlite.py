@@ -0,0 +1,89 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "scripts"))
+
+from export_sqlite import write_sqlite
+
+
+ENTRIES = [
+    {
+        "result_id": "orbit",
+        "result_name": "Orbital Energy",
+        "explanation": "Energy of a body on a Kepler orbit.",
+        "domain": "hep-th",
+        "review_status": "reviewed",
+        "assumptions": ["point_mass_approximation", "No friction"],
+        "result_equations": [{"id": "eq1", "equation": "E = -G*M*m/(2*a)"}],
+        "definitions": [{"symbol": "a", "definition": "Semi-major axis"}],
+        "derivation": [
+            {"step": 1, "description": "Start", "equation": "E = T + V", "assumptions": []},
+            {"step": 2, "description": "Use vis-viva", "equation": "E = -G*M*m/(2*a)",
+             "assumptions": ["point_mass_approximation"]},
+        ],
+        "depends_on": ["vis_viva"],
+    },
+    {
+        "result_id": "draft_orbit",
+        "result_name": "Draft Orbit",
+        "explanation": "Unreviewed.",
+        "domain": "hep-th",
+        "review_status": "draft",
+        "derivation": [{"step": 1, "equation": "x", "assumptions": ["point_mass_approximation"]}],
+    },
+    {
+        "result_id": "vis_viva",
+        "result_name": "Vis-viva Equation",
+        "explanation": "Speed along an orbit.",
+        "domain": "gr-qc",
+        "review_status": "reviewed",
+        "assumptions": ["point_mass_approximation"],
+    },
+]
+
+GLOBALS = [{"id": "point_mass_approximation", "title": "Point masses", "text": "Bodies are points.",
+            "type": "approximation", "usage": {"entries": 2, "steps": 2}}]
+
+
+def test_relational_tables(tmp_path):
+    path = tmp_path / "dataset.sqlite"
+    write_sqlite(path, ENTRIES, GLOBALS, dataset_info={"total_entries": 3})
+    conn = sqlite3.connect(path)
+
+    rows = conn.execute(
+        "SELECT DISTINCT e.result_id FROM entries e JOIN step_assumptions s USING (result_id) "
+        "WHERE e.domain = 'hep-th' AND e.review_status = 'reviewed' "
+        "AND s.assumption_id = 'point_mass_approximation'").fetchall()
+    assert rows == [("orbit",)]
+
+    assert conn.execute("SELECT step FROM step_assumptions WHERE result_id = 'orbit'").fetchall() == [(2,)]
+    assert conn.execute(
+        "SELECT assumption, is_global FROM entry_assumptions WHERE result_id = 'orbit' ORDER BY position"
+    ).fetchall() == [("point_mass_approximation", 1), ("No friction", 0)]
+    assert conn.execute("SELECT dependency_id FROM depends_on").fetchall() == [("vis_viva",)]
+    assert conn.execute("SELECT count(*) FROM derivation_steps").fetchone() == (3,)
+    assert json.loads(conn.execute("SELECT data FROM entries WHERE result_id = 'orbit'").fetchone()[0]) == ENTRIES[0]
+    assert json.loads(conn.execute("SELECT data FROM global_assumptions").fetchone()[0])["usage"]["steps"] == 2
+    assert conn.execute("SELECT value FROM dataset_info WHERE key = 'total_entries'").fetchone() == ("3",)
+
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT result_id FROM step_assumptions WHERE assumption_id = 'x'").fetchall()
+    assert "idx_step_assumptions_assumption" in " ".join(row[-1] for row in plan)
+    conn.close()
+
+
+def test_full_text_search_and_rebuild(tmp_path):
+    path = tmp_path / "dataset.sqlite"
+    write_sqlite(path, ENTRIES, GLOBALS)
+    # Writing again replaces the previous database instead of failing on existing tables
+    has_fts = write_sqlite(path, ENTRIES[:1], GLOBALS)
+    conn = sqlite3.connect(path)
+
+    assert conn.execute("SELECT count(*) FROM entries").fetchone() == (1,)
+    if has_fts:
+        assert conn.execute(
+            "SELECT result_id FROM entries_fts WHERE entries_fts MATCH 'semi'").fetchall() == [("orbit",)]
+    conn.close()
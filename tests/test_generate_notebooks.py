@@ -0,0 +1,133 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import scripts.generate_notebooks as gn
+import verification_cache as vc
+
+
+@pytest.fixture(autouse=True)
+def bytecode_dir(tmp_path, monkeypatch):
+    # Keep compiled snippets out of the repository's build/cache
+    monkeypatch.setattr(vc, "BYTECODE_DIR", tmp_path / "bytecode")
+
+
+def make_entry(entries_dir, result_id, code=("print('ok')",)):
+    data = {
+        "result_id": result_id,
+        "result_name": result_id.replace("_", " ").title(),
+        "explanation": "test",
+        "programmatic_verification": {
+            "language": "python 3.11.12",
+            "library": "sympy 1.13.1",
+            "code": list(code)
+        }
+    }
+    (entries_dir / f"{result_id}.json").write_text(json.dumps(data))
+
+
+def setup_dirs(tmp_path):
+    entries_dir = tmp_path / "entries"
+    notebooks_dir = tmp_path / "notebooks"
+    entries_dir.mkdir()
+    return entries_dir, notebooks_dir
+
+
+def test_unchanged_notebooks_are_not_rewritten(tmp_path):
+    entries_dir, notebooks_dir = setup_dirs(tmp_path)
+    make_entry(entries_dir, "alpha")
+    assert gn.generate_notebooks(entries_dir, notebooks_dir) == 0
+
+    notebook = notebooks_dir / "alpha_verification.ipynb"
+    os.utime(notebook, (1, 1))
+    assert gn.generate_notebooks(entries_dir, notebooks_dir) == 0
+    assert notebook.stat().st_mtime == 1
+
+
+def test_changed_entry_is_rewritten(tmp_path):
+    entries_dir, notebooks_dir = setup_dirs(tmp_path)
+    make_entry(entries_dir, "alpha")
+    gn.generate_notebooks(entries_dir, notebooks_dir)
+
+    make_entry(entries_dir, "alpha", code=("print('changed')",))
+    gn.generate_notebooks(entries_dir, notebooks_dir, jobs=2)
+
+    notebook = json.loads((notebooks_dir / "alpha_verification.ipynb").read_text())
+    assert notebook["cells"][3]["source"] == ["print('changed')\n"]
+
+
+def test_orphaned_notebooks_are_pruned(tmp_path):
+    entries_dir, notebooks_dir = setup_dirs(tmp_path)
+    make_entry(entries_dir, "alpha")
+    make_entry(entries_dir, "beta")
+    gn.generate_notebooks(entries_dir, notebooks_dir)
+
+    (entries_dir / "beta.json").unlink()
+    gn.generate_notebooks(entries_dir, notebooks_dir, prune=False)
+    assert (notebooks_dir / "beta_verification.ipynb").exists()
+
+    gn.generate_notebooks(entries_dir, notebooks_dir)
+    assert not (notebooks_dir / "beta_verification.ipynb").exists()
+    assert (notebooks_dir / "alpha_verification.ipynb").exists()
+
+
+def make_plain_entry(entries_dir, result_id, code):
+    make_entry(entries_dir, result_id, code=code)
+    path = entries_dir / f"{result_id}.json"
+    data = json.loads(path.read_text())
+    data["programmatic_verification"]["library"] = "none"
+    path.write_text(json.dumps(data))
+
+
+def test_execute_stores_outputs(tmp_path):
+    entries_dir, notebooks_dir = setup_dirs(tmp_path)
+    make_plain_entry(entries_dir, "alpha", code=("print('verified')",))
+    make_plain_entry(entries_dir, "beta", code=("assert 1 == 2, 'broken'",))
+    cache_dir = tmp_path / "cache"
+
+    assert gn.generate_notebooks(entries_dir, notebooks_dir, execute=True, cache_dir=cache_dir) == 0
+
+    alpha = json.loads((notebooks_dir / "alpha_verification.ipynb").read_text())
+    cell = alpha["cells"][3]
+    assert cell["execution_count"] == 1
+    assert cell["outputs"] == [{"name": "stdout", "output_type": "stream", "text": ["verified\n"]}]
+
+    beta = json.loads((notebooks_dir / "beta_verification.ipynb").read_text())
+    error = beta["cells"][3]["outputs"][-1]
+    assert error["output_type"] == "error"
+    assert error["ename"] == "AssertionError"
+    assert len(list(cache_dir.glob("*.json"))) == 2
+
+
+def test_execute_reuses_cached_results(tmp_path, monkeypatch):
+    entries_dir, notebooks_dir = setup_dirs(tmp_path)
+    make_plain_entry(entries_dir, "alpha", code=("print('verified')",))
+    cache_dir = tmp_path / "cache"
+    gn.generate_notebooks(entries_dir, notebooks_dir, execute=True, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached snippet was executed again")
+
+    monkeypatch.setattr(vc, "execute_snippet", fail)
+    assert gn.generate_notebooks(entries_dir, notebooks_dir, execute=True, cache_dir=cache_dir) == 0
+
+
+def test_execute_records_exit_and_snippet_frames_only(tmp_path):
+    entries_dir, notebooks_dir = setup_dirs(tmp_path)
+    make_plain_entry(entries_dir, "alpha", code=("import sys", "sys.exit(3)"))
+    make_plain_entry(entries_dir, "beta", code=("def check():", "    assert 1 == 2", "check()"))
+
+    assert gn.generate_notebooks(entries_dir, notebooks_dir, execute=True, cache_dir=tmp_path / "cache") == 0
+
+    alpha = json.loads((notebooks_dir / "alpha_verification.ipynb").read_text())
+    assert alpha["cells"][3]["outputs"][-1]["ename"] == "SystemExit"
+    beta = json.loads((notebooks_dir / "beta_verification.ipynb").read_text())
+    traceback = "".join(beta["cells"][3]["outputs"][-1]["traceback"])
+    assert traceback.count('File "') == 2
+    assert str(ROOT) not in traceback
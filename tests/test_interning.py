@@ -0,0 +1,45 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import Dataset
+from theoria.interning import StringTable, decode_entry, encode_entry, intern_entry
+
+
+ENTRY = {
+    "result_id": "orbit",
+    "domain": "hep-th",
+    "review_status": "reviewed",
+    "assumptions": ["point_mass_approximation"],
+    "depends_on": ["vis_viva"],
+    "result_equations": [{"id": "eq1", "equation": "E = T + V"}],
+    "definitions": [{"symbol": "\\hbar", "definition": "Reduced Planck constant"}],
+    "derivation": [{"step": 1, "equation": "E = T + V", "equation_proven": "eq1",
+                    "assumptions": ["point_mass_approximation"]}],
+}
+
+
+def test_loaded_entries_share_strings(tmp_path):
+    for result_id in ("a", "b"):
+        (tmp_path / f"{result_id}.json").write_text(json.dumps(dict(ENTRY, result_id=result_id)))
+    ds = Dataset.open(tmp_path)
+
+    a, b = ds["a"], ds["b"]
+    assert a["domain"] is b["domain"]
+    assert a["definitions"][0]["symbol"] is b["definitions"][0]["symbol"]
+    assert a["derivation"][0]["assumptions"][0] is b["assumptions"][0]
+
+
+def test_encode_round_trip():
+    table = StringTable()
+    encoded = encode_entry(ENTRY, table)
+
+    assert encoded["domain"] == 0
+    assert encoded["assumptions"] == encoded["derivation"][0]["assumptions"]
+    assert encoded["result_equations"][0]["equation"] == "E = T + V"
+    assert decode_entry(encoded, table.strings) == ENTRY
+    assert intern_entry(ENTRY) == ENTRY
+    assert ENTRY["domain"] == "hep-th"
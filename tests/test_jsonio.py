@@ -0,0 +1,46 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import jsonio
+
+
+COMMITTED = sorted(ROOT.glob("entries/*.json")) + sorted(ROOT.glob("notebooks/*.ipynb")) + [
+    ROOT / "globals" / "assumptions.json", ROOT / "manifest.json"]
+
+
+@pytest.fixture(params=["fast", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(jsonio, "orjson", None)
+        monkeypatch.setattr(jsonio, "msgspec", None)
+    return request.param
+
+
+def test_output_matches_stdlib_for_committed_files(backend):
+    for path in COMMITTED:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert jsonio.load(path) == data
+        assert jsonio.dumps(data, indent=2) == json.dumps(data, indent=2, ensure_ascii=False), path
+        assert jsonio.dumps(data) == json.dumps(data, ensure_ascii=False, separators=(",", ":")), path
+
+
+def test_values_the_fast_backend_prints_differently(backend):
+    data = {"big": 1e16, "small": 1e-7, "nan": float("nan"), "huge": 2 ** 70, "ids": {1: "x"}, "ℏ": " "}
+    assert jsonio.dumps(data, indent=2) == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def test_lone_surrogates_fall_back_to_stdlib(backend):
+    data = {"text": "broken \ud800 pair", "list": ["\udfff"]}
+    assert jsonio.dumps(data) == json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    assert jsonio.dumps(data, indent=2) == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def test_decode_errors_are_json_errors(backend):
+    with pytest.raises(json.JSONDecodeError):
+        jsonio.loads(b"{ not json")
@@ -0,0 +1,45 @@
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria.model import DerivationStep, ModelError, decode_entry, load_entry, load_global_assumptions
+
+
+def test_corpus_decodes_and_round_trips():
+    for path in sorted((ROOT / "entries").glob("*.json")):
+        entry = load_entry(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert entry.to_dict() == {key: value for key, value in data.items() if value is not None}
+
+    assumptions = load_global_assumptions(ROOT / "globals" / "assumptions.json")
+    assert all(assumption.type in ("principle", "empirical", "approximation") for assumption in assumptions)
+
+
+def test_typed_access():
+    entry = load_entry(ROOT / "entries" / "vis_viva.json")
+
+    assert isinstance(entry.derivation[0], DerivationStep)
+    assert isinstance(entry.derivation[0].step, int)
+    assert isinstance(entry.assumptions, tuple)
+    assert not hasattr(entry, "__dict__")
+
+
+@pytest.mark.parametrize("change, message", [
+    (lambda d: d.pop("result_name"), "result_name: missing required field"),
+    (lambda d: d.update(extra=1), "unknown field(s) extra"),
+    (lambda d: d["derivation"][1].update(step="2"), "derivation[1].step: expected an integer"),
+    (lambda d: d.update(review_status="done"), "review_status: 'done' is not one of"),
+    (lambda d: d["references"].append("x"), "references[1]: expected an object"),
+])
+def test_schema_errors_are_reported_with_their_path(change, message):
+    data = json.loads((ROOT / "entries" / "vis_viva.json").read_text(encoding="utf-8"))
+    change(data)
+
+    with pytest.raises(ModelError, match=re.escape(message)):
+        decode_entry(json.dumps(data).encode("utf-8"))
@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import Dataset
+from theoria.packed import PackedSource, is_packed, write_packed
+
+
+ENTRIES = [
+    {"result_id": "zeta", "result_name": "Zeta", "explanation": "ℏ and ∂ survive"},
+    {"result_id": "alpha", "result_name": "Alpha", "depends_on": ["zeta"]},
+]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "dataset.pack"
+    write_packed(path, ENTRIES, dataset_info={"total_entries": 2},
+                 global_assumptions=[{"id": "shared"}])
+
+    source = PackedSource(path)
+    assert is_packed(path)
+    assert source.ids() == ["alpha", "zeta"]
+    assert source.load("zeta") == ENTRIES[0]
+    assert source.global_assumptions() == [{"id": "shared"}]
+    assert source.dataset_info == {"total_entries": 2}
+    source.close()
+
+
+def test_dataset_open_detects_packed_file(tmp_path):
+    path = tmp_path / "dataset.pack"
+    write_packed(path, ENTRIES)
+
+    ds = Dataset.open(path)
+    assert ds["alpha"]["result_name"] == "Alpha"
+    assert ds.downstream("zeta") == ["alpha"]
+    assert not is_packed(tmp_path)
+
+
+def test_unknown_encoding(tmp_path):
+    with pytest.raises(ValueError):
+        write_packed(tmp_path / "dataset.pack", ENTRIES, encoding="xml")
+
+
+def test_build_ml_dataset_packed_matches_json(tmp_path):
+    sys.path.insert(0, str(ROOT / "scripts"))
+    from build_ml_dataset import build_dataset
+
+    original_cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        dataset = build_dataset(output_file=str(tmp_path / "dataset.pack"), output_format="packed")
+    finally:
+        os.chdir(original_cwd)
+
+    ds = Dataset.open(tmp_path / "dataset.pack")
+    assert ds.info == dataset["dataset_info"]
+    assert [ds[entry["result_id"]] for entry in dataset["entries"]] == json.loads(json.dumps(dataset["entries"]))
+
+
+def test_build_ml_dataset_cli_msgpack_records(tmp_path):
+    pytest.importorskip("msgpack")
+    script = str(ROOT / "scripts" / "build_ml_dataset.py")
+    outputs = {}
+    for encoding in ("json", "msgpack"):
+        outputs[encoding] = tmp_path / encoding / "dataset.pack"
+        outputs[encoding].parent.mkdir()
+        subprocess.run([sys.executable, script, "--format", "packed", "--packed-encoding", encoding,
+                        "--output", str(outputs[encoding])], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+
+    assert outputs["json"].read_bytes() != outputs["msgpack"].read_bytes()
+    packed_json, packed_msgpack = Dataset.open(outputs["json"]), Dataset.open(outputs["msgpack"])
+    assert packed_msgpack.ids() == packed_json.ids()
+    assert list(packed_msgpack) == list(packed_json)
+
+
+def test_build_ml_dataset_cli_rejects_packed_encoding_for_json(tmp_path):
+    out = subprocess.run([sys.executable, str(ROOT / "scripts" / "build_ml_dataset.py"),
+                          "--packed-encoding", "msgpack", "--output", str(tmp_path / "dataset.json")],
+                         cwd=ROOT, capture_output=True, text=True)
+    assert out.returncode == 2
+    assert "--packed-encoding only applies to --format packed" in out.stderr
+    assert not (tmp_path / "dataset.json").exists()
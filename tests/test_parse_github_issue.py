@@ -0,0 +1,113 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "scripts"))
+
+import parse_github_issue as pgi
+
+
+def issue_body(result_id, steps=True):
+    derivation = "Step 1: Start from energy conservation\nStep 2: Substitute the potential\n" if steps else ""
+    return f"""### Entry Name
+
+Orbital Energy {result_id}
+
+### Entry ID
+
+{result_id}
+
+### Main Equation(s)
+
+eq1: E = -G*M*m/(2*a)
+
+### Explanation
+
+The total energy of a bound Kepler orbit depends only on its semi-major axis.
+
+### Symbol Definitions
+
+E: Total orbital energy
+a: Semi-major axis
+
+### Derivation Steps
+
+{derivation}
+### ArXiv Domain
+
+physics.class-ph (Classical Physics)
+
+### Theory Status
+
+Current - widely accepted
+
+### References
+
+Goldstein, Classical Mechanics (2002)
+
+### Your Full Name
+
+Ada Example
+
+### Your Identifier
+
+0000-0000-0000-0000
+"""
+
+
+@pytest.fixture
+def issues_file(tmp_path):
+    issues = [
+        {"number": 1, "body": issue_body("orbital_energy_one")},
+        {"number": 2, "body": issue_body("orbital_energy_two", steps=False)},
+        {"number": 3, "body": "Nothing useful here"},
+        {"number": 4, "body": issue_body("orbital_energy_one")},
+        {"number": 5, "body": issue_body("vis_viva")},
+    ]
+    path = tmp_path / "issues.jsonl"
+    path.write_text("\n".join(json.dumps(issue) for issue in issues) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_conversion_writes_entries_and_report(issues_file, tmp_path, jobs):
+    output_dir = tmp_path / "out"
+    reports = pgi.convert_issues(pgi.load_issues(issues_file), jobs=jobs)
+    counts = pgi.write_batch(reports, output_dir, entries_dir=ROOT / "entries")
+
+    statuses = {report["issue"]: report["status"] for report in reports}
+    assert statuses == {1: "passed", 2: "invalid", 3: "missing_fields", 4: "duplicate", 5: "duplicate"}
+    assert counts == {"passed": 1, "invalid": 1, "missing_fields": 1, "duplicate": 2}
+    assert any("derivation cannot be empty" in error for error in reports[1]["errors"])
+
+    entry = json.loads((output_dir / "orbital_energy_one.json").read_text())
+    assert entry["theory_status"] == "current"
+    assert entry["domain"] == "physics.class-ph"
+    assert sorted(p.name for p in output_dir.iterdir()) == ["orbital_energy_one.json", "report.json"]
+    assert json.loads((output_dir / "report.json").read_text())["summary"] == counts
+
+
+def test_directory_input(tmp_path):
+    (tmp_path / "42.md").write_text(issue_body("orbital_energy_dir"))
+    (tmp_path / "notes.json").write_text("{}")
+
+    issues = pgi.load_issues(tmp_path)
+    assert [issue["id"] for issue in issues] == ["42"]
+    assert pgi.convert_issue(issues[0])["status"] == "passed"
+
+
+@pytest.mark.parametrize("result_id", ["../escaped_entry", "nested/../../escaped_entry"])
+def test_traversal_ids_are_rejected(tmp_path, result_id):
+    report = pgi.convert_issue({"id": 7, "body": issue_body(result_id)})
+    assert report["status"] == "invalid"
+    assert "Invalid Entry ID" in report["errors"][0]
+
+    # write_batch refuses such paths even for a report marked as passed
+    output_dir = tmp_path / "out"
+    report = dict(report, status="passed", errors=[])
+    counts = pgi.write_batch([report], output_dir, entries_dir=tmp_path / "entries")
+    assert counts == {"invalid": 1}
+    assert sorted(p.name for p in tmp_path.rglob("*.json")) == ["report.json"]
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import Dataset
+from theoria.symbol_index import SymbolIndex, load_symbol_index, normalize_symbol
+
+
+def entry(result_id, *definitions):
+    return {
+        "result_id": result_id,
+        "definitions": [{"symbol": symbol, "definition": text} for symbol, text in definitions],
+    }
+
+
+ENTRIES = [
+    entry("euler_lagrange", ("L", "Lagrangian function, `L = T - V` for conservative systems."),
+          ("vec L", "Angular momentum")),
+    entry("noether", ("L", "The Lagrangian of the physical system, typically `L = T - V`.")),
+    entry("kepler", ("L", "Angular momentum of the planet"), ("vec(L)", "Angular momentum vector")),
+]
+ASSUMPTIONS = {
+    "macroscopic_limit": {"id": "macroscopic_limit",
+                          "symbol_definitions": [{"symbol": "L", "definition": "Characteristic length scale"}]},
+}
+
+
+def test_normalize_symbol():
+    assert normalize_symbol("vec L") == normalize_symbol("vec(L)") == "vec(L)"
+    assert normalize_symbol("u(nu,T)") == "u(nu, T)"
+    assert normalize_symbol("hbar") == "hbar"
+
+
+def test_meanings_are_clustered():
+    index = SymbolIndex.build(ENTRIES, ASSUMPTIONS)
+    meanings = index.meanings("L")
+    assert [meaning["label"] for meaning in meanings] == [
+        "Lagrangian function", "Angular momentum of the planet", "Characteristic length scale"]
+    assert [occurrence["id"] for occurrence in meanings[0]["occurrences"]] == ["euler_lagrange", "noether"]
+    assert meanings[2]["occurrences"] == [{"source": "assumption", "id": "macroscopic_limit", "symbol": "L",
+                                           "definition": "Characteristic length scale"}]
+    # Both spellings of the vector share a key and a meaning
+    assert len(index.meanings("vec L")) == 1
+    assert [occurrence["symbol"] for occurrence in index.contexts("vec(L)")] == ["vec L", "vec(L)"]
+    assert list(index.divergent()) == ["L"]
+    assert index.meanings("H") == [] and "H" not in index
+
+
+def test_save_and_load(tmp_path):
+    index = SymbolIndex.build(ENTRIES, ASSUMPTIONS)
+    index.save(tmp_path / "dataset.symbols.json")
+    loaded = load_symbol_index(tmp_path / "dataset.json", {"symbol_index": "dataset.symbols.json"})
+    assert loaded.symbols == index.symbols
+    assert load_symbol_index(tmp_path / "dataset.json", {}) is None
+
+
+def test_dataset_symbol_meanings():
+    ds = Dataset.open(ROOT)
+    labels = [meaning["label"] for meaning in ds.symbol_meanings("H")]
+    assert "Complex Hilbert space of states" in labels
+    assert any("Hamiltonian" in label for label in labels)
+    contexts = ds.symbol_index().contexts("hbar")
+    assert {occurrence["id"] for occurrence in contexts} >= {"schrodinger_equation", "dirac_equation"}
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from theoria import Dataset
+from theoria.symbols import defined_names, names, symbol_coverage
+
+
+def test_names_skip_indices_prose_and_text():
+    assert list(names("tau_(ext) = r xx F")) == ["tau", "r", "F"]
+    assert list(names("g^(mu nu) x_mu = e^(-i omega t)")) == ["g", "x", "e", "i", "omega", "t"]
+    assert list(names("vec L = text{constant}")) == ["L"]
+    assert list(names("x = const")) == ["x"]
+    assert list(names("q_i", scripts=True)) == ["q", "i"]
+
+
+def test_coverage():
+    entry = {
+        "definitions": [
+            {"symbol": "vec L", "definition": "Angular momentum"},
+            {"symbol": "q_k", "definition": "Generalized coordinates"},
+            {"symbol": "lambda", "definition": "Never used"},
+        ],
+        "assumptions": ["massive"],
+        "result_equations": [{"id": "eq1", "equation": "(d vec L)/(dt) = m dot q_i"}],
+        "derivation": [{"step": 1, "equation": "L = F t", "assumptions": ["timed"]},
+                       {"step": 2, "equation": "L = F"}],
+    }
+    global_assumptions = {
+        "massive": {"symbol_definitions": [{"symbol": "m", "definition": "Mass"}]},
+        "timed": {"symbol_definitions": [{"symbol": "t", "definition": "Time"}]},
+    }
+    assert set(defined_names(entry, global_assumptions)) == {"L", "q", "lambda", "m", "t"}
+    report = symbol_coverage(entry, global_assumptions)
+    assert report == {"undefined": {"F": [("step", 1), ("step", 2)]}, "unused": ["lambda"]}
+
+
+def test_corpus_entry_is_covered():
+    ds = Dataset.open(ROOT)
+    assert symbol_coverage(ds["vis_viva"], ds.global_assumptions) == {"undefined": {}, "unused": []}
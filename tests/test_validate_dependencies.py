@@ -0,0 +1,68 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from scripts.validate_dependencies import fix_used_in, rewrite_used_in
+
+
+GLOBALS = """{
+  "assumptions": [
+    {
+      "id": "inline",
+      "text": "Inline list",
+      "used_in": ["a", "b"]
+    },
+    {
+      "id": "multiline",
+      "text": "Multi-line list",
+      "used_in": [
+        "a",
+        "b"
+      ]
+    },
+    {
+      "id": "missing",
+      "text": "No used_in yet",
+      "symbol_definitions": [
+        {
+          "symbol": "x",
+          "definition": "A symbol"
+        }
+      ]
+    }
+  ]
+}
+"""
+
+
+def test_rewrite_keeps_layout_of_each_array():
+    text = rewrite_used_in(GLOBALS, {"inline": ["a", "c"], "multiline": ["b", "c"], "missing": []})
+
+    assert '"used_in": ["a", "c"]' in text
+    assert '"used_in": [\n        "b",\n        "c"\n      ]' in text
+    assert text.count('"used_in"') == 2
+
+
+def test_rewrite_inserts_missing_arrays():
+    text = rewrite_used_in(GLOBALS, {"inline": ["a", "b"], "multiline": ["a", "b"], "missing": ["z"]})
+
+    data = json.loads(text)
+    assert data["assumptions"][2]["used_in"] == ["z"]
+    assert '        }\n      ],\n      "used_in": ["z"]\n    }' in text
+
+
+def test_rewrite_is_identity_when_nothing_changed():
+    expected = {"inline": ["a", "b"], "multiline": ["a", "b"], "missing": []}
+    assert rewrite_used_in(GLOBALS, expected) == GLOBALS
+
+
+def test_fix_used_in_checks_the_given_file(tmp_path):
+    path = tmp_path / "assumptions.json"
+    path.write_text(GLOBALS)
+    # None of these IDs exist in globals/assumptions.json
+    assert fix_used_in(path) == 2
+    data = json.loads(path.read_text())
+    assert [item.get("used_in") for item in data["assumptions"]] == [[], [], None]
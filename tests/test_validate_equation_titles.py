@@ -0,0 +1,28 @@
+import json
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "scripts"))
+
+import validate_equation_titles
+
+
+def test_corpus_passes():
+    assert validate_equation_titles.validate_equation_titles_and_proven()
+
+
+def test_missing_equation_title_fails(tmp_path, monkeypatch, capsys):
+    shutil.copytree(ROOT / "entries", tmp_path / "entries")
+    path = tmp_path / "entries" / "vis_viva.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["review_status"] == "reviewed"
+    del data["result_equations"][0]["equation_title"]
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    monkeypatch.setattr(validate_equation_titles, "ROOT", tmp_path)
+
+    assert not validate_equation_titles.validate_equation_titles_and_proven()
+    output = capsys.readouterr().out
+    assert "[ERROR] Could not load vis_viva.json" in output
+    assert "equation_title" in output
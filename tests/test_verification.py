@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sp = pytest.importorskip("sympy")
+pytest.importorskip("numpy")
+
+from theoria import verification
+from theoria.verification import assert_equal
+
+
+x, y = sp.symbols("x y", positive=True)
+
+
+def test_strict_mode_proves(monkeypatch):
+    monkeypatch.delenv("THEORIA_VERIFY_MODE", raising=False)
+    assert assert_equal(sp.sin(x)**2 + sp.cos(x)**2, 1) == "proved"
+    assert assert_equal((x + y)**2, x**2 + 2*x*y + y**2, prove=False) == "numeric"
+
+
+def test_fast_mode_skips_proof(monkeypatch):
+    monkeypatch.setenv("THEORIA_VERIFY_MODE", "fast")
+    monkeypatch.setattr(verification, "prove_equal", lambda lhs, rhs: pytest.fail("proof attempted"))
+    assert assert_equal(sp.sin(x)**2 + sp.cos(x)**2, 1) == "numeric"
+    assert assert_equal(sp.Matrix([[x, 1], [0, y]])**2, sp.Matrix([[x**2, x + y], [0, y**2]])) == "numeric"
+
+
+def test_inconclusive_falls_back_to_proof(monkeypatch):
+    monkeypatch.setenv("THEORIA_VERIFY_MODE", "fast")
+    f = sp.Function("f")
+    assert assert_equal(sp.diff(x * f(x), x), f(x) + x * sp.diff(f(x), x)) == "proved"
+    with pytest.raises(AssertionError, match="could not prove"):
+        assert_equal(sp.diff(f(x), x), f(x))
+
+
+def test_non_commutative_symbols_need_a_proof(monkeypatch):
+    monkeypatch.setenv("THEORIA_VERIFY_MODE", "fast")
+    A, B = sp.symbols("A B", commutative=False)
+    with pytest.raises(AssertionError, match="could not prove"):
+        assert_equal(A * B, B * A)
+    assert assert_equal(A * B - B * A, -(B * A - A * B)) == "proved"
+
+
+def test_samples_respect_sign_assumptions(monkeypatch):
+    monkeypatch.setenv("THEORIA_VERIFY_MODE", "fast")
+    monkeypatch.setattr(verification, "prove_equal", lambda lhs, rhs: pytest.fail("proof attempted"))
+    z, r = sp.Symbol("z"), sp.Symbol("r", real=True)
+    assert assert_equal(sp.sqrt(x**2), x) == "numeric"
+    with pytest.raises(AssertionError, match="z="):
+        assert_equal(sp.sqrt(z**2), z)
+    with pytest.raises(AssertionError, match="r=-"):
+        assert_equal(sp.sqrt(r**2), r)
+    assert assert_equal(sp.sqrt(r**2), sp.Abs(r)) == "numeric"
+
+
+def test_mismatch_fails_before_simplify(monkeypatch):
+    monkeypatch.setattr(verification, "prove_equal", lambda lhs, rhs: pytest.fail("proof attempted"))
+    with pytest.raises(AssertionError, match="step 3: x\\*\\*2 != x\\*\\*3"):
+        assert_equal(x**2, x**3, msg="step 3")
+    with pytest.raises(AssertionError, match="shapes differ"):
+        assert_equal(sp.eye(2), sp.eye(3))
+
+
+def test_invalid_mode(monkeypatch):
+    monkeypatch.setenv("THEORIA_VERIFY_MODE", "sloppy")
+    with pytest.raises(ValueError):
+        assert_equal(x, x)
+
+
+def test_memo_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(verification, "MEMO_DIR", tmp_path)
+    monkeypatch.delenv("THEORIA_SYMPY_MEMO", raising=False)
+    assert verification.memo_dir() is None
+    assert verification.simplify(sp.sin(x)**2 + sp.cos(x)**2) == 1
+    assert list(tmp_path.iterdir()) == []
+    monkeypatch.setenv("THEORIA_SYMPY_MEMO", "1")
+    assert verification.memo_dir() == tmp_path
+
+
+def test_memo_reuses_results_across_runs(tmp_path, monkeypatch):
+    monkeypatch.setenv("THEORIA_SYMPY_MEMO", str(tmp_path))
+    monkeypatch.setattr(verification, "_memo", {})
+    a = sp.Symbol("a", positive=True)
+    integral = verification.integrate(sp.exp(-a * x**2), (x, 0, sp.oo))
+    assert integral == sp.sqrt(sp.pi) / (2 * sp.sqrt(a))
+    assert verification.expand((x + y)**2) == x**2 + 2*x*y + y**2
+    assert len(list(tmp_path.rglob("*.txt"))) == 2
+
+    # A fresh process only has the files: results come back with their assumptions intact
+    monkeypatch.setattr(verification, "_memo", {})
+    monkeypatch.setattr(sp, "integrate", lambda *args, **kwargs: pytest.fail("memo miss"))
+    cached = verification.integrate(sp.exp(-a * x**2), (x, 0, sp.oo))
+    assert cached == integral and cached.free_symbols == {a}
+    assert verification.expand((x + y)**2) == x**2 + 2*x*y + y**2
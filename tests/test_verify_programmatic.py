@@ -9,6 +9,13 @@ sys.path.append(str(ROOT))
 import pytest
 
 import scripts.verify_programmatic as vp
+import verification_cache
+
+
+@pytest.fixture(autouse=True)
+def bytecode_dir(tmp_path, monkeypatch):
+    # Keep compiled snippets out of the repository's build/cache
+    monkeypatch.setattr(verification_cache, "BYTECODE_DIR", tmp_path / "bytecode")
 
 
 def make_entry(tmpdir, sym_version="1.12.0"):
@@ -50,3 +57,97 @@ def test_version_mismatch(tmp_path, monkeypatch):
     monkeypatch.setitem(sys.modules, "sympy", dummy)
     with pytest.raises(RuntimeError):
         vp.run_verifications()
+
+
+def make_named_entry(tmpdir, result_id, depends_on=(), code=("print('ok')",)):
+    current = ".".join(map(str, sys.version_info[:3]))
+    data = {
+        "result_id": result_id,
+        "depends_on": list(depends_on),
+        "programmatic_verification": {
+            "language": f"python {current}",
+            "library": "sympy 1.12.0",
+            "code": list(code)
+        }
+    }
+    (Path(tmpdir) / f"{result_id}.json").write_text(json.dumps(data))
+
+
+def logging_code(log, name):
+    return (f"open({str(log)!r}, 'a').write({name!r} + '\\n')",)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_dependencies_verified_first(tmp_path, monkeypatch, jobs):
+    log = tmp_path / "order.log"
+    entries = tmp_path / "entries"
+    entries.mkdir()
+    make_named_entry(entries, "a_dependent", ["z_base"], logging_code(log, "a_dependent"))
+    make_named_entry(entries, "z_base", code=logging_code(log, "z_base"))
+    monkeypatch.setattr(vp, "entries_dir", entries)
+    monkeypatch.setitem(sys.modules, "sympy", types.SimpleNamespace(__version__="1.12.0"))
+
+    vp.run_verifications(jobs=jobs)
+    assert log.read_text().split() == ["z_base", "a_dependent"]
+
+
+def test_fail_fast_blocks_dependents(tmp_path, monkeypatch, capsys):
+    log = tmp_path / "order.log"
+    entries = tmp_path / "entries"
+    entries.mkdir()
+    make_named_entry(entries, "base", code=("raise AssertionError('broken')",))
+    make_named_entry(entries, "middle", ["base"], logging_code(log, "middle"))
+    make_named_entry(entries, "top", ["middle"], logging_code(log, "top"))
+    make_named_entry(entries, "other", code=logging_code(log, "other"))
+    monkeypatch.setattr(vp, "entries_dir", entries)
+    monkeypatch.setitem(sys.modules, "sympy", types.SimpleNamespace(__version__="1.12.0"))
+
+    with pytest.raises(RuntimeError, match="1 entries"):
+        vp.run_verifications(fail_fast=True)
+
+    assert log.read_text().split() == ["other"]
+    out = capsys.readouterr().out
+    assert "BLOCKED (2 entries)" in out
+    assert "top.json: not executed, depends on failed entry 'base.json'" in out
+
+
+def test_without_fail_fast_dependents_still_run(tmp_path, monkeypatch):
+    log = tmp_path / "order.log"
+    entries = tmp_path / "entries"
+    entries.mkdir()
+    make_named_entry(entries, "base", code=("raise AssertionError('broken')",))
+    make_named_entry(entries, "middle", ["base"], logging_code(log, "middle"))
+    monkeypatch.setattr(vp, "entries_dir", entries)
+    monkeypatch.setitem(sys.modules, "sympy", types.SimpleNamespace(__version__="1.12.0"))
+
+    with pytest.raises(RuntimeError):
+        vp.run_verifications()
+    assert log.read_text().split() == ["middle"]
+
+
+def test_runtime_error_reports_snippet_line(tmp_path, monkeypatch, capsys):
+    entries = tmp_path / "entries"
+    entries.mkdir()
+    make_named_entry(entries, "broken", code=("x = 1", "def check(y):", "    assert y == 2, 'bad'", "check(x)"))
+    monkeypatch.setattr(vp, "entries_dir", entries)
+    monkeypatch.setitem(sys.modules, "sympy", types.SimpleNamespace(__version__="1.12.0"))
+
+    with pytest.raises(RuntimeError):
+        vp.run_verifications()
+    out = capsys.readouterr().out
+    assert "Problem near line 3: assert y == 2, 'bad'" in out
+
+
+def test_compiled_snippets_are_cached(tmp_path, monkeypatch):
+    import verification_cache as vc
+    code = vc.compile_snippet(["x = 1", "y = x + 1"], "<entry:demo>", cache_dir=tmp_path)
+    assert code.co_filename == "<entry:demo>"
+    assert len(list(tmp_path.glob("*.marshal"))) == 1
+    with pytest.raises(SyntaxError) as info:
+        vc.compile_snippet(["x = (1"], "<entry:bad>", cache_dir=tmp_path)
+    assert vc.snippet_lineno(info.value, "<entry:bad>") == 1
+
+    monkeypatch.setattr(vc, "compile", lambda *args, **kwargs: pytest.fail("recompiled"), raising=False)
+    namespace = {}
+    exec(vc.compile_snippet(["x = 1", "y = x + 1"], "<entry:demo>", cache_dir=tmp_path), namespace)
+    assert namespace["y"] == 2
@@ -0,0 +1,94 @@
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "scripts"))
+
+import verifyd
+
+
+@pytest.fixture
+def server(tmp_path):
+    socket_path = tmp_path / "verifyd.sock"
+    process = subprocess.Popen([sys.executable, str(ROOT / "scripts" / "verifyd.py"),
+                                "--socket", str(socket_path), "--preload", ""], stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        if verifyd.is_running(socket_path):
+            break
+        time.sleep(0.05)
+    yield socket_path
+    process.terminate()
+    process.wait(10)
+    assert not socket_path.exists()
+
+
+def test_snippets_run_in_isolated_children(server):
+    assert verifyd.submit({"op": "ping"}, server)["status"] == "ok"
+
+    result = verifyd.submit({"code": ["x = 1", "assert x == 2"], "filename": "<entry:demo>"}, server)
+    assert result["status"] == "failed"
+    assert result["error"]["ename"] == "AssertionError"
+    assert 'File "<entry:demo>", line 2' in "".join(result["error"]["traceback"])
+    assert result["duration"] >= 0
+
+    # A child that dies takes no state with it
+    with pytest.raises(ConnectionError):
+        verifyd.submit({"code": ["import os", "os._exit(3)"]}, server)
+    assert verifyd.submit({"code": ["print('ok')"]}, server)["stdout"] == "ok\n"
+
+    result = verifyd.submit({"code": ["while True: pass"], "timeout": 1}, server)
+    assert result["error"]["ename"] == "TimeoutError"
+
+
+@pytest.mark.parametrize("check, status", [("1 + 1 == 2", "passed"), ("1 + 1 == 3", "failed")])
+def test_entry_path(server, tmp_path, check, status):
+    path = tmp_path / "demo.json"
+    path.write_text(json.dumps({
+        "result_id": "demo",
+        "programmatic_verification": {
+            "language": "python " + ".".join(map(str, sys.version_info[:3])),
+            "library": f"pytest {pytest.__version__}",
+            "code": ["import pytest", f"assert {check}"],
+        },
+    }))
+    result = verifyd.submit({"path": str(path)}, server)
+    assert result["status"] == status
+    if status == "failed":
+        assert "   → Problem near line 2: assert 1 + 1 == 3" in result["errors"]
+        assert 'File "<entry:demo>", line 2' in "".join(result["traceback"])
+
+
+def test_submit_entry_times_out(server, tmp_path, monkeypatch):
+    path = tmp_path / "slow.json"
+    path.write_text(json.dumps({
+        "result_id": "slow",
+        "programmatic_verification": {
+            "language": "python " + ".".join(map(str, sys.version_info[:3])),
+            "library": f"pytest {pytest.__version__}",
+            "code": ["while True:", "    pass"],
+        },
+    }))
+    result = verifyd.submit_entry(path, server, timeout=1)
+    assert result["status"] == "failed"
+    assert "   → Error: TimeoutError: verification timed out" in result["errors"]
+
+    # A server that accepts but never answers is given up on
+    stuck = tmp_path / "stuck.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(stuck))
+        listener.listen()
+        monkeypatch.setattr(verifyd, "GRACE", 0)
+        assert verifyd.submit_entry(path, stuck, timeout=1) is None
+
+
+def test_no_server(tmp_path):
+    assert not verifyd.is_running(tmp_path / "missing.sock")
+    with pytest.raises(OSError):
+        verifyd.submit({"op": "ping"}, tmp_path / "missing.sock")
+    assert verifyd.submit_entry(tmp_path / "demo.json", tmp_path / "missing.sock") is None
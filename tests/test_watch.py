@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "scripts"))
+
+from watch import Watcher, changed_paths, snapshot
+
+
+def write_entry(root, result_id, depends_on=(), **fields):
+    data = json.loads((ROOT / "entries" / "vis_viva.json").read_text(encoding="utf-8"))
+    data.update(result_id=result_id, depends_on=list(depends_on), assumptions=[])
+    data.update(fields)
+    for step in data["derivation"]:
+        step.pop("assumptions", None)
+    # Every dependency must be used by a step (validate_dependencies check 7)
+    if depends_on:
+        data["derivation"][0]["assumptions"] = list(depends_on)
+    path = root / "entries" / f"{result_id}.json"
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    # Make sure the snapshot sees a new mtime even on coarse-grained file systems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "entries").mkdir()
+    (tmp_path / "globals").mkdir()
+    (tmp_path / "schemas").mkdir()
+    (tmp_path / "globals" / "assumptions.json").write_text(
+        (ROOT / "globals" / "assumptions.json").read_text(encoding="utf-8"), encoding="utf-8")
+    write_entry(tmp_path, "base")
+    write_entry(tmp_path, "middle", ["base"])
+    write_entry(tmp_path, "top", ["middle"])
+    write_entry(tmp_path, "other")
+    return tmp_path
+
+
+def test_initial_check(repo):
+    watcher = Watcher(repo, verify=False, regenerate=False)
+    results = watcher.check(watcher.start())
+
+    assert list(results) == ["base", "other", "middle", "top"]
+    assert all(errors == [] for errors in results.values())
+
+
+def test_edit_rechecks_entry_and_dependents(repo):
+    watcher = Watcher(repo, verify=False, regenerate=False)
+    watcher.start()
+
+    write_entry(repo, "middle", ["base"], theory_status="finished")
+    to_check, changed, removed = watcher.apply(watcher.poll())
+    assert (to_check, changed, removed) == ({"middle", "top"}, {"middle"}, set())
+    results = watcher.check(to_check)
+    assert results["middle"][0] == "[ERROR] Invalid theory_status: 'finished'"
+    assert results["top"] == []
+
+    (repo / "entries" / "base.json").unlink()
+    to_check, changed, removed = watcher.apply(watcher.poll())
+    assert (to_check, removed) == ({"middle", "top"}, {"base"})
+    assert ("[ERROR] Reviewed entry 'middle' (middle.json) depends on non-existent entry 'base'"
+            in watcher.check(to_check)["middle"])
+
+
+def test_used_in_is_checked(repo):
+    assumptions = json.loads((repo / "globals" / "assumptions.json").read_text(encoding="utf-8"))
+    write_entry(repo, "other", assumptions=[assumptions["assumptions"][0]["id"]])
+    watcher = Watcher(repo, verify=False, regenerate=False)
+    results = watcher.check(watcher.start())
+
+    assert any("is not listed in its used_in field" in error for error in results["other"])
+    assert results["base"] == []
+
+
+def test_verification_times_out(repo):
+    watcher = Watcher(repo, regenerate=False, timeout=1)
+    watcher.start()
+    data = dict(watcher.corpus["base"], programmatic_verification={
+        "language": "python " + ".".join(map(str, sys.version_info[:3])),
+        "library": f"pytest {pytest.__version__}",
+        "code": ["while True:", "    pass"],
+    })
+    outcome = watcher.verify_entry(watcher.paths["base"], data)
+    assert outcome["status"] == "failed"
+    assert "   → Error: TimeoutError: verification timed out" in outcome["errors"]
+
+
+def test_broken_json_and_globals_change(repo):
+    watcher = Watcher(repo, verify=False, regenerate=False)
+    watcher.start()
+
+    (repo / "entries" / "other.json").write_text("{ not json")
+    to_check, _, _ = watcher.apply(watcher.poll())
+    assert to_check == {"other"}
+    assert watcher.check(to_check)["other"][0].startswith("[ERROR] Invalid JSON syntax")
+
+    assumptions = repo / "globals" / "assumptions.json"
+    assumptions.write_text(json.dumps({"assumptions": []}))
+    os.utime(assumptions, ns=(0, 1))
+    to_check, _, _ = watcher.apply(watcher.poll())
+    assert to_check == {"base", "middle", "top", "other"}
+
+
+def test_snapshot_diff(tmp_path):
+    (tmp_path / "entries").mkdir()
+    before = snapshot(tmp_path)
+    (tmp_path / "entries" / "new.json").write_text("{}")
+    assert changed_paths(before, snapshot(tmp_path)) == {tmp_path / "entries" / "new.json"}
@@ -0,0 +1,11 @@
+"""
+TheorIA: a curated dataset of theoretical physics results.
+
+This package provides read access to the dataset; see theoria.dataset,
+and theoria.model for typed entries.
+"""
+
+from theoria.dataset import Dataset
+from theoria.model import Entry, GlobalAssumption, ModelError, load_entry
+
+__all__ = ['Dataset', 'Entry', 'GlobalAssumption', 'ModelError', 'load_entry']
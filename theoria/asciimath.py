@@ -0,0 +1,782 @@
+"""
+Parser for the AsciiMath equation strings stored in entries.
+
+result_equations[].equation, derivation[].equation and the assumptions'
+mathematical_expressions are AsciiMath, e.g. 'Delta q_i * Delta p_i >= hbar/2'.
+
+    from theoria import asciimath
+
+    ast = asciimath.parse('E = 1/2*m*v^2')
+    # ['rel', ['='], [['sym', 'E'], ['mul', ['frac', ['num', '1'], ['num', '2']], ...]]]
+    expr = asciimath.sympy_form('E = 1/2*m*v^2')   # Eq(E, m*v**2/2), or None
+
+parse() never raises: input it cannot read becomes an ['error', text,
+message] node. ASTs are nested lists whose first item names the node:
+
+    ['num', '2']  ['sym', 'alpha']  ['text', 'constant']
+    ['list', items, separators]       top-level ';' or ',' lists
+    ['rel', operators, operands]      relation and arrow chains
+    ['add', term, ...]  ['neg', x]  ['unary', '+-', x]
+    ['mul', factor, ...]              explicit '*' (and cdot)
+    ['juxt', factor, ...]             adjacent terms, e.g. 'm v', 'psi(t)'
+    ['binop', op, a, b]               'xx' and other operators
+    ['frac', a, b]  ['sub', x, s]  ['sup', x, s]  ['subsup', x, s, t]
+    ['prime', x, count]  ['fact', x]
+    ['apply', name, x]                sqrt, vec, hat, dot, bb, cc, abs, ...
+    ['call', function, argument]      sin, exp, Tr, PB, ...
+    ['group', open, close, items, separators]
+    ['bra', items]  ['ket', items]  ['braket', items, items]
+
+Names follow AsciiMath: known names (Greek letters, functions, operators)
+are matched longest first and other letter runs split into single letters,
+so 'dt' is d t and 'GM' is G M. Aliases are normalized: 'partial' is
+'del', 'nabla' is 'grad', 'cdot' is '*', 'times' is 'xx', 'le' is '<='.
+'<<' and '>>' are the relations much-less/greater-than, as the corpus uses
+them, rather than AsciiMath's angle brackets.
+
+Parsed trees are cached in memory and on disk, keyed by a hash of the
+string, so repeated runs and every consumer share one parse per distinct
+string. The cache lives under $THEORIA_CACHE_DIR/asciimath/ when that is
+set and in the user cache directory ($XDG_CACHE_HOME or ~/.cache, under
+theoria/asciimath/) otherwise. SymPy is optional: sympy_form() converts the
+arithmetic subset (no derivatives, integrals, sums or bra-kets) and returns
+None for the rest, leaving callers the AST.
+"""
+
+import atexit
+import contextlib
+import hashlib
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from theoria import jsonio
+
+# Bump when the grammar or the AST shape changes; it names the cache file
+PARSER_VERSION = 2
+
+GREEK = frozenset('''
+    alpha beta gamma Gamma delta Delta epsilon varepsilon zeta eta theta Theta
+    vartheta iota kappa lambda Lambda mu nu xi Xi pi Pi rho sigma Sigma tau
+    upsilon Upsilon phi Phi varphi chi psi Psi omega Omega
+'''.split())
+CONSTANTS = frozenset('''
+    hbar oo del grad square dagger cdots vdots ddots sum prod int iint iiint
+    oint lim RR CC NN ZZ QQ AA EE aleph emptyset
+'''.split())
+FUNCTIONS = frozenset('''
+    sin cos tan sec csc cot sinh cosh tanh sech csch coth arcsin arccos arctan
+    exp log ln det dim mod gcd lcm min max Tr tr Re Im PB diag GL SO SU
+'''.split())
+UNARY = frozenset('''
+    sqrt vec hat bar overline dot ddot tilde ul abs norm floor ceil bb bbb cc
+    tt fr sf slashed cancel
+'''.split())
+BINARY = frozenset(['frac', 'root', 'stackrel', 'overset', 'underset'])
+SPACES = frozenset(['quad', 'qquad'])
+
+ALIASES = {
+    'partial': 'del', 'nabla': 'grad', 'infty': 'oo', 'forall': 'AA', 'exists': 'EE',
+    'ast': '**', 'ldots': '...', 'cdot': '*', 'times': 'xx', 'div': '-:',
+    'le': '<=', 'leq': '<=', 'ge': '>=', 'geq': '>=', 'ne': '!=', 'notin': '!in',
+    'approx': '~~', 'equiv': '-=', 'cong': '~=', 'propto': 'prop',
+    'implies': '=>', 'iff': '<=>', 'to': '->', 'rarr': '->', 'mapsto': '|->',
+    'pm': '+-', 'mp': '-+',
+    '≤': '<=', '≥': '>=', '≠': '!=', '≈': '~~', '≃': '~=',
+    '≡': '-=', '→': '->', '⇒': '=>', '·': '*', '×': 'xx',
+    '±': '+-', '†': 'dagger', '∞': 'oo', '∂': 'del', '∇': 'grad',
+}
+RELATIONS = frozenset(['=', '!=', '<', '>', '<=', '>=', '<<', '>>', '~', '~~', '~=', '-=',
+                       ':=', 'in', '!in', 'sub', 'sup', 'sube', 'supe', 'prop'])
+ARROWS = frozenset(['=>', '<=>', '->', '<-', '|->', 'harr'])
+ADDITIVE = frozenset(['+', '-', '+-', '-+'])
+MULTIPLICATIVE = frozenset(['*', 'xx', '-:', '@', 'ox', 'o+', 'nn', 'uu', 'vv', '^^'])
+OPENERS = frozenset(['(', '[', '{', '{:'])
+CLOSERS = frozenset([')', ']', '}', ':}', ':)'])
+SEPARATORS = frozenset([',', ';', '|', ':'])
+PUNCTUATION = frozenset("()[]{},;|:_^'!+-*/=<>~@")
+
+_WORD_OPERATORS = RELATIONS | ARROWS | MULTIPLICATIVE | ADDITIVE
+_NAMES = (GREEK | CONSTANTS | FUNCTIONS | UNARY | BINARY | SPACES | set(ALIASES)
+          | {name for name in _WORD_OPERATORS if name.isalpha()})
+_MAX_NAME = max(len(name) for name in _NAMES)
+_SYMBOLS = ['...', '**', ':|:', '<=>', '|->', '!in', '-:', '(:', ':)', '{:', ':}', ':|', '|:',
+            '||', '=>', '->', '<-', '<=', '>=', '<<', '>>', '!=', ':=', '~~', '~=', '-=', '+-',
+            '-+', '^^']
+_OPERATOR_TOKENS = (PUNCTUATION | _WORD_OPERATORS | set(_SYMBOLS)) - {'**', '...'}
+_TOKEN_RE = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<string>"[^"]*")
+  | text\s*(?:\{(?P<text_brace>[^}]*)\}|\((?P<text_paren>[^)]*)\))
+  | (?P<number>(?:\d+(?:\.\d+)?|\.\d+)(?:\.\d+)*)
+  | (?P<word>[^\W\d_]+)
+  | (?P<symbol>%s)
+  | (?P<other>\S)
+''' % '|'.join(re.escape(symbol) for symbol in sorted(_SYMBOLS, key=len, reverse=True)), re.X)
+
+
+class AsciiMathError(ValueError):
+    """Raised by parse_uncached for input it cannot parse."""
+
+
+class ConversionError(ValueError):
+    """Raised by to_sympy for nodes without a SymPy equivalent."""
+
+
+def _word_tokens(word):
+    """Split a letter run into known names, longest first, and single letters."""
+    i = 0
+    while i < len(word):
+        for size in range(min(_MAX_NAME, len(word) - i), 0, -1):
+            name = word[i:i + size]
+            if size == 1 or name in _NAMES:
+                break
+        i += size
+        name = ALIASES.get(name, name)
+        if name in SPACES:
+            continue
+        if name in _WORD_OPERATORS:
+            yield 'op', name
+        elif name in FUNCTIONS:
+            yield 'func', name
+        elif name in UNARY:
+            yield 'unary', name
+        elif name in BINARY:
+            yield 'binary', name
+        else:
+            yield 'name', name
+
+
+def tokenize(text):
+    """
+    Return the (kind, value) tokens of an equation string. kind is 'num',
+    'name', 'text', 'func', 'unary', 'binary' or 'op'. Raises
+    AsciiMathError for a number with more than one decimal point.
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        group = match.lastgroup
+        if group == 'space':
+            continue
+        if group == 'string':
+            tokens.append(('text', match.group()[1:-1]))
+        elif group in ('text_brace', 'text_paren'):
+            tokens.append(('text', match.group(group)))
+        elif group == 'number':
+            if match.group().count('.') > 1:
+                raise AsciiMathError(f"malformed number {match.group()!r}")
+            tokens.append(('num', match.group()))
+        elif group == 'word':
+            tokens.extend(_word_tokens(match.group()))
+        else:
+            value = ALIASES.get(match.group(), match.group())
+            tokens.append(('op' if value in _OPERATOR_TOKENS else 'name', value))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser over the tokens of one string."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def at(self, values):
+        kind, value = self.peek()
+        return kind == 'op' and value in values
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token[1]
+
+    def expect(self, values):
+        if not self.at(values):
+            raise self.error(f"expected {' or '.join(sorted(values))}")
+        return self.take()
+
+    def error(self, message):
+        kind, value = self.peek()
+        found = 'end of input' if kind is None else repr(value)
+        return AsciiMathError(f"{message} at token {self.pos} ({found})")
+
+    def parse(self):
+        if len(self.tokens) == 1 and self.tokens[0][0] == 'op':
+            # A lone operator, e.g. the definition symbol 'xx'
+            return ['sym', self.tokens[0][1]]
+        node = self.sequence()
+        if self.pos < len(self.tokens):
+            raise self.error('unexpected token')
+        return node
+
+    def sequence(self):
+        items, separators = [self.arrow(colon=True)], []
+        while self.at((',', ';')):
+            separators.append(self.take())
+            items.append(self.arrow(colon=True))
+        return items[0] if not separators else ['list', items, separators]
+
+    def chain(self, operand, operators):
+        operands, ops = [operand()], []
+        while self.at(operators):
+            ops.append(self.take())
+            operands.append(operand())
+        return operands[0] if not ops else ['rel', ops, operands]
+
+    def arrow(self, colon=False):
+        # A top-level ':' reads as 'maps to' (mu: {P} -> [0,1]); in groups it separates
+        return self.chain(self.relation, ARROWS | {':'} if colon else ARROWS)
+
+    def relation(self):
+        return self.chain(self.additive, RELATIONS)
+
+    def additive(self):
+        terms = []
+        op = self.take() if self.at(ADDITIVE) else '+'
+        while True:
+            term = self.multiplicative()
+            terms.append(term if op == '+' else ['neg', term] if op == '-' else ['unary', op, term])
+            if not self.at(ADDITIVE):
+                break
+            op = self.take()
+        return terms[0] if len(terms) == 1 else ['add'] + terms
+
+    def multiplicative(self):
+        node, product = self.juxtaposition(), False
+        while self.at(MULTIPLICATIVE):
+            op = self.take()
+            if self.at(('-',)):
+                self.take()
+                right = ['neg', self.juxtaposition()]
+            else:
+                right = self.juxtaposition()
+            if op != '*':
+                node, product = ['binop', op, node, right], False
+            elif product:
+                node.append(right)
+            else:
+                node, product = ['mul', node, right], True
+        return node
+
+    def evaluation_bar(self):
+        # The '|' of (x^2)|_0^1; a '|' followed by '^' closes an absolute value
+        return (self.at(('|',)) and self.pos + 1 < len(self.tokens)
+                and self.tokens[self.pos + 1] == ('op', '_'))
+
+    def starts_simple(self):
+        kind, value = self.peek()
+        if kind == 'op':
+            return value in OPENERS or value in ('(:', '|:') or self.evaluation_bar()
+        return kind is not None
+
+    def juxtaposition(self):
+        # '|' and '||' only open an absolute value or norm at the start of a
+        # term; after one they close the enclosing one
+        factors = [self.fraction()]
+        while self.starts_simple():
+            factors.append(self.fraction())
+        return factors[0] if len(factors) == 1 else ['juxt'] + factors
+
+    def fraction(self):
+        node = self.intermediate()
+        while self.at(('/',)):
+            self.take()
+            node = ['frac', node, self.intermediate()]
+        return node
+
+    def script(self):
+        if self.at(('-', '+')):
+            sign = self.take()
+            node = self.simple()
+            return ['neg', node] if sign == '-' else node
+        return self.simple()
+
+    def scripts(self, node):
+        while True:
+            if self.at(('_',)):
+                self.take()
+                sub = self.script()
+                if self.at(('^',)):
+                    self.take()
+                    node = ['subsup', node, sub, self.script()]
+                else:
+                    node = ['sub', node, sub]
+            elif self.at(('^',)):
+                self.take()
+                sup = self.script()
+                if self.at(('_',)):
+                    self.take()
+                    node = ['subsup', node, self.script(), sup]
+                else:
+                    node = ['sup', node, sup]
+            elif self.at(("'",)):
+                self.take()
+                if node[0] == 'prime':
+                    node = ['prime', node[1], node[2] + 1]
+                else:
+                    node = ['prime', node, 1]
+            elif self.at(('!',)):
+                self.take()
+                node = ['fact', node]
+            else:
+                return node
+
+    def intermediate(self):
+        return self.scripts(self.simple())
+
+    def simple(self):
+        kind, value = self.peek()
+        if kind is None:
+            raise self.error('unexpected end of input')
+        if kind in ('num', 'name', 'text'):
+            self.take()
+            return ['sym' if kind == 'name' else kind, value]
+        if kind == 'unary':
+            self.take()
+            return ['apply', value, self.simple()]
+        if kind == 'binary':
+            self.take()
+            first = self.simple()
+            return [value, first, self.simple()]
+        if kind == 'func':
+            self.take()
+            function = self.scripts(['sym', value])
+            if self.starts_simple() or self.at(('|', '||')):
+                return ['call', function, self.simple()]
+            return function
+        if value in OPENERS or value == '(:':
+            return self.group()
+        if self.evaluation_bar():
+            self.take()
+            return ['sym', '|']
+        if value == '|:':
+            self.take()
+            items, _ = self.items()
+            self.expect((':)',))
+            return ['ket', items]
+        if value in ('|', '||'):
+            self.take()
+            inner = self.arrow()
+            self.expect((value,))
+            return ['apply', 'abs' if value == '|' else 'norm', inner]
+        raise self.error('unexpected token')
+
+    def items(self, separators=(',',)):
+        """Separated expressions up to a closing bracket; returns (items, separators)."""
+        items, seps = [], []
+        if not self.at(CLOSERS | {':|', ':|:'}):
+            items.append(self.arrow())
+            while self.at(separators):
+                seps.append(self.take())
+                items.append(self.arrow())
+        return items, seps
+
+    def group(self):
+        opener = self.take()
+        items, seps = self.items(SEPARATORS)
+        if opener == '(:' and self.at((':|',)):
+            self.take()
+            return ['bra', items]
+        if opener == '(:' and self.at((':|:',)):
+            self.take()
+            right, _ = self.items()
+            self.expect((':)',))
+            return ['braket', items, right]
+        closer = self.expect(CLOSERS)
+        return ['group', opener, closer, items, seps]
+
+
+def parse_uncached(text):
+    """Parse one equation string into an AST; raises AsciiMathError."""
+    return _Parser(tokenize(text)).parse()
+
+
+def cache_dir():
+    """The on-disk cache directory (see the module docstring)."""
+    root = os.environ.get('THEORIA_CACHE_DIR')
+    if root:
+        return Path(root) / 'asciimath'
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'theoria' / 'asciimath'
+
+
+def _key(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ParseCache:
+    """
+    Parsed trees keyed by the SHA-256 of their source string, persisted as
+    one JSON file per parser version. save() writes new entries back.
+    """
+
+    def __init__(self, directory=None):
+        self.path = Path(directory or cache_dir()) / f"v{PARSER_VERSION}.json"
+        self._trees = None
+        self._dirty = False
+
+    def _read(self):
+        try:
+            return jsonio.load(self.path)
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self):
+        self._trees = self._read()
+
+    def parse(self, text):
+        if self._trees is None:
+            self._load()
+        key = _key(text)
+        tree = self._trees.get(key)
+        if tree is None:
+            try:
+                tree = parse_uncached(text)
+            except AsciiMathError as e:
+                tree = ['error', text, str(e)]
+            self._trees[key] = tree
+            self._dirty = True
+        return tree
+
+    def save(self):
+        """
+        Write the cache file if anything was added since it was loaded.
+        Entries saved meanwhile by other processes are merged in first, and
+        a cache directory that cannot be written is skipped: the cache only
+        saves time.
+        """
+        if not self._dirty:
+            return
+        trees = self._read()
+        trees.update(self._trees)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(jsonio.dumps(trees), encoding='utf-8')
+            tmp_path.replace(self.path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+            return
+        self._trees = trees
+        self._dirty = False
+
+
+_cache = None
+
+
+def _default_cache():
+    global _cache
+    if _cache is None:
+        _cache = ParseCache()
+        atexit.register(_cache.save)
+    return _cache
+
+
+def parse(text):
+    """
+    Return the AST of an equation string, from the shared cache when
+    possible. Strings that do not parse give ['error', text, message].
+    The returned tree is shared; copy it before modifying it.
+    """
+    return _default_cache().parse(text)
+
+
+def save_cache():
+    """Persist strings parsed so far (also done at interpreter exit)."""
+    if _cache is not None:
+        _cache.save()
+
+
+def entry_equations(entry):
+    """
+    Yield (location, equation) for an entry's result equations and
+    derivation steps; location is ('result', equation_id) or ('step', step).
+    """
+    for equation in entry.get('result_equations') or []:
+        if equation.get('equation'):
+            yield ('result', equation.get('id')), equation['equation']
+    for step in entry.get('derivation') or []:
+        if step.get('equation'):
+            yield ('step', step.get('step')), step['equation']
+
+
+# Binding strength of each node when written back as text
+_PRECEDENCE = {'list': 0, 'rel': 1, 'add': 2, 'neg': 2, 'unary': 2, 'mul': 3, 'binop': 3,
+               'juxt': 4, 'frac': 5, 'sub': 6, 'sup': 6, 'subsup': 6, 'prime': 6, 'fact': 6}
+_SEPARATOR_TEXT = {',': ', ', ';': '; ', '|': '|', ':': ' : '}
+
+
+def _wrap(node, precedence):
+    text = to_text(node)
+    return f"({text})" if _PRECEDENCE.get(node[0], 7) < precedence else text
+
+
+def _argument(node):
+    # Arguments of apply/call are always written in parentheses: 'vec L' -> 'vec(L)'
+    if node[0] == 'group' and node[1] == '(' and len(node[3]) == 1:
+        return to_text(node)
+    return f"({to_text(node)})"
+
+
+def to_text(node):
+    """
+    Write an AST back as AsciiMath in a canonical spelling (aliases
+    normalized, 'vec L' as 'vec(L)'). Used for symbol names and keys.
+    """
+    kind = node[0]
+    if kind in ('num', 'sym'):
+        return node[1]
+    if kind == 'text':
+        return f'"{node[1]}"'
+    if kind == 'error':
+        return node[1]
+    if kind == 'list':
+        items, seps = node[1], node[2]
+        return to_text(items[0]) + ''.join(_SEPARATOR_TEXT[sep] + to_text(item)
+                                           for sep, item in zip(seps, items[1:]))
+    if kind == 'rel':
+        ops, operands = node[1], node[2]
+        return _wrap(operands[0], 2) + ''.join(f" {op} {_wrap(operand, 2)}"
+                                               for op, operand in zip(ops, operands[1:]))
+    if kind == 'add':
+        text = _wrap(node[1], 2)
+        for term in node[2:]:
+            if term[0] == 'neg':
+                text += f" - {_wrap(term[1], 3)}"
+            elif term[0] == 'unary':
+                text += f" {term[1]} {_wrap(term[2], 3)}"
+            else:
+                text += f" + {_wrap(term, 3)}"
+        return text
+    if kind == 'neg':
+        return f"-{_wrap(node[1], 3)}"
+    if kind == 'unary':
+        return f"{node[1]}{_wrap(node[2], 3)}"
+    if kind == 'mul':
+        return '*'.join(_wrap(factor, 4) for factor in node[1:])
+    if kind == 'binop':
+        return f"{_wrap(node[2], 4)} {node[1]} {_wrap(node[3], 4)}"
+    if kind == 'juxt':
+        text = _wrap(node[1], 5)
+        for before, factor in zip(node[1:], node[2:]):
+            # psi(t) rather than psi (t)
+            text += ('' if is_application(before, factor) else ' ') + _wrap(factor, 5)
+        return text
+    if kind == 'frac':
+        return f"{_wrap(node[1], 6)}/{_wrap(node[2], 6)}"
+    if kind == 'sub':
+        return f"{_wrap(node[1], 6)}_{_wrap(node[2], 7)}"
+    if kind == 'sup':
+        return f"{_wrap(node[1], 6)}^{_wrap(node[2], 7)}"
+    if kind == 'subsup':
+        return f"{_wrap(node[1], 6)}_{_wrap(node[2], 7)}^{_wrap(node[3], 7)}"
+    if kind == 'prime':
+        return _wrap(node[1], 6) + "'" * node[2]
+    if kind == 'fact':
+        return f"{_wrap(node[1], 6)}!"
+    if kind == 'apply':
+        if node[1] in ('abs', 'norm'):
+            bar = '|' if node[1] == 'abs' else '||'
+            return f"{bar}{to_text(node[2])}{bar}"
+        return node[1] + _argument(node[2])
+    if kind == 'call':
+        return to_text(node[1]) + _argument(node[2])
+    if kind == 'group':
+        _, opener, closer, items, seps = node
+        inner = to_text(items[0]) if items else ''
+        inner += ''.join(_SEPARATOR_TEXT[sep] + to_text(item) for sep, item in zip(seps, items[1:]))
+        return f"{opener}{inner}{closer}"
+    if kind == 'bra':
+        return f"(:{', '.join(map(to_text, node[1]))}:|"
+    if kind == 'ket':
+        return f"|:{', '.join(map(to_text, node[1]))}:)"
+    if kind == 'braket':
+        return f"(:{', '.join(map(to_text, node[1]))}:|:{', '.join(map(to_text, node[2]))}:)"
+    if kind in BINARY:
+        return f"{kind}{_argument(node[1])}{_argument(node[2])}"
+    raise ValueError(f"Unknown AST node: {kind!r}")
+
+
+# Names that are operators rather than values; expressions using them are
+# derivatives, integrals, sums and the like, which to_sympy does not attempt
+_OPERATOR_NAMES = frozenset(['d', 'del', 'grad', 'square', 'sum', 'prod', 'int', 'iint', 'iiint',
+                             'oint', 'lim', 'dagger', '**', '...', 'cdots', 'vdots', 'ddots',
+                             'AA', 'EE', 'RR', 'CC', 'NN', 'ZZ', 'QQ', '|'])
+_DECORATIONS = frozenset(['vec', 'hat', 'bar', 'overline', 'dot', 'ddot', 'tilde', 'ul',
+                          'bb', 'bbb', 'cc', 'tt', 'fr', 'sf', 'slashed'])
+_SYMPY_RELATIONS = {'=': 'Eq', ':=': 'Eq', '!=': 'Ne', '<': 'Lt', '>': 'Gt', '<=': 'Le', '>=': 'Ge'}
+_SYMPY_FUNCTIONS = {
+    'sin': 'sin', 'cos': 'cos', 'tan': 'tan', 'sec': 'sec', 'csc': 'csc', 'cot': 'cot',
+    'sinh': 'sinh', 'cosh': 'cosh', 'tanh': 'tanh', 'sech': 'sech', 'csch': 'csch',
+    'coth': 'coth', 'arcsin': 'asin', 'arccos': 'acos', 'arctan': 'atan', 'exp': 'exp',
+    'log': 'log', 'ln': 'log', 'Re': 're', 'Im': 'im', 'min': 'Min', 'max': 'Max',
+}
+
+
+def is_symbol(node):
+    """True for nodes that name a single quantity: x, q_i, vec(L), dot(q)_i, x'."""
+    kind = node[0]
+    if kind == 'sym':
+        return node[1] not in _OPERATOR_NAMES and node[1] not in ('pi', 'oo')
+    if kind == 'sub':
+        return is_symbol(node[1])
+    if kind == 'prime':
+        return is_symbol(node[1])
+    if kind == 'apply':
+        inner = node[2]
+        if _is_paren_group(inner) and len(inner[3]) == 1:
+            inner = inner[3][0]
+        return node[1] in _DECORATIONS and is_symbol(inner)
+    return False
+
+
+def _is_paren_group(node):
+    return node[0] == 'group' and node[1] == '(' and node[2] == ')'
+
+
+def is_application(factor, following):
+    """
+    True when a name followed by parentheses reads as a function call:
+    psi(t), V(r, t), phi(0). Compound arguments read as products, as in
+    GM(2/r - 1/a) or r_a(2a).
+    """
+    return (following is not None and is_symbol(factor) and _is_paren_group(following)
+            and bool(following[3]) and all(is_symbol(item) or item[0] == 'num' for item in following[3]))
+
+
+class _SympyConverter:
+
+    def __init__(self, sympy):
+        self.sp = sympy
+
+    def fail(self, node):
+        return ConversionError(f"No SymPy form for {node[0]!r} node: {to_text(node)}")
+
+    def arguments(self, node):
+        if node[0] == 'group' and node[1] in ('(', '[', '{') and all(sep == ',' for sep in node[4]):
+            return [self.convert(item) for item in node[3]]
+        return [self.convert(node)]
+
+    def convert(self, node):
+        sp = self.sp
+        kind = node[0]
+        if is_symbol(node):
+            return sp.Symbol(to_text(node))
+        if kind == 'num':
+            return sp.Rational(node[1]) if '.' in node[1] else sp.Integer(node[1])
+        if kind == 'sym':
+            if node[1] == 'pi':
+                return sp.pi
+            if node[1] == 'oo':
+                return sp.oo
+            raise self.fail(node)
+        if kind == 'group':
+            if node[1] in ('(', '[', '{') and len(node[3]) == 1:
+                return self.convert(node[3][0])
+            raise self.fail(node)
+        if kind == 'add':
+            return sp.Add(*[self.convert(term) for term in node[1:]])
+        if kind == 'neg':
+            return -self.convert(node[1])
+        if kind == 'mul':
+            return sp.Mul(*[self.convert(factor) for factor in node[1:]])
+        if kind == 'juxt':
+            return self.juxtaposition(node)
+        if kind == 'frac':
+            return self.convert(node[1]) / self.convert(node[2])
+        if kind == 'binop' and node[1] == '-:':
+            return self.convert(node[2]) / self.convert(node[3])
+        if kind == 'sup':
+            return self.convert(node[1]) ** self.convert(node[2])
+        if kind == 'subsup' and is_symbol(['sub', node[1], node[2]]):
+            return sp.Symbol(to_text(['sub', node[1], node[2]])) ** self.convert(node[3])
+        if kind == 'apply':
+            if node[1] == 'sqrt':
+                return sp.sqrt(self.convert(node[2]))
+            if node[1] == 'abs':
+                return sp.Abs(self.convert(node[2]))
+            if node[1] in ('floor', 'ceil'):
+                return (sp.floor if node[1] == 'floor' else sp.ceiling)(self.convert(node[2]))
+            raise self.fail(node)
+        if kind == 'root':
+            return sp.root(self.convert(node[2]), self.convert(node[1]))
+        if kind == 'fact':
+            return sp.factorial(self.convert(node[1]))
+        if kind == 'call':
+            return self.call(node)
+        if kind == 'rel':
+            return self.relation(node)
+        if kind == 'list':
+            return sp.Tuple(*[self.convert(item) for item in node[1]])
+        raise self.fail(node)
+
+    def call(self, node):
+        sp = self.sp
+        function, power = node[1], None
+        if function[0] == 'sup':
+            function, power = function[1], self.convert(function[2])
+        if function[0] != 'sym':
+            raise self.fail(node)
+        name = function[1]
+        args = self.arguments(node[2])
+        result = getattr(sp, _SYMPY_FUNCTIONS[name])(*args) if name in _SYMPY_FUNCTIONS \
+            else sp.Function(name)(*args)
+        return result if power is None else result ** power
+
+    def juxtaposition(self, node):
+        sp = self.sp
+        factors, values = node[1:], []
+        i = 0
+        while i < len(factors):
+            factor = factors[i]
+            following = factors[i + 1] if i + 1 < len(factors) else None
+            if is_application(factor, following):
+                values.append(sp.Function(to_text(factor))(*self.arguments(following)))
+                i += 2
+                continue
+            values.append(self.convert(factor))
+            i += 1
+        return sp.Mul(*values)
+
+    def relation(self, node):
+        sp = self.sp
+        ops, operands = node[1], [self.convert(operand) for operand in node[2]]
+        if any(op not in _SYMPY_RELATIONS for op in ops):
+            raise self.fail(node)
+        relations = [getattr(sp, _SYMPY_RELATIONS[op])(left, right, evaluate=False)
+                     for op, left, right in zip(ops, operands, operands[1:])]
+        return relations[0] if len(relations) == 1 else sp.And(*relations, evaluate=False)
+
+
+def to_sympy(node):
+    """
+    Convert an AST to a SymPy expression or relation. Raises ImportError
+    without SymPy and ConversionError for nodes outside the supported
+    subset or that SymPy rejects (a function with the wrong number of
+    arguments, a relation used as an operand). Decorated and subscripted names become single symbols
+    ('vec(L)', 'q_i') and applications (see is_application) undefined
+    functions ('psi(t)').
+    """
+    import sympy
+    try:
+        return _SympyConverter(sympy).convert(node)
+    except ConversionError:
+        raise
+    except (TypeError, ValueError) as e:
+        raise ConversionError(f"No SymPy form for {to_text(node)}: {e}") from e
+
+
+@lru_cache(maxsize=None)
+def sympy_form(text):
+    """
+    SymPy form of an equation string, memoized per process; None when
+    SymPy is missing or the string has no SymPy form (use parse() then).
+    """
+    try:
+        return to_sympy(parse(text))
+    except (ImportError, ConversionError):
+        return None
@@ -0,0 +1,102 @@
+"""
+Transparent gzip/zstd compression for dataset artifacts.
+
+Writers take a compression name ('gzip', 'zstd' or None) and stream
+through the matching compressor; readers detect the format from the
+file's magic bytes, so callers never need to know how a file was written.
+zstd needs the optional 'zstandard' package.
+"""
+
+import gzip
+import io
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+SUFFIXES = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+COMPRESSIONS = tuple(SUFFIXES)
+
+
+class _ClosingGzipFile(gzip.GzipFile):
+    """GzipFile that closes the file object it was given."""
+
+    def __init__(self, fileobj, level):
+        super().__init__(filename='', mode='wb', compresslevel=level, fileobj=fileobj, mtime=0)
+        self._owned = fileobj
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._owned.close()
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression requires the 'zstandard' package") from None
+    return zstandard
+
+
+def detect_compression(path):
+    """Return 'gzip', 'zstd' or None from the first bytes of the file at path."""
+    with open(path, 'rb') as f:
+        head = f.read(4)
+    if head.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if head.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return None
+
+
+def with_suffix(path, compression):
+    """Append the conventional suffix for compression ('.gz', '.zst') to path."""
+    path = str(path)
+    suffix = SUFFIXES.get(compression, '')
+    return path if path.endswith(suffix) else path + suffix
+
+
+def open_compressed(path, mode='rt', compression=None, level=None):
+    """
+    Open path for reading or writing, in text ('rt'/'wt') or binary
+    ('rb'/'wb') mode. When reading, compression is detected from the file;
+    when writing, it is taken from the compression argument.
+    """
+    if mode not in ('rt', 'wt', 'rb', 'wb'):
+        raise ValueError(f"Unsupported mode: {mode}")
+    reading = mode[0] == 'r'
+    if reading:
+        compression = detect_compression(path)
+    elif compression not in (None,) + COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+
+    if compression == 'gzip':
+        if reading:
+            raw = gzip.open(path, 'rb')
+        else:
+            # No embedded name or timestamp, so identical input gives identical output
+            raw = _ClosingGzipFile(open(path, 'wb'), 9 if level is None else level)
+    elif compression == 'zstd':
+        zstandard = _zstandard()
+        fh = open(path, mode[0] + 'b')
+        if reading:
+            raw = zstandard.ZstdDecompressor().stream_reader(fh, closefd=True)
+        else:
+            cctx = zstandard.ZstdCompressor(level=19 if level is None else level)
+            raw = cctx.stream_writer(fh, closefd=True)
+    else:
+        raw = open(path, mode[0] + 'b')
+
+    if mode[1] == 'b':
+        return raw
+    return io.TextIOWrapper(raw, encoding='utf-8')
+
+
+def read_bytes(path):
+    """Return the decompressed contents of the file at path."""
+    with open_compressed(path, 'rb') as f:
+        return f.read()
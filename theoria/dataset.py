@@ -0,0 +1,315 @@
+"""
+Read-only, indexed access to the TheorIA dataset.
+
+    from theoria import Dataset
+
+    ds = Dataset.open('.')               # repository root or an entries/ directory
+    ds = Dataset.open('dataset.json')    # output of scripts/build_ml_dataset.py
+    ds = Dataset.open('dataset.json.gz') # compressed output (--compress gzip|zstd)
+    ds = Dataset.open('dataset.pack')    # packed output (build_ml_dataset --format packed)
+
+    ds['vis_viva']['result_name']
+    for entry in ds.filter(domain='hep-th', review_status='reviewed'):
+        ...
+    ds.upstream('scalar_field_quantization')
+    ds.find_equivalent('E = m*c^2')
+    ds.symbol_meanings('L')              # Lagrangian, angular momentum, length, ...
+
+Entries are returned as the plain dicts stored in the JSON files. With an
+entries directory, each file is parsed the first time it is accessed; the
+small metadata index used for filtering and graph traversal is built on
+first use.
+"""
+
+from collections import deque
+from pathlib import Path
+
+from theoria import jsonio
+from theoria.compression import read_bytes
+from theoria.equation_index import EquationIndex, load_equation_index
+from theoria.interning import decode_entry, intern_entry, load_vocabulary
+from theoria.packed import PackedSource, is_packed
+from theoria.symbol_index import SymbolIndex, load_symbol_index
+
+
+class DirectorySource:
+    """Entries stored one JSON file per entry, parsed on first access."""
+
+    def __init__(self, entries_dir, root=None):
+        self.entries_dir = Path(entries_dir)
+        self.root = Path(root) if root else None
+        self._paths = {path.stem: path for path in sorted(self.entries_dir.glob('*.json'))}
+        self._cache = {}
+
+    def ids(self):
+        return list(self._paths)
+
+    def load(self, result_id):
+        if result_id not in self._cache:
+            self._cache[result_id] = intern_entry(jsonio.load(self._paths[result_id]))
+        return self._cache[result_id]
+
+    def scan(self):
+        """Yield every entry once without keeping the ones not already cached."""
+        for result_id in self._paths:
+            if result_id in self._cache:
+                yield self._cache[result_id]
+            else:
+                yield intern_entry(jsonio.load(self._paths[result_id]))
+
+    def global_assumptions(self):
+        if not self.root:
+            return []
+        path = self.root / 'globals' / 'assumptions.json'
+        if not path.exists():
+            return []
+        return jsonio.load(path)['assumptions']
+
+    def graph(self):
+        """Return build/graph.json if it exists and is newer than every entry, else None."""
+        if not self.root:
+            return None
+        graph_path = self.root / 'build' / 'graph.json'
+        if not graph_path.exists():
+            return None
+        graph_mtime = graph_path.stat().st_mtime
+        if any(path.stat().st_mtime > graph_mtime for path in self._paths.values()):
+            return None
+        graph = jsonio.load(graph_path)
+        if graph.get('nodes') != sorted(self._paths):
+            return None
+        return graph
+
+
+class DatasetFileSource:
+    """A built dataset file (dataset.json, optionally gzip/zstd-compressed) holding every entry."""
+
+    def __init__(self, path):
+        self.path = path
+        data = jsonio.loads(read_bytes(path))
+        self.dataset_info = data.get('dataset_info', {})
+        self._assumptions = data.get('global_assumptions', [])
+        strings = load_vocabulary(path, self.dataset_info)
+        self._entries = {}
+        for entry in data.get('entries', []):
+            entry = decode_entry(entry, strings) if strings else entry
+            self._entries[entry['result_id']] = intern_entry(entry)
+
+    def ids(self):
+        return sorted(self._entries)
+
+    def load(self, result_id):
+        return self._entries[result_id]
+
+    def scan(self):
+        for result_id in self.ids():
+            yield self._entries[result_id]
+
+    def global_assumptions(self):
+        return self._assumptions
+
+    def graph(self):
+        return None
+
+
+def _assumption_ids(assumptions):
+    """Assumption IDs of an entry; built datasets store them resolved as dicts."""
+    ids = set()
+    for assumption in assumptions or []:
+        if isinstance(assumption, dict):
+            if assumption.get('id'):
+                ids.add(assumption['id'])
+        else:
+            ids.add(assumption)
+    return ids
+
+
+def _iter_bits(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class Dataset:
+    """Indexed view over TheorIA entries, keyed by result_id."""
+
+    def __init__(self, source):
+        self._source = source
+        self._ids = source.ids()
+        self._id_set = set(self._ids)
+        self._metadata = None
+        self._graph = None
+        self._reverse = None
+        self._equation_index = None
+        self._symbol_index = None
+
+    @classmethod
+    def open(cls, path):
+        """
+        Open a repository root, an entries directory or a built dataset file
+        (JSON, compressed JSON or packed). Raises FileNotFoundError if path does not exist.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"No dataset at {path}")
+        if path.is_dir():
+            if (path / 'entries').is_dir():
+                return cls(DirectorySource(path / 'entries', root=path))
+            root = path.parent if (path.parent / 'globals').is_dir() else None
+            return cls(DirectorySource(path, root=root))
+        if is_packed(path):
+            return cls(PackedSource(path))
+        return cls(DatasetFileSource(path))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, result_id):
+        return result_id in self._id_set
+
+    def __iter__(self):
+        for result_id in self._ids:
+            yield self._source.load(result_id)
+
+    def __getitem__(self, result_id):
+        if result_id not in self._id_set:
+            raise KeyError(result_id)
+        return self._source.load(result_id)
+
+    def get(self, result_id, default=None):
+        """Return the entry for result_id, or default if there is none."""
+        return self[result_id] if result_id in self._id_set else default
+
+    def ids(self):
+        """All result_ids, sorted."""
+        return list(self._ids)
+
+    @property
+    def info(self):
+        """dataset_info of a built dataset; empty for an entries directory."""
+        return getattr(self._source, 'dataset_info', {})
+
+    @property
+    def global_assumptions(self):
+        """The global assumptions as a {id: assumption} dict."""
+        return {assumption['id']: assumption for assumption in self._source.global_assumptions()}
+
+    def metadata(self, result_id):
+        """
+        Small per-entry index record: domain, review_status, entry-level
+        assumptions, step-level assumptions and depends_on.
+        """
+        if self._metadata is None:
+            self._metadata = {}
+            for entry in self._source.scan():
+                self._metadata[entry['result_id']] = {
+                    'domain': entry.get('domain'),
+                    'review_status': entry.get('review_status', 'draft'),
+                    'assumptions': _assumption_ids(entry.get('assumptions')),
+                    'step_assumptions': {
+                        assumption
+                        for step in entry.get('derivation') or []
+                        for assumption in step.get('assumptions') or []
+                    },
+                    'depends_on': list(entry.get('depends_on') or []),
+                }
+        return self._metadata[result_id]
+
+    def filter(self, domain=None, review_status=None, assumption=None, step_assumption=None):
+        """
+        Iterate over entries matching every given criterion. assumption matches
+        the entry-level assumptions array, step_assumption any derivation step's.
+        Only matching entries are loaded.
+        """
+        for result_id in self._ids:
+            meta = self.metadata(result_id)
+            if domain is not None and meta['domain'] != domain:
+                continue
+            if review_status is not None and meta['review_status'] != review_status:
+                continue
+            if assumption is not None and assumption not in meta['assumptions']:
+                continue
+            if step_assumption is not None and step_assumption not in meta['step_assumptions']:
+                continue
+            yield self._source.load(result_id)
+
+    def dependencies(self, result_id):
+        """Entries result_id directly depends on (existing ones only)."""
+        return [dep for dep in self.metadata(result_id)['depends_on'] if dep in self._id_set]
+
+    def dependents(self, result_id):
+        """Entries that directly depend on result_id."""
+        return list(self._reverse_adjacency().get(result_id, []))
+
+    def upstream(self, result_id):
+        """All entries result_id transitively depends on, sorted."""
+        return self._closure(result_id, 'upstream', self.dependencies)
+
+    def downstream(self, result_id):
+        """All entries that transitively depend on result_id, sorted."""
+        return self._closure(result_id, 'downstream', self.dependents)
+
+    def equation_index(self):
+        """
+        EquationIndex of the result and derivation equations: the one written
+        next to a built dataset if present, else built on first use.
+        """
+        if self._equation_index is None:
+            path = getattr(self._source, 'path', None)
+            index = load_equation_index(path, self.info) if path else None
+            self._equation_index = index or EquationIndex.build(self._source.scan())
+        return self._equation_index
+
+    def find_equivalent(self, expr, up_to_renaming=False):
+        """
+        (result_id, 'result', equation_id) and (result_id, 'step', step)
+        locations of equations equivalent to the AsciiMath string expr.
+        """
+        return self.equation_index().find_equivalent(expr, up_to_renaming)
+
+    def symbol_index(self):
+        """
+        SymbolIndex of the entry definitions and global assumption
+        symbol_definitions: the one written next to a built dataset if
+        present, else built on first use.
+        """
+        if self._symbol_index is None:
+            path = getattr(self._source, 'path', None)
+            index = load_symbol_index(path, self.info) if path else None
+            self._symbol_index = index or SymbolIndex.build(self._source.scan(), self.global_assumptions)
+        return self._symbol_index
+
+    def symbol_meanings(self, symbol):
+        """
+        Meanings of symbol across the corpus, most common first; each is
+        {'label': ..., 'occurrences': [{'source', 'id', 'symbol', 'definition'}, ...]}.
+        """
+        return self.symbol_index().meanings(symbol)
+
+    def _reverse_adjacency(self):
+        if self._reverse is None:
+            self._reverse = {}
+            for node in self._ids:
+                for dep in self.dependencies(node):
+                    self._reverse.setdefault(dep, []).append(node)
+        return self._reverse
+
+    def _closure(self, result_id, direction, neighbours):
+        if result_id not in self._id_set:
+            raise KeyError(result_id)
+        if self._graph is None:
+            self._graph = self._source.graph() or False
+        if self._graph:
+            # Precomputed bitset closure from scripts/dependency_graph.py
+            nodes = self._graph['nodes']
+            return [nodes[i] for i in _iter_bits(int(self._graph['closure'][direction][result_id], 16))]
+
+        seen = set()
+        queue = deque(neighbours(result_id))
+        while queue:
+            node = queue.popleft()
+            if node not in seen:
+                seen.add(node)
+                queue.extend(neighbours(node))
+        return sorted(seen)
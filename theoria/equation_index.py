@@ -0,0 +1,341 @@
+"""
+Fingerprint index of equivalent equations across the corpus.
+
+Every result equation and derivation step is parsed (theoria.asciimath),
+brought to a canonical form and hashed, so equations that differ only in
+spelling, term order or which side of '=' things are on share a
+fingerprint:
+
+    index = EquationIndex.build(entries)
+    index.find_equivalent('m*c^2 = E')                      # [('mass_energy', 'result', 'eq1'), ...]
+    index.find_equivalent('U = M*C^2', up_to_renaming=True) # same, ignoring symbol names
+    index.duplicates()                                      # groups spanning several entries
+
+The canonical form is a cheap normalization, not a proof of equality:
+
+- parentheses are dropped, juxtaposition is multiplication and a/b is a*b^-1
+- sums and products are flattened, signs pulled out and integer factors
+  and exponents combined
+- terms of sums and items of lists are sorted; in products only the
+  numeric factors (numbers and named constants such as hbar) move to the
+  front, and the others keep their written order, since symbols may stand
+  for operators: 'x p - p x' and 'a^dagger a' differ from 'p x - x p' and
+  'a a^dagger'
+- zero terms are dropped, 'a = b' becomes a - b = 0 up to sign and
+  '>'/'>=' chains are turned around
+
+With up_to_renaming, variables are additionally renamed in order of first
+appearance, so 'E = m c^2' and 'F = k x^2' share a fingerprint. Locations
+are (result_id, 'result', equation_id) or (result_id, 'step', step_number).
+build_ml_dataset writes the index next to the dataset as
+<output>.equations.json (dataset.pack.equations.json for dataset.pack) and
+names it in dataset_info.
+"""
+
+import hashlib
+from pathlib import Path
+
+from theoria import asciimath, jsonio
+from theoria.asciimath import entry_equations, is_application
+
+# Bump when the canonical form or the stored layout changes
+VERSION = 3
+# Names that keep their meaning under renaming
+FIXED_NAMES = asciimath.CONSTANTS | asciimath.FUNCTIONS | {'pi', 'd', '**', '...', '|'}
+COMMUTATIVE = ('add', 'list', 'equal')
+
+_ONE = ['num', '1']
+_MINUS_ONE = ['neg', _ONE]
+
+
+def _int_value(node):
+    if node[0] == 'num' and node[1].isdigit():
+        return int(node[1])
+    if node[0] == 'neg' and node[1][0] == 'num' and node[1][1].isdigit():
+        return -int(node[1][1])
+    return None
+
+
+def _int_node(value):
+    return ['num', str(value)] if value >= 0 else ['neg', ['num', str(-value)]]
+
+
+def _negate(node):
+    if node[0] == 'neg':
+        return node[1]
+    if node[0] == 'add':
+        return ['add'] + [_negate(term) for term in node[1:]]
+    return ['neg', node]
+
+
+def _add(terms):
+    flat = []
+    for term in terms:
+        flat.extend(term[1:] if term[0] == 'add' else [term])
+    # 'a - b = 0' must meet 'a = b', which becomes a - b - 0
+    flat = [term for term in flat if _int_value(term) != 0] or [['num', '0']]
+    return flat[0] if len(flat) == 1 else ['add'] + flat
+
+
+def _mul(factors):
+    flat, negative, number = [], False, 1
+    pending = list(factors)
+    while pending:
+        factor = pending.pop(0)
+        if factor[0] == 'mul':
+            pending[:0] = factor[1:]
+        elif factor[0] == 'neg':
+            negative = not negative
+            pending.insert(0, factor[1])
+        elif _int_value(factor) is not None:
+            number *= _int_value(factor)
+        else:
+            flat.append(factor)
+    if number < 0:
+        negative, number = not negative, -number
+    if number != 1 or not flat:
+        flat.insert(0, ['num', str(number)])
+    node = flat[0] if len(flat) == 1 else ['mul'] + flat
+    return ['neg', node] if negative else node
+
+
+def _pow(base, exponent):
+    power = _int_value(exponent)
+    if power == 1:
+        return base
+    if power is not None:
+        if base[0] == 'pow' and _int_value(base[2]) is not None:
+            return _pow(base[1], _int_node(_int_value(base[2]) * power))
+        if base[0] == 'mul':
+            return _mul([_pow(factor, exponent) for factor in base[1:]])
+    return ['pow', base, exponent]
+
+
+def _paren_item(node):
+    """The single item of a '( )' group, or None."""
+    if node[0] == 'group' and node[1] == '(' and node[2] == ')' and len(node[3]) == 1:
+        return node[3][0]
+    return None
+
+
+def _normalize(node):
+    kind = node[0]
+    if kind in ('num', 'sym'):
+        return node
+    if kind == 'text':
+        return ['text', ' '.join(node[1].split())]
+    if kind == 'error':
+        return ['error', node[1]]
+    if kind == 'group':
+        item = _paren_item(node)
+        if item is not None:
+            return _normalize(item)
+        return ['group', node[1], node[2], [_normalize(item) for item in node[3]], node[4]]
+    if kind == 'add':
+        return _add([_normalize(term) for term in node[1:]])
+    if kind == 'neg':
+        return _negate(_normalize(node[1]))
+    if kind == 'mul':
+        return _mul([_normalize(factor) for factor in node[1:]])
+    if kind == 'juxt':
+        factors, i = [], 1
+        while i < len(node):
+            following = node[i + 1] if i + 1 < len(node) else None
+            if is_application(node[i], following):
+                factors.append(['call', _normalize(node[i]), _normalize(following)])
+                i += 2
+            else:
+                factors.append(_normalize(node[i]))
+                i += 1
+        return _mul(factors)
+    if kind == 'frac':
+        return _mul([_normalize(node[1]), _pow(_normalize(node[2]), _MINUS_ONE)])
+    if kind == 'sup':
+        return _pow(_normalize(node[1]), _normalize(node[2]))
+    if kind == 'subsup':
+        return _pow(['sub', _normalize(node[1]), _normalize(node[2])], _normalize(node[3]))
+    if kind == 'apply' and node[1] == 'sqrt':
+        return _pow(_normalize(node[2]), _normalize(['frac', _ONE, ['num', '2']]))
+    if kind == 'rel':
+        return _relation(node[1], [_normalize(operand) for operand in node[2]])
+    if kind == 'list':
+        return ['list'] + [_normalize(item) for item in node[1]]
+    # Everything else keeps its shape with normalized children
+    return [_normalize(child) if isinstance(child, list) and child and isinstance(child[0], str)
+            else [_normalize(item) for item in child] if isinstance(child, list)
+            else child for child in node]
+
+
+_FLIPPED = {'>': '<', '>=': '<=', '>>': '<<'}
+
+
+def _relation(ops, operands):
+    if all(op in _FLIPPED for op in ops):
+        ops, operands = [_FLIPPED[op] for op in reversed(ops)], operands[::-1]
+    if ops in (['='], [':=']):
+        return ['zero', _add([operands[0], _negate(operands[1])])]
+    if all(op == '=' for op in ops):
+        return ['equal'] + operands
+    return ['rel', ops, operands]
+
+
+def _key(node):
+    return jsonio.dumps(node)
+
+
+def _masked_key(node):
+    return jsonio.dumps(_rename(node, {}, mask=True))
+
+
+def _scalar(node):
+    """Whether node holds no variables, only numbers and named constants."""
+    if not isinstance(node, list) or not node:
+        return True
+    if not isinstance(node[0], str):
+        return all(_scalar(item) for item in node)
+    if node[0] == 'sym':
+        return node[1] in asciimath.CONSTANTS or node[1] == 'pi'
+    return all(_scalar(child) for child in node[1:])
+
+
+def _order(node, key):
+    """Sort commutative children by key and pick the sign of 'a - b = 0'."""
+    if not isinstance(node, list) or not node or not isinstance(node[0], str):
+        return node
+    kind = node[0]
+    if kind in ('num', 'sym', 'text', 'error'):
+        return node
+    children = [[_order(item, key) for item in child] if isinstance(child, list) and child
+                and not isinstance(child[0], str) else _order(child, key) for child in node[1:]]
+    if kind in COMMUTATIVE:
+        children.sort(key=key)
+    elif kind == 'mul':
+        scalars = sorted((child for child in children if _scalar(child)), key=key)
+        children = scalars + [child for child in children if not _scalar(child)]
+    if kind == 'zero':
+        negated = _order(_negate(children[0]), key)
+        return min(['zero', children[0]], ['zero', negated], key=key)
+    return [kind] + children
+
+
+def _rename(node, names, mask=False):
+    """Replace variable names by v0, v1, ... in order of first appearance (or '?' with mask)."""
+    if not isinstance(node, list) or not node:
+        return node
+    if not isinstance(node[0], str):
+        return [_rename(item, names, mask) for item in node]
+    if node[0] == 'sym' and node[1] not in FIXED_NAMES:
+        if mask:
+            return ['sym', '?']
+        names.setdefault(node[1], f"v{len(names)}")
+        return ['sym', names[node[1]]]
+    if node[0] in ('num', 'text', 'error'):
+        return node
+    return [node[0]] + [_rename(child, names, mask) for child in node[1:]]
+
+
+def canonical_form(tree, up_to_renaming=False):
+    """Canonical form of a parsed equation (see the module docstring)."""
+    node = _normalize(tree)
+    if up_to_renaming:
+        node = _rename(_order(node, _masked_key), {})
+    return _order(node, _key)
+
+
+def fingerprint(tree, up_to_renaming=False):
+    """Short hash of the canonical form; None for strings that did not parse."""
+    if tree[0] == 'error':
+        return None
+    data = jsonio.dumps(canonical_form(tree, up_to_renaming)).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+def _parts(tree):
+    """The whole equation plus each relation of a top-level list."""
+    yield tree
+    if tree[0] == 'list':
+        for item in tree[1]:
+            if item[0] == 'rel':
+                yield item
+
+
+class EquationIndex:
+    """{fingerprint: [location, ...]} tables, exact and up to renaming."""
+
+    def __init__(self, exact=None, renamed=None):
+        self.exact = exact if exact is not None else {}
+        self.renamed = renamed if renamed is not None else {}
+
+    @classmethod
+    def build(cls, entries):
+        index = cls()
+        for entry in entries:
+            for (kind, equation_id), text in entry_equations(entry):
+                index.add((entry['result_id'], kind, equation_id), text)
+        asciimath.save_cache()
+        return index
+
+    def add(self, location, text):
+        location = list(location)
+        tree = asciimath.parse(text)
+        for table, up_to_renaming in ((self.exact, False), (self.renamed, True)):
+            for part in _parts(tree):
+                key = fingerprint(part, up_to_renaming)
+                if key is None:
+                    continue
+                locations = table.setdefault(key, [])
+                if location not in locations:
+                    locations.append(location)
+
+    def find_equivalent(self, expr, up_to_renaming=False):
+        """
+        Locations of equations equivalent to expr (an AsciiMath string or a
+        parsed tree) under the canonical form.
+        """
+        tree = asciimath.parse(expr) if isinstance(expr, str) else expr
+        key = fingerprint(tree, up_to_renaming)
+        table = self.renamed if up_to_renaming else self.exact
+        return [tuple(location) for location in table.get(key, [])]
+
+    def duplicates(self, up_to_renaming=False):
+        """Groups of equivalent equations that occur in more than one entry."""
+        table = self.renamed if up_to_renaming else self.exact
+        groups = []
+        for locations in table.values():
+            group = [tuple(location) for location in locations]
+            # A list and one of its relations can both match the same group
+            if len({location[0] for location in group}) > 1 and group not in groups:
+                groups.append(group)
+        return groups
+
+    def to_dict(self):
+        return {'version': VERSION, 'parser_version': asciimath.PARSER_VERSION,
+                'exact': self.exact, 'renamed': self.renamed}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['exact'], data['renamed'])
+
+    def save(self, path):
+        jsonio.dump(self.to_dict(), path)
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(jsonio.load(path))
+
+
+def load_equation_index(dataset_path, dataset_info):
+    """
+    Return the index written next to a built dataset and named in
+    dataset_info, or None if there is none or it is from another version.
+    """
+    name = dataset_info.get('equation_index')
+    if not name:
+        return None
+    path = Path(dataset_path).parent / name
+    if not path.exists():
+        return None
+    data = jsonio.load(path)
+    if data.get('version') != VERSION or data.get('parser_version') != asciimath.PARSER_VERSION:
+        return None
+    return EquationIndex.from_dict(data)
@@ -0,0 +1,150 @@
+"""
+Shared string tables for the in-memory corpus.
+
+The same short strings repeat across entries: assumption IDs, domains,
+statuses, depends_on IDs, equation IDs and definition symbols such as
+\\hbar. The dataset loaders pass every entry through intern_entry so each
+distinct string is stored once. StringTable does the same for export,
+replacing those strings with integer IDs into a vocabulary list:
+
+    table = StringTable()
+    encoded = [encode_entry(entry, table) for entry in entries]
+    # write table.strings as the vocabulary
+    entry = decode_entry(encoded[0], table.strings)
+
+build_ml_dataset --encode-ids writes such a vocabulary next to the dataset
+and records its file name, length and hash in dataset_info (see
+vocabulary_info); Dataset.open checks them and decodes entries
+transparently.
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+
+from theoria import jsonio
+
+STATUS_FIELDS = ('domain', 'review_status', 'theory_status')
+ID_LIST_FIELDS = ('depends_on', 'generalized_by')
+
+
+def _map_assumption(assumption, convert):
+    # Built datasets resolve assumptions to dicts; only the ID repeats
+    if isinstance(assumption, dict):
+        if assumption.get('id') is None:
+            return assumption
+        return dict(assumption, id=convert(assumption['id']))
+    return convert(assumption)
+
+
+def _map_items(items, key, convert):
+    return [dict(item, **{key: convert(item[key])}) if isinstance(item, dict) and item.get(key) is not None
+            else item for item in items]
+
+
+def _map_step(step, convert):
+    if not isinstance(step, dict):
+        return step
+    step = dict(step)
+    if isinstance(step.get('assumptions'), list):
+        step['assumptions'] = [convert(value) for value in step['assumptions']]
+    if step.get('equation_proven') is not None:
+        step['equation_proven'] = convert(step['equation_proven'])
+    return step
+
+
+def map_shared_strings(entry, convert):
+    """
+    Return a copy of entry with convert applied to every shared string:
+    domain and statuses, depends_on/generalized_by, entry- and step-level
+    assumption IDs, equation_proven, result equation IDs and definition
+    symbols. Free text (names, explanations, equations) is left alone.
+    """
+    out = dict(entry)
+    for key in STATUS_FIELDS:
+        if out.get(key) is not None:
+            out[key] = convert(out[key])
+    for key in ID_LIST_FIELDS:
+        if isinstance(out.get(key), list):
+            out[key] = [convert(value) for value in out[key]]
+    if isinstance(out.get('assumptions'), list):
+        out['assumptions'] = [_map_assumption(a, convert) for a in out['assumptions']]
+    if isinstance(out.get('result_equations'), list):
+        out['result_equations'] = _map_items(out['result_equations'], 'id', convert)
+    if isinstance(out.get('definitions'), list):
+        out['definitions'] = _map_items(out['definitions'], 'symbol', convert)
+    if isinstance(out.get('derivation'), list):
+        out['derivation'] = [_map_step(step, convert) for step in out['derivation']]
+    return out
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def intern_entry(entry):
+    """Return entry with its result_id and shared strings interned."""
+    out = map_shared_strings(entry, _intern)
+    if isinstance(out.get('result_id'), str):
+        out['result_id'] = sys.intern(out['result_id'])
+    return out
+
+
+class StringTable:
+    """Assigns consecutive integer IDs to strings, in first-seen order."""
+
+    def __init__(self, strings=()):
+        self.strings = []
+        self._ids = {}
+        for string in strings:
+            self.id(string)
+
+    def __len__(self):
+        return len(self.strings)
+
+    def id(self, string):
+        """Return the ID of string, adding it to the table if needed."""
+        if not isinstance(string, str):
+            return string
+        if string not in self._ids:
+            self._ids[string] = len(self.strings)
+            self.strings.append(string)
+        return self._ids[string]
+
+
+def encode_entry(entry, table):
+    """Replace an entry's shared strings with their IDs in table."""
+    return map_shared_strings(entry, table.id)
+
+
+def decode_entry(entry, strings):
+    """Inverse of encode_entry, given the vocabulary list."""
+    return map_shared_strings(entry, lambda value: strings[value] if type(value) is int else value)
+
+
+def vocabulary_digest(strings):
+    """SHA-256 of a vocabulary list."""
+    return hashlib.sha256(jsonio.dumps(strings).encode('utf-8')).hexdigest()
+
+
+def vocabulary_info(name, strings):
+    """The dataset_info['vocabulary'] record of strings written to the file name."""
+    return {'file': name, 'strings': len(strings), 'sha256': vocabulary_digest(strings)}
+
+
+def load_vocabulary(dataset_path, dataset_info):
+    """
+    Return the string table of a dataset built with --encode-ids (stored
+    next to the dataset file and described in dataset_info), or None.
+    Raises ValueError if the file is not the vocabulary the dataset was
+    encoded with, e.g. because another build overwrote it.
+    """
+    info = dataset_info.get('vocabulary')
+    if not info:
+        return None
+    path = Path(dataset_path).parent / info['file']
+    strings = jsonio.load(path)['strings']
+    if len(strings) != info['strings'] or vocabulary_digest(strings) != info['sha256']:
+        raise ValueError(f"{path} is not the vocabulary {Path(dataset_path).name} was encoded with; "
+                         f"rebuild the dataset")
+    return strings
@@ -0,0 +1,106 @@
+"""
+JSON parsing and serialization with an optional fast backend.
+
+    from theoria import jsonio
+
+    data = jsonio.load('entries/vis_viva.json')
+    text = jsonio.dumps(data, indent=2)
+
+Parsing uses orjson, else msgspec, when installed and the stdlib json
+module otherwise. Serialization uses orjson only for output it produces
+byte-for-byte like json.dumps(..., ensure_ascii=False): with indent=2 or
+compact separators, and for objects without floats that Python prints in
+exponent form or non-finite floats. Everything else, including strings
+orjson rejects such as lone surrogates, goes through the stdlib, so
+committed files never change with the installed backend.
+Decode errors are always json.JSONDecodeError (or a subclass).
+"""
+
+import json
+import math
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = 'orjson'
+elif msgspec is not None:
+    BACKEND = 'msgspec'
+else:
+    BACKEND = 'json'
+
+COMPACT_SEPARATORS = (',', ':')
+
+
+def loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            text = data.decode('utf-8', 'replace') if isinstance(data, (bytes, bytearray)) else data
+            raise json.JSONDecodeError(str(e), text, 0) from None
+    return json.loads(data)
+
+
+def load(path):
+    """Parse the JSON file at path."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def _orjson_safe(obj):
+    """True if orjson prints obj exactly like json.dumps."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str) or value is None or isinstance(value, bool):
+            continue
+        if isinstance(value, dict):
+            if not all(isinstance(key, str) for key in value):
+                return False
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, int):
+            if not -2 ** 63 <= value < 2 ** 64:
+                return False
+        elif isinstance(value, float):
+            if not math.isfinite(value) or 'e' in repr(value):
+                return False
+        else:
+            return False
+    return True
+
+
+def dumps(obj, indent=None):
+    """
+    Serialize obj as UTF-8 text (non-ASCII kept as-is). indent=None gives
+    compact output with (',', ':') separators; any other indent matches
+    json.dumps(obj, indent=indent, ensure_ascii=False).
+    """
+    if orjson is not None and indent in (None, 2) and _orjson_safe(obj):
+        option = orjson.OPT_INDENT_2 if indent == 2 else 0
+        try:
+            return orjson.dumps(obj, option=option).decode('utf-8')
+        except (orjson.JSONEncodeError, TypeError):
+            # e.g. lone surrogates, which orjson refuses and json.dumps keeps
+            pass
+    if indent is None:
+        return json.dumps(obj, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+def dump(obj, path, indent=None):
+    """Write obj to path as UTF-8 JSON (see dumps)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(dumps(obj, indent=indent))
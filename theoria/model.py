@@ -0,0 +1,231 @@
+"""
+Typed model of TheorIA entries and global assumptions.
+
+    from theoria.model import load_entry
+
+    entry = load_entry('entries/vis_viva.json')
+    entry.derivation[0].equation
+    entry.historical_context.importance if entry.historical_context else None
+
+The classes mirror schemas/entry.schema.json and
+schemas/assumptions.schema.json: required fields are plain attributes,
+optional ones are None when absent or null, and arrays are tuples. Instances use
+__slots__, so a decoded corpus takes far less memory than nested dicts.
+Decoding checks structure only (required and unknown fields, types and
+enums); string patterns and lengths remain the job of
+scripts/validate_schema.py. Structural errors raise ModelError with the
+path of the offending field.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+from theoria import jsonio
+
+
+class ModelError(ValueError):
+    """Raised when JSON data does not match the entry model."""
+
+
+_HINTS = {}
+
+
+def _hints(cls):
+    if cls not in _HINTS:
+        _HINTS[cls] = get_type_hints(cls)
+    return _HINTS[cls]
+
+
+def _optional(hint):
+    """Return (inner, True) for Optional[inner], else (hint, False)."""
+    if get_origin(hint) is Union:
+        args = [arg for arg in get_args(hint) if arg is not type(None)]
+        return args[0], True
+    return hint, False
+
+
+def _convert(value, hint, where):
+    if get_origin(hint) is tuple:
+        if not isinstance(value, list):
+            raise ModelError(f"{where}: expected an array")
+        item = get_args(hint)[0]
+        return tuple(_convert(v, item, f"{where}[{i}]") for i, v in enumerate(value))
+    if isinstance(hint, type) and issubclass(hint, Model):
+        return hint.from_dict(value, where)
+    if hint is int:
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ModelError(f"{where}: expected an integer")
+        return value
+    if not isinstance(value, str):
+        raise ModelError(f"{where}: expected a string")
+    return value
+
+
+def _unconvert(value):
+    if isinstance(value, tuple):
+        return [_unconvert(v) for v in value]
+    if isinstance(value, Model):
+        return value.to_dict()
+    return value
+
+
+class Model:
+    """Base class: decoding from and encoding to the JSON representation."""
+
+    __slots__ = ()
+    ENUMS = {}
+
+    @classmethod
+    def from_dict(cls, data, path=''):
+        """Build an instance from a parsed JSON object, checking its structure."""
+        where = path or cls.__name__
+        if not isinstance(data, dict):
+            raise ModelError(f"{where}: expected an object")
+        hints = _hints(cls)
+        unknown = [key for key in data if key not in hints]
+        if unknown:
+            raise ModelError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+
+        values = {}
+        for name, hint in hints.items():
+            field_path = f"{path}.{name}" if path else name
+            hint, optional = _optional(hint)
+            # Entries in the tree write some absent optional fields as null
+            if data.get(name) is None:
+                if not optional:
+                    raise ModelError(f"{field_path}: missing required field")
+                values[name] = None
+                continue
+            value = _convert(data[name], hint, field_path)
+            allowed = cls.ENUMS.get(name)
+            if allowed and value not in allowed:
+                raise ModelError(f"{field_path}: '{value}' is not one of {', '.join(allowed)}")
+            values[name] = value
+        return cls(**values)
+
+    def to_dict(self):
+        """Return the JSON representation, omitting absent optional fields."""
+        return {
+            name: _unconvert(getattr(self, name))
+            for name in _hints(type(self))
+            if getattr(self, name) is not None
+        }
+
+
+@dataclass
+class ResultEquation(Model):
+    __slots__ = ('id', 'equation', 'equation_title')
+    id: str
+    equation: str
+    equation_title: str
+
+
+@dataclass
+class Definition(Model):
+    __slots__ = ('symbol', 'definition')
+    symbol: str
+    definition: str
+
+
+@dataclass
+class DerivationStep(Model):
+    __slots__ = ('step', 'description', 'equation', 'equation_proven', 'assumptions')
+    step: int
+    description: str
+    equation: str
+    equation_proven: Optional[str]
+    assumptions: Optional[Tuple[str, ...]]
+
+
+@dataclass
+class ProgrammaticVerification(Model):
+    __slots__ = ('language', 'library', 'code')
+    language: str
+    library: str
+    code: Tuple[str, ...]
+
+
+@dataclass
+class HistoricalContext(Model):
+    __slots__ = ('importance', 'development_period', 'key_insights')
+    importance: Optional[str]
+    development_period: Optional[str]
+    key_insights: Optional[Tuple[str, ...]]
+
+
+@dataclass
+class Reference(Model):
+    __slots__ = ('id', 'citation')
+    id: str
+    citation: str
+
+
+@dataclass
+class Contributor(Model):
+    __slots__ = ('full_name', 'identifier')
+    full_name: str
+    identifier: str
+
+
+@dataclass
+class Entry(Model):
+    __slots__ = (
+        'result_id', 'result_name', 'result_equations', 'explanation', 'definitions',
+        'assumptions', 'depends_on', 'derivation', 'programmatic_verification', 'domain',
+        'theory_status', 'generalized_by', 'historical_context', 'references',
+        'contributors', 'review_status',
+    )
+    ENUMS = {
+        'theory_status': ('current', 'historical', 'approximation', 'limiting_case', 'generalized'),
+        'review_status': ('draft', 'reviewed'),
+    }
+    result_id: str
+    result_name: str
+    result_equations: Tuple[ResultEquation, ...]
+    explanation: str
+    definitions: Tuple[Definition, ...]
+    assumptions: Tuple[str, ...]
+    depends_on: Tuple[str, ...]
+    derivation: Tuple[DerivationStep, ...]
+    programmatic_verification: ProgrammaticVerification
+    domain: str
+    theory_status: str
+    generalized_by: Optional[Tuple[str, ...]]
+    historical_context: Optional[HistoricalContext]
+    references: Tuple[Reference, ...]
+    contributors: Tuple[Contributor, ...]
+    review_status: str
+
+
+@dataclass
+class GlobalAssumption(Model):
+    __slots__ = ('id', 'title', 'text', 'type', 'mathematical_expressions', 'symbol_definitions', 'used_in')
+    ENUMS = {
+        'type': ('principle', 'empirical', 'approximation'),
+    }
+    id: str
+    title: str
+    text: str
+    type: str
+    mathematical_expressions: Optional[Tuple[str, ...]]
+    symbol_definitions: Optional[Tuple[Definition, ...]]
+    used_in: Optional[Tuple[str, ...]]
+
+
+def decode_entry(data):
+    """Decode an Entry from JSON bytes or str."""
+    return Entry.from_dict(jsonio.loads(data))
+
+
+def load_entry(path):
+    """Decode the Entry stored in the JSON file at path."""
+    with open(path, 'rb') as f:
+        return decode_entry(f.read())
+
+
+def load_global_assumptions(path):
+    """Decode globals/assumptions.json into a list of GlobalAssumption."""
+    data = jsonio.load(path)
+    if not isinstance(data, dict) or not isinstance(data.get('assumptions'), list):
+        raise ModelError("assumptions: expected an object with an 'assumptions' array")
+    return [GlobalAssumption.from_dict(item, f"assumptions[{i}]") for i, item in enumerate(data['assumptions'])]
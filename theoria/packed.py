@@ -0,0 +1,129 @@
+"""
+Packed dataset format: every entry in one file, readable through mmap.
+
+Layout (integers are little-endian unsigned 64-bit):
+
+    MAGIC (8 bytes) | index_offset | index_length | records ... | index
+
+The index is compact JSON holding the record encoding ('json' or
+'msgpack'), dataset_info, the [offset, length] of the global assumptions
+record and a {result_id: [offset, length]} table. Readers map the file and
+decode only the records they access, so forked workers share the pages of
+a single file instead of each parsing a full dataset.json.
+"""
+
+import mmap
+import struct
+
+from theoria import jsonio
+from theoria.interning import decode_entry, intern_entry, load_vocabulary
+
+MAGIC = b'THEORIA\x01'
+HEADER = struct.Struct('<8sQQ')
+
+
+def _encoder(encoding):
+    if encoding == 'json':
+        return lambda obj: jsonio.dumps(obj).encode('utf-8')
+    if encoding == 'msgpack':
+        try:
+            import msgpack
+        except ImportError:
+            raise RuntimeError("The msgpack encoding requires the 'msgpack' package") from None
+        return lambda obj: msgpack.packb(obj, use_bin_type=True)
+    raise ValueError(f"Unknown record encoding: {encoding}")
+
+
+def _decoder(encoding):
+    if encoding == 'json':
+        return jsonio.loads
+    if encoding == 'msgpack':
+        try:
+            import msgpack
+        except ImportError:
+            raise RuntimeError("Reading msgpack records requires the 'msgpack' package") from None
+        return lambda data: msgpack.unpackb(data, raw=False)
+    raise ValueError(f"Unknown record encoding: {encoding}")
+
+
+def is_packed(path):
+    """Return True if the file at path starts with the packed-format magic."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except (IsADirectoryError, FileNotFoundError):
+        return False
+
+
+def write_packed(path, entries, dataset_info=None, global_assumptions=None, encoding='json'):
+    """Write entries (dicts with a result_id) to a packed dataset file."""
+    encode = _encoder(encoding)
+    records = {}
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+
+        def write_record(obj):
+            data = encode(obj)
+            offset = f.tell()
+            f.write(data)
+            return [offset, len(data)]
+
+        assumptions_record = write_record(global_assumptions or [])
+        for entry in entries:
+            records[entry['result_id']] = write_record(entry)
+
+        index = jsonio.dumps({
+            'encoding': encoding,
+            'dataset_info': dataset_info or {},
+            'global_assumptions': assumptions_record,
+            'records': records,
+        }).encode('utf-8')
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, index_offset, len(index)))
+
+
+class PackedSource:
+    """Random-access reader for a packed dataset file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a packed TheorIA dataset")
+        index = jsonio.loads(self._mm[index_offset:index_offset + index_length])
+        self.dataset_info = index['dataset_info']
+        self._decode = _decoder(index['encoding'])
+        self._assumptions_record = index['global_assumptions']
+        self._records = index['records']
+        self._strings = load_vocabulary(path, self.dataset_info)
+
+    def _read(self, record):
+        offset, length = record
+        return self._decode(self._mm[offset:offset + length])
+
+    def ids(self):
+        return sorted(self._records)
+
+    def load(self, result_id):
+        entry = self._read(self._records[result_id])
+        if self._strings:
+            entry = decode_entry(entry, self._strings)
+        return intern_entry(entry)
+
+    def scan(self):
+        for result_id in self.ids():
+            yield self.load(result_id)
+
+    def global_assumptions(self):
+        return self._read(self._assumptions_record)
+
+    def graph(self):
+        return None
+
+    def close(self):
+        self._mm.close()
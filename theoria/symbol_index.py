@@ -0,0 +1,183 @@
+"""
+Index of what each symbol means across the corpus.
+
+Every entry definition and every global assumption symbol_definition is
+filed under its normalized symbol (the canonical AsciiMath spelling of
+theoria.asciimath.to_text, so 'vec L' and 'vec(L)' share a key), and the
+definitions of each symbol are grouped into meanings:
+
+    index = SymbolIndex.build(entries, global_assumptions)
+    index.meanings('L')     # [{'label': 'Lagrangian function', 'occurrences': [...]},
+                            #  {'label': 'Angular momentum of the planet', ...}, ...]
+    index.contexts('hbar')  # every occurrence, in corpus order
+    index.divergent()       # {symbol: meanings} for symbols with several meanings
+
+Occurrences are {'source': 'entry' or 'assumption', 'id': result_id or
+assumption ID, 'symbol': as written, 'definition': text}. Two definitions
+share a meaning when the content words of their first clause ('Lagrangian
+function' in 'Lagrangian function, `L = T - V` ...'), outside inline math,
+overlap in at least half of the smaller set; meanings are the connected
+groups under that relation, labelled with their shortest first clause.
+This is a word-overlap heuristic for reviewers, not a semantic comparison:
+'Hamiltonian operator' and 'Hamiltonian function' are one meaning, and
+synonyms with no word in common are two.
+
+build_ml_dataset writes the index next to the dataset as
+<output>.symbols.json (dataset.pack.symbols.json for dataset.pack) and names
+it in dataset_info; generate_symbol_index.py writes it to docs/symbols.json
+for the site.
+"""
+
+import re
+from pathlib import Path
+
+from theoria import asciimath, jsonio
+
+# Bump when the clustering or the stored layout changes
+VERSION = 1
+OVERLAP = 0.5
+
+_MATH_RE = re.compile(r'`[^`]*`')
+_CLAUSE_RE = re.compile(r'[,;:(]|\.(?:\s|$)')
+_WORD_RE = re.compile(r'[A-Za-z]+')
+_STOPWORDS = frozenset('''
+    a an the of to in on at by for from with as and or its it is are be that this which
+    '''.split())
+
+
+def normalize_symbol(symbol):
+    """Canonical spelling of a symbol; symbols that do not parse keep their text."""
+    tree = asciimath.parse(symbol)
+    if tree[0] == 'error':
+        return ' '.join(symbol.split())
+    return asciimath.to_text(tree)
+
+
+def _head(definition):
+    """First clause of a definition: 'Lagrangian function' in 'Lagrangian function, `L = T - V`'."""
+    # Punctuation inside `inline math` does not end the clause
+    masked = _MATH_RE.sub(lambda match: '`' * len(match.group()), definition)
+    match = _CLAUSE_RE.search(masked)
+    head = definition[:match.start()] if match else definition
+    return head.strip() or definition.strip()
+
+
+def _content_words(definition):
+    words = set()
+    for word in _WORD_RE.findall(_MATH_RE.sub(' ', _head(definition)).lower()):
+        if word in _STOPWORDS:
+            continue
+        # Plural and singular count as the same word
+        words.add(word[:-1] if len(word) > 3 and word.endswith('s') else word)
+    return words
+
+
+def _related(a, b):
+    if not a or not b:
+        return False
+    return len(a & b) >= OVERLAP * min(len(a), len(b))
+
+
+def cluster(occurrences):
+    """Group occurrences of one symbol into meanings (see the module docstring)."""
+    words = [_content_words(occurrence['definition']) for occurrence in occurrences]
+    parent = list(range(len(occurrences)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(occurrences)):
+        for j in range(i):
+            if _related(words[i], words[j]):
+                parent[root(i)] = root(j)
+
+    groups = {}
+    for i, occurrence in enumerate(occurrences):
+        groups.setdefault(root(i), []).append(occurrence)
+    meanings = []
+    for group in groups.values():
+        label = min((_head(occurrence['definition']) for occurrence in group), key=len)
+        meanings.append({'label': label, 'occurrences': group})
+    # Most common meaning first; ties keep corpus order
+    meanings.sort(key=lambda meaning: -len(meaning['occurrences']))
+    return meanings
+
+
+def _occurrences(entries, global_assumptions):
+    for entry in entries:
+        for definition in entry.get('definitions') or []:
+            if definition.get('symbol') and definition.get('definition'):
+                yield definition['symbol'], {'source': 'entry', 'id': entry['result_id']}, definition
+    for assumption_id, assumption in (global_assumptions or {}).items():
+        for definition in assumption.get('symbol_definitions') or []:
+            if definition.get('symbol') and definition.get('definition'):
+                yield definition['symbol'], {'source': 'assumption', 'id': assumption_id}, definition
+
+
+class SymbolIndex:
+    """{normalized symbol: [meaning, ...]}; see the module docstring."""
+
+    def __init__(self, symbols=None):
+        self.symbols = symbols if symbols is not None else {}
+
+    @classmethod
+    def build(cls, entries, global_assumptions=None):
+        """global_assumptions is the {id: assumption} dict of Dataset.global_assumptions."""
+        occurrences = {}
+        for symbol, occurrence, definition in _occurrences(entries, global_assumptions):
+            occurrence.update(symbol=symbol, definition=definition['definition'])
+            occurrences.setdefault(normalize_symbol(symbol), []).append(occurrence)
+        asciimath.save_cache()
+        return cls({key: cluster(occurrences[key]) for key in sorted(occurrences)})
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return normalize_symbol(symbol) in self.symbols
+
+    def meanings(self, symbol):
+        """Meanings of symbol (any spelling), most common first; [] if it is never defined."""
+        return self.symbols.get(normalize_symbol(symbol), [])
+
+    def contexts(self, symbol):
+        """Every occurrence of symbol across entries and global assumptions."""
+        return [occurrence for meaning in self.meanings(symbol) for occurrence in meaning['occurrences']]
+
+    def divergent(self):
+        """{symbol: meanings} for the symbols defined with more than one meaning."""
+        return {key: meanings for key, meanings in self.symbols.items() if len(meanings) > 1}
+
+    def to_dict(self):
+        return {'version': VERSION, 'parser_version': asciimath.PARSER_VERSION, 'symbols': self.symbols}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['symbols'])
+
+    def save(self, path):
+        jsonio.dump(self.to_dict(), path)
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(jsonio.load(path))
+
+
+def load_symbol_index(dataset_path, dataset_info):
+    """
+    Return the index written next to a built dataset and named in
+    dataset_info, or None if there is none or it is from another version.
+    """
+    name = dataset_info.get('symbol_index')
+    if not name:
+        return None
+    path = Path(dataset_path).parent / name
+    if not path.exists():
+        return None
+    data = jsonio.load(path)
+    if data.get('version') != VERSION or data.get('parser_version') != asciimath.PARSER_VERSION:
+        return None
+    return SymbolIndex.from_dict(data)
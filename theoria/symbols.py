@@ -0,0 +1,131 @@
+"""
+Symbol coverage: which names used in an entry's equations are defined.
+
+Names are read from the AsciiMath token stream (theoria.asciimath.tokenize,
+one precompiled pattern), so an entry costs one tokenizer pass over its
+equations and definitions:
+
+    report = symbol_coverage(entry, global_assumptions)
+    report['undefined']   # {'F': [('step', 3)], ...}
+    report['unused']      # ['vec tau_(ext)', ...]
+
+A name is defined when the entry's definitions[].symbol or the
+symbol_definitions of a global assumption the entry or one of its steps
+references contain it. Definitions match by base name: 'vec L' defines L,
+'q_k' defines q (and so covers q_i and dot q_i), 'psi(x)' defines psi and x.
+Subscripts, and superscripts that are a single name or a group of bare
+names (indices such as mu nu or (s)), are labels and are not checked;
+neither are operator names (d, del, grad, sum, ...), the constants e, i
+and pi, text{...} and lowercase prose words such as 'const' that AsciiMath
+would split into letters, unless the entry defines them. A definition is
+unused when none of its names occurs in any result equation or derivation
+step.
+"""
+
+import re
+
+from theoria.asciimath import CONSTANTS, FUNCTIONS, OPENERS, CLOSERS, entry_equations, tokenize
+
+# Names that need no definition: operators, number sets, standard constants
+UNCHECKED = frozenset(CONSTANTS - {'hbar'}) | FUNCTIONS | {'d', 'e', 'i', 'pi', 'oo', 'dagger', '**', '...'}
+
+_TEXT_RE = re.compile(r'"[^"]*"|text\s*(?:\{[^}]*\}|\([^)]*\))')
+_WORD_RE = re.compile(r'[^\W\d_]{3,}')
+
+
+def _drop_prose(match):
+    word = match.group()
+    letters = [value for kind, value in tokenize(word) if kind == 'name' and len(value) == 1]
+    if word.islower() and len(letters) >= 3:
+        return ' '
+    return word
+
+
+def _script_end(tokens, start):
+    """Index just past the script starting at tokens[start], and whether it is index-like."""
+    if start >= len(tokens):
+        return start, True
+    kind, value = tokens[start]
+    if value not in OPENERS:
+        return start + 1, kind in ('name', 'num')
+    depth, i = 0, start
+    while i < len(tokens):
+        if tokens[i][1] in OPENERS:
+            depth += 1
+        elif tokens[i][1] in CLOSERS:
+            depth -= 1
+            if depth == 0:
+                break
+        i += 1
+    inner = tokens[start + 1:i]
+    return i + 1, all(kind == 'name' or value in (',', "'") for kind, value in inner)
+
+
+def names(text, scripts=False):
+    """
+    Yield the names in an AsciiMath string, in order. Names in subscripts
+    and index-like superscripts are skipped unless scripts is true.
+    """
+    tokens = tokenize(_WORD_RE.sub(_drop_prose, _TEXT_RE.sub(' ', text)))
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        if kind == 'op' and value in ('_', '^') and not scripts:
+            end, index_like = _script_end(tokens, i + 1)
+            if value == '_' or index_like:
+                i = end
+                continue
+        elif kind == 'name':
+            yield value
+        i += 1
+
+
+def _referenced_assumptions(entry):
+    for assumption in entry.get('assumptions') or []:
+        yield assumption.get('id') if isinstance(assumption, dict) else assumption
+    for step in entry.get('derivation') or []:
+        for assumption in step.get('assumptions') or []:
+            yield assumption.get('id') if isinstance(assumption, dict) else assumption
+
+
+def defined_names(entry, global_assumptions=None):
+    """{name: definition symbol} for the entry's definitions and referenced assumptions."""
+    defined = {}
+    global_assumptions = global_assumptions or {}
+    sources = [entry.get('definitions') or []]
+    for assumption_id in _referenced_assumptions(entry):
+        assumption = global_assumptions.get(assumption_id) or {}
+        sources.append(assumption.get('symbol_definitions') or [])
+    for definitions in sources:
+        for definition in definitions:
+            for name in names(definition.get('symbol') or ''):
+                defined.setdefault(name, definition['symbol'])
+    return defined
+
+
+def symbol_coverage(entry, global_assumptions=None):
+    """
+    Return {'undefined': {name: [location, ...]}, 'unused': [symbol, ...]}
+    for one entry; locations are those of theoria.asciimath.entry_equations.
+    """
+    defined = defined_names(entry, global_assumptions)
+    undefined = {}
+    used = set()
+    for location, text in entry_equations(entry):
+        for name in names(text, scripts=True):
+            used.add(name)
+        for name in names(text):
+            if name in defined or name in UNCHECKED:
+                continue
+            locations = undefined.setdefault(name, [])
+            if location not in locations:
+                locations.append(location)
+
+    unused = []
+    for definition in entry.get('definitions') or []:
+        symbol = definition.get('symbol') or ''
+        symbol_names = set(names(symbol, scripts=True))
+        # Pure operators and kets such as '|:0:)' have no names to look for
+        if symbol_names and not symbol_names & used:
+            unused.append(symbol)
+    return {'undefined': undefined, 'unused': unused}
@@ -0,0 +1,256 @@
+"""
+Helpers for programmatic_verification snippets.
+
+assert_equal replaces the common `assert sp.simplify(lhs - rhs) == 0`:
+
+    from theoria.verification import assert_equal
+    assert_equal(v2_expr, G*M*(2/r - 1/a))
+
+Both sides are lambdified and evaluated with NumPy at random points first,
+which rejects a wrong equation in milliseconds. What happens after the
+numeric check passes depends on the mode:
+
+- 'strict' (default): the equation is also proved with sp.simplify
+- 'fast': the numeric check is accepted, and simplify only runs when the
+  numeric check is inconclusive (undefined functions, unevaluated
+  derivatives or integrals, non-commutative symbols, no finite sample
+  points) or prove=True
+
+Symbols are sampled within their assumptions: positive values only for
+symbols declared positive, signed values for other real symbols and
+complex values for plain ones.
+
+The mode is read from the THEORIA_VERIFY_MODE environment variable, so
+`verify_programmatic.py --fast` switches every snippet at once. Needs the
+optional sympy and numpy packages.
+
+simplify, expand, trigsimp and integrate are drop-in wrappers around the
+SymPy functions with an opt-in disk memo, so repeated runs and entries that
+share sub-expressions reuse earlier results:
+
+    from theoria.verification import simplify
+    simplify(sigma_x*sigma_y - sigma_y*sigma_x)
+
+The memo is off unless THEORIA_SYMPY_MEMO is set, to '1' for
+build/cache/sympy/ or to a directory (`verify_programmatic.py --memo`).
+Results are keyed by the srepr of the arguments, the function and the SymPy
+version, and stored as srepr text.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+MODES = ('strict', 'fast')
+MEMO_DIR = Path(__file__).resolve().parents[1] / 'build' / 'cache' / 'sympy'
+SAMPLES = 16
+RTOL = 1e-8
+ATOL = 1e-12
+
+
+class _Inconclusive(Exception):
+    """The numeric check could not evaluate both sides."""
+
+
+def current_mode():
+    """The active mode from THEORIA_VERIFY_MODE ('strict' when unset)."""
+    mode = os.environ.get('THEORIA_VERIFY_MODE', 'strict').lower()
+    if mode not in MODES:
+        raise ValueError(f"THEORIA_VERIFY_MODE must be one of {', '.join(MODES)}, got {mode!r}")
+    return mode
+
+
+def _elements(expr):
+    """Flat list of the scalar elements of an expression or matrix."""
+    import sympy
+    expr = sympy.sympify(expr)
+    if isinstance(expr, sympy.MatrixBase):
+        return list(expr), expr.shape
+    return [expr], None
+
+
+def _sample(symbol, rng, samples):
+    """
+    Random sample values respecting the symbol's assumptions: one sign only
+    for symbols declared nonnegative or nonpositive, both signs for other
+    real symbols and complex values for unrestricted ones, so that
+    sqrt(z**2) == z only passes for a positive z.
+    """
+    import numpy
+    if symbol.is_integer:
+        values = rng.integers(1, 6, samples).astype(float)
+    else:
+        values = rng.uniform(0.5, 2.0, samples)
+    if symbol.is_nonnegative:
+        return values
+    if symbol.is_nonpositive:
+        return -values
+    if symbol.is_real:
+        return values * rng.choice([-1.0, 1.0], samples)
+    return values * numpy.exp(1j * rng.uniform(-numpy.pi, numpy.pi, samples))
+
+
+def _opaque(elements):
+    """
+    Whether elements contain objects that lambdify cannot evaluate, or
+    non-commutative ones that it would evaluate as commuting numbers.
+    """
+    import sympy
+    from sympy.core.function import AppliedUndef
+    return any(element.atoms(AppliedUndef, sympy.Derivative, sympy.Integral, sympy.Limit, sympy.Sum)
+               or any(node.is_commutative is False for node in sympy.preorder_traversal(element))
+               for element in elements)
+
+
+def numeric_check(lhs, rhs, samples=SAMPLES, seed=0):
+    """
+    Compare lhs and rhs at random points. Returns None if they agree, a
+    description of the first mismatch if they do not, or raises
+    _Inconclusive when they cannot be evaluated.
+    """
+    import numpy
+    import sympy
+
+    left, left_shape = _elements(lhs)
+    right, right_shape = _elements(rhs)
+    if left_shape != right_shape:
+        return f"shapes differ: {left_shape} != {right_shape}"
+    if _opaque(left + right):
+        raise _Inconclusive('undefined functions, derivatives, integrals or non-commutative symbols')
+
+    symbols = sorted(set().union(*(element.free_symbols for element in left + right)), key=str)
+    rng = numpy.random.default_rng(seed)
+    point = [_sample(symbol, rng, samples) for symbol in symbols]
+    try:
+        function = sympy.lambdify(symbols, left + right, modules='numpy')
+        with numpy.errstate(all='ignore'):
+            values = [numpy.broadcast_to(numpy.asarray(value, dtype=complex), (samples,))
+                      for value in function(*point)]
+    except (TypeError, ValueError, NameError, ZeroDivisionError, OverflowError) as e:
+        raise _Inconclusive(f"{type(e).__name__}: {e}") from e
+
+    for index, (a, b) in enumerate(zip(values[:len(left)], values[len(left):])):
+        finite = numpy.isfinite(a) & numpy.isfinite(b)
+        if finite.sum() < samples // 2:
+            raise _Inconclusive('too few finite sample points')
+        bad = finite & (numpy.abs(a - b) > ATOL + RTOL * numpy.maximum(numpy.abs(a), numpy.abs(b)))
+        if bad.any():
+            i = int(numpy.argmax(bad))
+            where = ', '.join(f"{symbol}={column[i]:.6g}" for symbol, column in zip(symbols, point))
+            element = f" (element {index})" if left_shape else ''
+            return f"{_format(a[i])} != {_format(b[i])} at {where or 'every point'}{element}"
+    return None
+
+
+def _format(value):
+    return f"{value.real:.10g}" if value.imag == 0 else f"{value:.10g}"
+
+
+def prove_equal(lhs, rhs):
+    """Whether sp.simplify(lhs - rhs) is zero (or the zero matrix)."""
+    import sympy
+    difference = simplify(sympy.sympify(lhs) - sympy.sympify(rhs))
+    if isinstance(difference, sympy.MatrixBase):
+        return difference.is_zero_matrix is True
+    return difference == 0
+
+
+def assert_equal(lhs, rhs, prove=None, samples=SAMPLES, msg=None):
+    """
+    Assert that lhs and rhs (SymPy expressions or matrices) are equal.
+
+    Raises AssertionError on a numeric mismatch, or when a required symbolic
+    proof fails. prove=True forces the symbolic proof in fast mode and
+    prove=False skips it in strict mode unless the numeric check is
+    inconclusive. Returns 'numeric' or 'proved'.
+    """
+    prefix = f"{msg}: " if msg else ''
+    try:
+        mismatch = numeric_check(lhs, rhs, samples)
+        conclusive = True
+    except _Inconclusive:
+        mismatch, conclusive = None, False
+    if mismatch:
+        raise AssertionError(f"{prefix}{lhs} != {rhs}: {mismatch}")
+
+    if prove is None:
+        prove = current_mode() == 'strict'
+    if conclusive and not prove:
+        return 'numeric'
+    if not prove_equal(lhs, rhs):
+        raise AssertionError(f"{prefix}could not prove {lhs} == {rhs}")
+    return 'proved'
+
+
+_memo = {}
+
+
+def memo_dir():
+    """The memo directory named by THEORIA_SYMPY_MEMO, or None when the memo is off."""
+    setting = os.environ.get('THEORIA_SYMPY_MEMO', '')
+    if setting.lower() in ('', '0', 'false', 'no'):
+        return None
+    return MEMO_DIR if setting.lower() in ('1', 'true', 'yes') else Path(setting)
+
+
+def _memo_key(name, args, kwargs):
+    import sympy
+    text = '\n'.join([name, sympy.__version__, sympy.srepr(args), sympy.srepr(sorted(kwargs.items()))])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _restore(text):
+    """Rebuild an expression from its srepr text."""
+    import sympy
+    return eval(text, vars(sympy).copy())
+
+
+def _memoized(name, args, kwargs):
+    import sympy
+    function = getattr(sympy, name)
+    directory = memo_dir()
+    if directory is None:
+        return function(*args, **kwargs)
+
+    key = _memo_key(name, args, kwargs)
+    if key in _memo:
+        return _memo[key]
+    path = directory / key[:2] / f"{key}.txt"
+    try:
+        result = _restore(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        result = function(*args, **kwargs)
+        text = sympy.srepr(result)
+        # Only keep results that survive the round trip unchanged
+        try:
+            storable = _restore(text) == result
+        except Exception:
+            storable = False
+        if storable:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+            tmp_path.write_text(text, encoding='utf-8')
+            tmp_path.replace(path)
+    _memo[key] = result
+    # Mutable matrices must not be shared between callers
+    return result.copy() if isinstance(result, sympy.MatrixBase) and result.is_mutable else result
+
+
+def simplify(expr, **kwargs):
+    """sympy.simplify, memoized on disk when THEORIA_SYMPY_MEMO is set."""
+    return _memoized('simplify', (expr,), kwargs)
+
+
+def expand(expr, **kwargs):
+    """sympy.expand, memoized on disk when THEORIA_SYMPY_MEMO is set."""
+    return _memoized('expand', (expr,), kwargs)
+
+
+def trigsimp(expr, **kwargs):
+    """sympy.trigsimp, memoized on disk when THEORIA_SYMPY_MEMO is set."""
+    return _memoized('trigsimp', (expr,), kwargs)
+
+
+def integrate(expr, *limits, **kwargs):
+    """sympy.integrate, memoized on disk when THEORIA_SYMPY_MEMO is set."""
+    return _memoized('integrate', (expr,) + limits, kwargs)